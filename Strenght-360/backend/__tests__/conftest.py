@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+
+# The backend modules are scripts that import each other by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Module defaults are read from the environment at import time, so this runs before any backend
+# import: configured cohort stores are switched off and shared render state goes to a private dir
+for name in ('SCORE_STORE_DIR', 'COHORT_MATRIX_PATH', 'THEME_INDEX_PATH', 'REPORT_HISTORY_DB',
+             'REPORT_STORAGE_DIR'):
+    os.environ.pop(name, None)
+
+_state_dir = tempfile.mkdtemp(prefix='strength360-tests-')
+os.environ['RENDER_METRICS_DIR'] = os.path.join(_state_dir, 'metrics')
+os.environ['RENDER_COALESCE_DIR'] = os.path.join(_state_dir, 'inflight')
+os.environ['RENDER_SCHEDULER_DIR'] = os.path.join(_state_dir, 'slots')
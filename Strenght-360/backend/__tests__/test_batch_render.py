@@ -0,0 +1,38 @@
+import copy
+
+from batch_render import render_to_directory
+
+
+def payload(response_id, executing=5):
+    return {'data': {
+        'id': response_id,
+        'student_name': f'Candidate {response_id}',
+        'student_email': f'c{response_id}@example.com',
+        'executing_score': executing,
+        'influencing_score': 18,
+        'relationship_building_score': 20,
+        'strategic_thinking_score': 33,
+        'primary_talent_domain': 'Strategic Thinking',
+    }}
+
+
+def test_rerun_resumes_from_the_journal(tmp_path):
+    output_dir = str(tmp_path / 'out')
+    payloads = [payload(n) for n in range(3)]
+
+    first = render_to_directory(payloads, output_dir, workers=1)
+    assert (first['rendered'], first['skipped'], first['failed']) == (3, 0, 0)
+
+    again = render_to_directory(payloads, output_dir, workers=1)
+    assert (again['rendered'], again['skipped']) == (0, 3)
+
+    # A damaged output and a changed payload are rendered again; the rest stay skipped
+    with open(tmp_path / 'out' / 'response-0.pdf', 'ab') as f:
+        f.write(b'x')
+    changed = copy.deepcopy(payloads)
+    changed[1] = payload(1, executing=30)
+    resumed = render_to_directory(changed, output_dir, workers=1)
+    assert (resumed['rendered'], resumed['skipped']) == (2, 1)
+
+    manifest = (tmp_path / 'out' / 'manifest.csv').read_text().splitlines()
+    assert len(manifest) == 4
@@ -0,0 +1,54 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+import cohort_analytics
+from cohort_analytics import CooccurrenceMatrix, update_cooccurrence
+from python_pdf_generator import THEME_ORDER
+
+
+def assessment(candidate_id, themes):
+    return {'candidate': {'id': candidate_id}, 'top5': [{'name': name} for name in themes]}
+
+
+def expected_counts(top5_lists):
+    matrix = CooccurrenceMatrix()
+    matrix.add_many_indices([[THEME_ORDER.index(name) for name in themes] for themes in top5_lists])
+    return matrix.counts
+
+
+def test_retake_replaces_the_previous_top5(tmp_path):
+    path = str(tmp_path / 'cohort.npz')
+    update_cooccurrence([assessment('a', THEME_ORDER[:5]), assessment('b', THEME_ORDER[:5])], path)
+    update_cooccurrence([assessment('a', THEME_ORDER[5:10])], path)
+
+    matrix = CooccurrenceMatrix.load(path)
+    assert matrix.candidates == 2
+    assert np.array_equal(matrix.counts, expected_counts([THEME_ORDER[:5], THEME_ORDER[5:10]]))
+
+
+def test_matrix_saved_ahead_of_members_is_rebuilt(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cohort.npz')
+    update_cooccurrence([assessment('a', THEME_ORDER[:5])], path)
+
+    # Crash after the matrix was saved but before the members commit: the members table rolls
+    # back while the saved matrix is one generation ahead of it
+    original_save = CooccurrenceMatrix.save
+
+    def save_then_crash(self, *args, **kwargs):
+        original_save(self, *args, **kwargs)
+        raise RuntimeError('crash before the members commit')
+    monkeypatch.setattr(CooccurrenceMatrix, 'save', save_then_crash)
+    with pytest.raises(RuntimeError):
+        update_cooccurrence([assessment('b', THEME_ORDER[5:10])], path)
+    monkeypatch.undo()
+
+    with sqlite3.connect(cohort_analytics.members_path(path)) as conn:
+        assert [row[0] for row in conn.execute('SELECT candidate_id FROM members')] == ['a']
+    assert CooccurrenceMatrix.load(path).candidates == 2
+
+    matrix = update_cooccurrence([assessment('c', THEME_ORDER[10:15])], path)
+    assert matrix.candidates == 2
+    assert np.array_equal(CooccurrenceMatrix.load(path).counts,
+                          expected_counts([THEME_ORDER[:5], THEME_ORDER[10:15]]))
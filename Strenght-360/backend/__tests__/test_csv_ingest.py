@@ -0,0 +1,46 @@
+import json
+import sys
+
+import csv_ingest
+
+HEADER = ('Response ID,Name,Email,Phone,Test Title,Primary Domain,Executing,Influencing,'
+          'Relationship Building,Strategic Thinking,Submitted At,Auto Submit,Questions Answered\n')
+
+
+def write_export(tmp_path, *rows):
+    path = tmp_path / 'report.csv'
+    path.write_text(HEADER + ''.join(row + '\n' for row in rows), encoding='utf-8')
+    return str(path)
+
+
+def test_malformed_row_is_rejected_and_the_rest_stream(tmp_path):
+    path = write_export(
+        tmp_path,
+        'r1,Ana,ana@example.com,,T,Executing,N/A,18,20,33,2025-12-20T21:20:13Z,No,76',
+        'r2,Ben,ben@example.com,,T,Influencing,5,18,20,33,2025-12-20T21:20:13Z,Yes,76',
+    )
+    rejected = []
+    payloads = list(csv_ingest.iter_payloads(path, chunk_size=1, rejected=rejected))
+
+    assert [payload['data']['id'] for payload in payloads] == ['r2']
+    assert payloads[0]['data']['executing_score'] == 5.0
+    assert payloads[0]['data']['is_auto_submit'] is True
+    assert len(rejected) == 1
+    assert rejected[0].startswith('line 2: Executing:')
+
+
+def test_malformed_row_does_not_stop_rendering(tmp_path, monkeypatch, capsys):
+    path = write_export(
+        tmp_path,
+        'r1,Ana,ana@example.com,,T,Executing,N/A,18,20,33,2025-12-20T21:20:13Z,No,76',
+        'r2,Ben,ben@example.com,,T,Influencing,5,18,20,33,2025-12-20T21:20:13Z,No,76',
+    )
+    output_dir = tmp_path / 'pdfs'
+    monkeypatch.setattr(sys, 'argv', ['csv_ingest.py', path, '--output-dir', str(output_dir), '--workers', '1'])
+
+    assert csv_ingest.main() == 0
+    result = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert result['success'] is True
+    assert result['rendered'] == 1
+    assert result['rejectedRows'] == 1
+    assert (output_dir / 'response-r2.pdf').exists()
@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+
+import load_test
+
+
+def test_configured_stores_are_redirected_and_restored(tmp_path, monkeypatch):
+    monkeypatch.setenv('SCORE_STORE_DIR', '/real/scores')
+    monkeypatch.delenv('REPORT_STORE_DIR', raising=False)
+
+    previous = load_test.isolate_stores(str(tmp_path))
+    assert os.environ['SCORE_STORE_DIR'] == str(tmp_path / 'stores' / 'scores')
+    assert os.environ['REPORT_STORE_DIR'] == str(tmp_path / 'stores' / 'models')
+    assert 'COHORT_MATRIX_PATH' not in os.environ
+
+    load_test.restore_stores(previous)
+    assert os.environ['SCORE_STORE_DIR'] == '/real/scores'
+    assert 'REPORT_STORE_DIR' not in os.environ
+
+
+def test_cli_run_leaves_real_stores_untouched(tmp_path, monkeypatch, capsys):
+    real = tmp_path / 'real'
+    monkeypatch.setenv('SCORE_STORE_DIR', str(real / 'scores'))
+    monkeypatch.setenv('REPORT_HISTORY_DB', str(real / 'history.db'))
+    monkeypatch.setattr(sys, 'argv', ['load_test.py', 'cli', '--concurrency', '1', '--duration', '0.5'])
+
+    assert load_test.main() == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result['curve'][0]['requests'] >= 1
+    assert result['curve'][0]['error_rate'] == 0.0
+    assert not real.exists()
+    assert os.environ['SCORE_STORE_DIR'] == str(real / 'scores')
@@ -0,0 +1,51 @@
+import multiprocessing
+
+import numpy as np
+
+import profile_index
+from python_pdf_generator import THEME_ORDER
+
+
+def profile(candidate_id, seed):
+    scores = np.random.default_rng(seed).integers(1, 11, len(THEME_ORDER))
+    return {'candidate': {'id': candidate_id},
+            'strength_scores': {name: int(score) for name, score in zip(THEME_ORDER, scores)}}
+
+
+def test_saved_index_loads_prepared_matrices(tmp_path):
+    path = str(tmp_path / 'profiles.npz')
+    profile_index.update_index([profile(str(n), n) for n in range(50)], path)
+
+    index = profile_index.ProfileIndex.load(path)
+    fresh = profile_index.ProfileIndex(index.ids, np.array(index.vectors))
+    assert isinstance(index._unit, np.memmap)
+    for metric in profile_index.METRICS:
+        assert index.query_candidate('7', 5, metric) == fresh.query_candidate('7', 5, metric)
+
+
+def test_replacing_a_profile_in_a_loaded_index(tmp_path):
+    path = str(tmp_path / 'profiles.npz')
+    profile_index.update_index([profile('a', 1), profile('b', 2)], path)
+    profile_index.update_index([profile('a', 2)], path)
+
+    index = profile_index.ProfileIndex.load(path)
+    assert index.ids == ['a', 'b']
+    assert index.query_candidate('a', 1, 'euclidean') == [('b', 0.0)]
+
+
+def _add_batch(path, worker):
+    for n in range(10):
+        profile_index.update_index([profile(f'{worker}-{n}', n)], path)
+
+
+def test_concurrent_updates_keep_every_profile(tmp_path):
+    path = str(tmp_path / 'profiles.npz')
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_add_batch, args=(path, worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in workers)
+    assert len(profile_index.ProfileIndex.load(path)) == 40
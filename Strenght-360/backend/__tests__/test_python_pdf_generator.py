@@ -0,0 +1,21 @@
+import json
+import sys
+
+import pytest
+
+import python_pdf_generator
+
+
+def test_pop_options_removes_flag_and_value():
+    args = ['p.json', '--tier', 'summary', 'out.pdf']
+    assert python_pdf_generator.pop_options(args, ('--tier', '--sections')) == {'--tier': 'summary'}
+    assert args == ['p.json', 'out.pdf']
+
+
+@pytest.mark.parametrize('flag', ['--tier', '--sections'])
+def test_trailing_flag_is_a_json_usage_error(tmp_path, monkeypatch, capsys, flag):
+    monkeypatch.setattr(sys, 'argv', ['python_pdf_generator.py', 'p.json', str(tmp_path / 'out.pdf'), flag])
+
+    assert python_pdf_generator.main() == 1
+    response = json.loads(capsys.readouterr().out)
+    assert response == {'success': False, 'error': f'{flag} needs a value'}
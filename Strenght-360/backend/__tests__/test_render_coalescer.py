@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+import render_coalescer
+
+
+def test_overlapping_identical_renders_share_one_render(tmp_path):
+    rendezvous = str(tmp_path / 'inflight')
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def leader_render(path):
+        calls.append(path)
+        started.set()
+        release.wait(5)
+        with open(path, 'w') as f:
+            f.write('report')
+
+    def follower_render(path):
+        calls.append(path)
+
+    leader = threading.Thread(target=render_coalescer.render_once,
+                              args=(7, {'a': 1}, str(tmp_path / 'leader.pdf'), leader_render, rendezvous))
+    leader.start()
+    assert started.wait(5)
+    results = []
+    follower = threading.Thread(target=lambda: results.append(render_coalescer.render_once(
+        7, {'a': 1}, str(tmp_path / 'follower.pdf'), follower_render, rendezvous)))
+    follower.start()
+    time.sleep(0.1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results == [(str(tmp_path / 'follower.pdf'), True)]
+    assert calls == [str(tmp_path / 'leader.pdf')]
+    assert (tmp_path / 'follower.pdf').read_text() == 'report'
+    assert render_coalescer.read_metrics(rendezvous) == {'renders': 1, 'coalesced': 1, 'timeouts': 0}
+    assert not [name for name in os.listdir(rendezvous) if name.endswith('.lock') and name != 'metrics.lock']
+
+
+def test_different_payloads_are_not_coalesced(tmp_path):
+    rendezvous = str(tmp_path / 'inflight')
+    output = str(tmp_path / 'out.pdf')
+
+    def render(path):
+        with open(path, 'w') as f:
+            f.write('report')
+
+    assert render_coalescer.render_once(7, {'a': 1}, output, render, rendezvous) == (output, False)
+    assert render_coalescer.render_once(7, {'a': 2}, output, render, rendezvous) == (output, False)
+    assert render_coalescer.read_metrics(rendezvous)['renders'] == 2
+
+
+def test_timed_out_waiter_renders_privately_while_leader_writes(tmp_path):
+    rendezvous = str(tmp_path / 'inflight')
+    output = str(tmp_path / 'strength_report.pdf')
+    writing, release = threading.Event(), threading.Event()
+    follower_paths = []
+
+    def stuck_render(path):
+        with open(path, 'w') as f:
+            f.write('LEADER-PART')
+            f.flush()
+            writing.set()
+            release.wait(5)
+            f.write('-END')
+
+    def follower_render(path):
+        follower_paths.append(path)
+        with open(path, 'w') as f:
+            f.write('FOLLOWER')
+
+    leader = threading.Thread(target=render_coalescer.render_once,
+                              args=(7, {'a': 1}, output, stuck_render, rendezvous))
+    leader.start()
+    assert writing.wait(5)
+    result = render_coalescer.render_once(7, {'a': 1}, output, follower_render, rendezvous, wait_seconds=0.2)
+    release.set()
+    leader.join()
+
+    assert result == (output, False)
+    assert follower_paths and follower_paths[0] != output
+    # The leader kept writing its own file; the published output is the follower's whole render
+    assert open(output).read() == 'FOLLOWER'
+    assert sorted(os.listdir(tmp_path)) == ['inflight', 'strength_report.pdf']
+    assert render_coalescer.read_metrics(rendezvous)['timeouts'] == 1
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from render_scheduler import RenderScheduler, PRIORITY_BULK, PRIORITY_INTERACTIVE, collect_stats
+
+
+def scheduler(tmp_path, **options):
+    return RenderScheduler(str(tmp_path / 'slots'), **options)
+
+
+def test_candidate_slots_per_class(tmp_path):
+    s = scheduler(tmp_path, slots=6, reserved=4, aging_seconds=1.0, aged_borrow_fraction=0.5)
+
+    assert s._candidate_slots(PRIORITY_INTERACTIVE, 0.0) == [0, 1, 2, 3, 4, 5]
+    assert s._candidate_slots(PRIORITY_BULK, 0.5) == [4, 5]
+    # Aged bulk jobs borrow the back half of the reservation; the front stays interactive-only
+    assert s._candidate_slots(PRIORITY_BULK, 1.0) == [4, 5, 2, 3]
+
+
+def test_reservation_limits(tmp_path):
+    # One slot always stays open to bulk work
+    assert scheduler(tmp_path, slots=2, reserved=5).reserved == 1
+    # The fraction rounds down, so a single reserved slot is never lent
+    assert scheduler(tmp_path, slots=4, reserved=1, aged_borrow_fraction=0.5).borrowable == 0
+    assert scheduler(tmp_path, slots=4, reserved=3, aged_borrow_fraction=1.0).borrowable == 3
+    with pytest.raises(ValueError):
+        scheduler(tmp_path, slots=0)
+    with pytest.raises(ValueError):
+        with scheduler(tmp_path, slots=1).slot('urgent'):
+            pass
+
+
+def hold(s, priority, started, release):
+    with s.slot(priority):
+        started.set()
+        release.wait(5)
+
+
+def acquire_in_thread(s, priority, acquired):
+    def run():
+        with s.slot(priority) as waited:
+            acquired.append(waited)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_interactive_job_uses_reserved_slot_while_bulk_holds_shared(tmp_path):
+    s = scheduler(tmp_path, slots=2, reserved=1, aging_seconds=60)
+    started, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=hold, args=(s, PRIORITY_BULK, started, release))
+    holder.start()
+    assert started.wait(5)
+
+    with s.slot(PRIORITY_INTERACTIVE) as waited:
+        assert waited < 0.5
+    release.set()
+    holder.join()
+
+
+def test_young_bulk_job_waits_for_shared_slot(tmp_path):
+    s = scheduler(tmp_path, slots=2, reserved=1, aging_seconds=60)
+    started, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=hold, args=(s, PRIORITY_BULK, started, release))
+    holder.start()
+    assert started.wait(5)
+
+    acquired = []
+    waiter = acquire_in_thread(s, PRIORITY_BULK, acquired)
+    time.sleep(0.3)
+    assert acquired == []  # the free reserved slot is not lent to a young bulk job
+    release.set()
+    waiter.join(5)
+    holder.join()
+    assert len(acquired) == 1 and acquired[0] >= 0.3
+
+
+def test_aged_bulk_job_borrows_only_lendable_reserved_slots(tmp_path):
+    lending = scheduler(tmp_path / 'lending', slots=2, reserved=1, aging_seconds=0.1, aged_borrow_fraction=1.0)
+    keeping = scheduler(tmp_path / 'keeping', slots=2, reserved=1, aging_seconds=0.1, aged_borrow_fraction=0.5)
+    results = {}
+    for name, s in (('lending', lending), ('keeping', keeping)):
+        started, release = threading.Event(), threading.Event()
+        holder = threading.Thread(target=hold, args=(s, PRIORITY_BULK, started, release))
+        holder.start()
+        assert started.wait(5)
+        acquired = []
+        waiter = acquire_in_thread(s, PRIORITY_BULK, acquired)
+        time.sleep(0.4)
+        results[name] = list(acquired)
+        release.set()
+        waiter.join(5)
+        holder.join()
+
+    # Past the aging limit the bulk job takes the lendable reserved slot...
+    assert len(results['lending']) == 1 and 0.1 <= results['lending'][0] < 0.4
+    # ...but never the last reserved slot
+    assert results['keeping'] == []
+
+
+def test_waits_are_published_host_wide(tmp_path):
+    first, second = scheduler(tmp_path, slots=2, reserved=1), scheduler(tmp_path, slots=2, reserved=1)
+    for s in (first, second):
+        with s.slot(PRIORITY_INTERACTIVE):
+            pass
+        with s.slot(PRIORITY_BULK):
+            pass
+        s.publish()
+    first.publish()  # nothing new: not counted twice
+
+    stats = collect_stats(str(tmp_path / 'slots'))
+    assert stats[PRIORITY_INTERACTIVE]['count'] == 2
+    assert stats[PRIORITY_BULK]['count'] == 2
+    assert first.stats()[PRIORITY_BULK]['count'] == 1
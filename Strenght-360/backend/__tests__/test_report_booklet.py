@@ -0,0 +1,57 @@
+import copy
+import json
+import sys
+
+import report_booklet
+
+PAYLOAD = {
+    'data': {
+        'id': 'b1',
+        'student_name': 'Ana',
+        'student_email': 'ana@example.com',
+        'executing_score': 5,
+        'influencing_score': 18,
+        'relationship_building_score': 20,
+        'strategic_thinking_score': 33,
+        'primary_talent_domain': 'Strategic Thinking',
+        'detailed_scores': {'subdomains': {'Achiever': 2, 'Analytical': 9, 'Ideation': 8, 'Harmony': 7,
+                                           'Strategic': 6, 'Intellection': 5}}
+    }
+}
+
+
+def with_subdomain_score(score):
+    payload = copy.deepcopy(PAYLOAD)
+    payload['data']['id'] = 'broken'
+    payload['data']['detailed_scores']['subdomains']['Achiever'] = score
+    return payload
+
+
+def test_payload_failing_processing_is_skipped(tmp_path):
+    output = tmp_path / 'booklet.pdf'
+    result = report_booklet.generate_booklet_pdf([with_subdomain_score([1]), PAYLOAD], str(output),
+                                                 sections='cover,executive_summary', history_db=None)
+
+    assert result['students'] == 1
+    assert result['skipped'] == 1
+    assert output.exists()
+
+
+def test_no_valid_payload_leaves_no_file(tmp_path):
+    output = tmp_path / 'booklet.pdf'
+    try:
+        report_booklet.generate_booklet_pdf([with_subdomain_score({'x': 1})], str(output), history_db=None)
+    except ValueError as e:
+        assert str(e) == 'No valid payloads to render'
+    else:
+        raise AssertionError('expected ValueError')
+    assert not output.exists()
+
+
+def test_trailing_flag_is_a_usage_error(tmp_path, monkeypatch, capsys):
+    payloads = tmp_path / 'payloads.json'
+    payloads.write_text(json.dumps([PAYLOAD]), encoding='utf-8')
+    monkeypatch.setattr(sys, 'argv', ['report_booklet.py', str(payloads), str(tmp_path / 'b.pdf'), '--sections'])
+
+    assert report_booklet.main() == 1
+    assert json.loads(capsys.readouterr().out) == {'success': False, 'error': '--sections needs a value'}
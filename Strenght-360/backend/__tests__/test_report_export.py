@@ -0,0 +1,15 @@
+import report_export
+from python_pdf_generator import get_detailed_combo_analysis
+
+
+def combination(theme_a, theme_b):
+    return {'pairLabel': f'{theme_a} + {theme_b}', 'content': get_detailed_combo_analysis(theme_a, theme_b)}
+
+
+def test_fallback_pair_heading_is_not_repeated():
+    assert report_export._combo_heading(combination('Achiever', 'Focus')) == 'Achiever + Focus'
+
+
+def test_named_pair_heading_keeps_label_and_name():
+    assert report_export._combo_heading(combination('Ideation', 'Analytical')) == \
+        'Ideation + Analytical: Strategic Inspiration'
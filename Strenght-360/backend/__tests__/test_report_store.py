@@ -0,0 +1,48 @@
+import copy
+
+import pytest
+
+import report_store
+from python_pdf_generator import process_psychometric_data
+from report_storage import safe_id
+
+PAYLOAD = {
+    'data': {
+        'student_name': 'Ana',
+        'student_email': 'ana@example.com',
+        'executing_score': 5,
+        'influencing_score': 18,
+        'relationship_building_score': 20,
+        'strategic_thinking_score': 33,
+        'primary_talent_domain': 'Strategic Thinking',
+    }
+}
+
+
+def processed(response_id, name):
+    payload = copy.deepcopy(PAYLOAD)
+    payload['data'].update(id=response_id, student_name=name)
+    return process_psychometric_data(payload)
+
+
+def test_safe_ids_are_kept_and_unsafe_ids_never_collide():
+    assert safe_id('81db70f4-909d-4021') == '81db70f4-909d-4021'
+    assert safe_id(14) == '14'
+    assert len({safe_id(response_id) for response_id in ('a_b', 'a.b', 'a/b', 'a b')}) == 4
+    with pytest.raises(ValueError):
+        safe_id('')
+
+
+def test_distinct_ids_get_distinct_models_and_reports(tmp_path):
+    store_dir, reports_dir = str(tmp_path / 'models'), str(tmp_path / 'reports')
+    names = {'a_b': 'Ana', 'a.b': 'Ben', 'a/b': 'Cai'}
+    for response_id, name in names.items():
+        report_store.save_assessment(processed(response_id, name), store_dir)
+
+    pdf_paths = set()
+    for response_id, name in names.items():
+        assert report_store.load_assessment(response_id, store_dir)['candidate']['name'] == name
+        pdf_path, rendered = report_store.get_or_render_pdf(response_id, store_dir, reports_dir)
+        assert rendered
+        pdf_paths.add(pdf_path)
+    assert len(pdf_paths) == 3
@@ -0,0 +1,98 @@
+import json
+import os
+
+import numpy as np
+
+import score_store
+from python_pdf_generator import THEME_ORDER
+from score_store import ScoreStore, ScoreColumns, COLUMNS, HEADER_SIZE, ID_WIDTH
+
+
+def assessment(candidate_id, score=5.0):
+    return {
+        'candidate': {'id': candidate_id, 'name': f'Candidate {candidate_id}', 'email': 'c@example.com',
+                      'created_at': '2025-01-01'},
+        'strength_scores': {name: score for name in THEME_ORDER[:10]},
+        'domainScores': {'executing': 1.0, 'influencing': 2.0, 'relationship_building': 3.0,
+                         'strategic_thinking': 4.0, 'primary_talent_domain': 'Strategic Thinking'},
+    }
+
+
+def tear_tail(root, sidecar_text='{"id": "torn'):
+    """Leave what an append interrupted before its header commit would: uncommitted bytes in every file"""
+    with open(os.path.join(root, score_store.SCORES_FILE), 'ab') as f:
+        f.write(np.full(len(COLUMNS) + 3, 9.0, dtype='<f4').tobytes())
+    with open(os.path.join(root, score_store.IDS_FILE), 'ab') as f:
+        f.write(b'torn'.ljust(ID_WIDTH, b'\0'))
+    with open(os.path.join(root, score_store.META_FILE), 'a', encoding='utf-8') as f:
+        f.write(sidecar_text)
+
+
+def assert_consistent(root, ids):
+    columns = ScoreColumns(root)
+    assert columns.id_list() == ids
+    assert [entry['id'] for entry in columns.metadata()] == ids
+    size = os.path.getsize(os.path.join(root, score_store.SCORES_FILE))
+    assert size == HEADER_SIZE + len(ids) * len(COLUMNS) * 4
+
+
+def test_appends_are_readable_as_columns(tmp_path):
+    root = str(tmp_path / 'store')
+    assert ScoreStore(root).append_many([assessment('a', 3.0), assessment('b', 7.0)]) == 2
+
+    columns = ScoreColumns(root)
+    assert columns.id_list() == ['a', 'b']
+    assert columns.column(THEME_ORDER[0]).tolist() == [3.0, 7.0]
+    assert np.isnan(columns.column(THEME_ORDER[-1])).all()
+    assert columns.domain_scores[0].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert columns.metadata()[1]['name'] == 'Candidate b'
+
+
+def test_torn_tail_is_invisible_and_discarded_by_next_append(tmp_path):
+    root = str(tmp_path / 'store')
+    store = ScoreStore(root)
+    store.append_many([assessment('a'), assessment('b')])
+    tear_tail(root)
+
+    # Readers only see committed rows
+    assert ScoreColumns(root).id_list() == ['a', 'b']
+    assert store.append(assessment('c')) == 3
+    assert_consistent(root, ['a', 'b', 'c'])
+
+
+def test_crash_between_header_commits_is_recovered(tmp_path):
+    root = str(tmp_path / 'store')
+    store = ScoreStore(root)
+    store.append(assessment('a'))
+    tear_tail(root, sidecar_text=json.dumps({'id': 'torn'}) + '\n')
+    # The id header was committed but the score header (and sidecar length) was not
+    ids_path = os.path.join(root, score_store.IDS_FILE)
+    with open(ids_path, 'r+b') as f:
+        f.write(score_store._header(np.dtype(f'S{ID_WIDTH}'), 2, None))
+
+    assert ScoreColumns(root).id_list() == ['a']
+    store.append(assessment('b'))
+    assert_consistent(root, ['a', 'b'])
+
+
+def test_legacy_store_without_sidecar_length_recovers_by_lines(tmp_path):
+    root = str(tmp_path / 'store')
+    store = ScoreStore(root)
+    store.append(assessment('a'))
+    scores_path = os.path.join(root, score_store.SCORES_FILE)
+    with open(scores_path, 'r+b') as f:
+        f.write(score_store._header(np.dtype('<f4'), 1, len(COLUMNS)))
+    assert score_store._committed(scores_path) == (1, None)
+    tear_tail(root, sidecar_text=json.dumps({'id': 'torn'}) + '\n')
+
+    store.append(assessment('b'))
+    assert_consistent(root, ['a', 'b'])
+    assert score_store._committed(scores_path)[1] is not None
+
+
+def test_long_ids_are_hashed_without_collisions(tmp_path):
+    prefix = 'x' * ID_WIDTH
+    first, second = score_store.store_id(prefix + '1'), score_store.store_id(prefix + '2')
+    assert first != second
+    assert len(first) <= ID_WIDTH and first.startswith(b'sha1:')
+    assert score_store.store_id('short') == b'short'
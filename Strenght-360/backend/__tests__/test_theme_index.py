@@ -0,0 +1,53 @@
+import multiprocessing
+
+import processing_hooks
+import theme_index
+from python_pdf_generator import THEME_ORDER
+
+
+def assessment(candidate_id, themes):
+    return {'candidate': {'id': candidate_id}, 'allThemes': [{'name': name} for name in themes]}
+
+
+def test_full_ranking_gets_every_band():
+    bands = theme_index.rank_bands(assessment(1, THEME_ORDER))
+
+    assert [name for name, band in bands if band == 'top5'] == THEME_ORDER[:5]
+    assert [name for name, band in bands if band == 'top10'] == THEME_ORDER[:10]
+    assert [name for name, band in bands if band == 'bottom5'] == THEME_ORDER[-5:]
+
+
+def test_partial_ranking_keeps_bands_apart():
+    bands = theme_index.rank_bands(assessment(1, THEME_ORDER[:6]))
+
+    assert bands == [(name, 'top5') for name in THEME_ORDER[:5]]
+
+
+def test_processing_hook_updates_configured_index(tmp_path, monkeypatch):
+    path = str(tmp_path / 'themes.npz')
+    monkeypatch.setenv('THEME_INDEX_PATH', path)
+
+    processing_hooks.record_processed(assessment('a', THEME_ORDER))
+    processing_hooks.record_processed(assessment('b', THEME_ORDER[::-1]))
+
+    index = theme_index.ThemeIndex.load(path)
+    assert index.query(f'{THEME_ORDER[0]}:top5') == ['a']
+    assert index.query(f'{THEME_ORDER[-1]}:top5') == ['b']
+
+
+def _add_batch(path, worker):
+    for n in range(10):
+        theme_index.update_index([assessment(f'{worker}-{n}', THEME_ORDER)], path)
+
+
+def test_concurrent_updates_keep_every_candidate(tmp_path):
+    path = str(tmp_path / 'themes.npz')
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_add_batch, args=(path, worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in workers)
+    assert len(theme_index.ThemeIndex.load(path)) == 40
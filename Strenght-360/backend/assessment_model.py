@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact typed model for processed StrengthsFinder 360 assessments
+Stores theme scores in a fixed-order array and refers to themes by index, converting back to
+the `process_psychometric_data` dict shape when needed.
+"""
+
+import sys
+import json
+import math
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+from python_pdf_generator import THEME_ORDER, DOMAIN_MAP, process_psychometric_data
+
+THEME_INDEX = {name: i for i, name in enumerate(THEME_ORDER)}
+DOMAIN_KEYS = ('executing', 'influencing', 'relationship_building', 'strategic_thinking')
+
+
+@dataclass(slots=True)
+class ProcessedAssessment:
+    """Processed assessment with scores in THEME_ORDER (NaN = not scored) and index-based rankings"""
+    candidate_id: Any
+    name: str
+    email: str
+    created_at: str
+    primary_talent_domain: str
+    domain_scores: array                # 'd', in DOMAIN_KEYS order
+    scores: array                       # 'd', THEME_ORDER followed by extra_themes
+    extra_themes: Tuple[str, ...]       # theme names outside DOMAIN_MAP, normally empty
+    ranking: array                      # 'H', indices of scored themes, best first
+    top5_pairs: Tuple[Tuple[int, int], ...]
+    responses: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_processed(cls, processed_data: Dict[str, Any]) -> 'ProcessedAssessment':
+        candidate = processed_data['candidate']
+        domain_scores = processed_data['domainScores']
+
+        extra_themes = tuple(name for name in processed_data['strength_scores'] if name not in THEME_INDEX)
+        index = THEME_INDEX
+        if extra_themes:
+            index = dict(THEME_INDEX)
+            for offset, name in enumerate(extra_themes):
+                index[name] = len(THEME_ORDER) + offset
+
+        scores = array('d', [math.nan]) * (len(THEME_ORDER) + len(extra_themes))
+        for name, score in processed_data['strength_scores'].items():
+            scores[index[name]] = score
+
+        ranking = array('H', (index[t['name']] for t in processed_data['allThemes']))
+        top5 = ranking[:5]
+        top5_pairs = tuple(
+            (top5[i], top5[j]) for i in range(len(top5)) for j in range(i + 1, len(top5))
+        )
+
+        return cls(
+            candidate_id=candidate['id'],
+            name=candidate['name'],
+            email=candidate['email'],
+            created_at=candidate['created_at'],
+            primary_talent_domain=domain_scores['primary_talent_domain'],
+            domain_scores=array('d', (domain_scores[key] for key in DOMAIN_KEYS)),
+            scores=scores,
+            extra_themes=extra_themes,
+            ranking=ranking,
+            top5_pairs=top5_pairs,
+            responses=processed_data.get('responses')
+        )
+
+    @classmethod
+    def from_webhook(cls, webhook_data: Dict[str, Any]) -> 'ProcessedAssessment':
+        return cls.from_processed(process_psychometric_data(webhook_data))
+
+    @property
+    def top5(self) -> Tuple[int, ...]:
+        return tuple(self.ranking[:5])
+
+    def theme_name(self, index: int) -> str:
+        if index < len(THEME_ORDER):
+            return THEME_ORDER[index]
+        return self.extra_themes[index - len(THEME_ORDER)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert back to the `process_psychometric_data` output shape (`raw` is not kept)
+        """
+        themes = {}
+        for index in self.ranking:
+            name = self.theme_name(index)
+            themes[index] = {'name': name, 'score': self.scores[index], 'domain': DOMAIN_MAP.get(name, "Unknown")}
+
+        all_themes = [themes[index] for index in self.ranking]
+        top5 = all_themes[:5]
+        top5_pairs = [
+            {'themeA': themes[a], 'themeB': themes[b], 'pairLabel': f"{themes[a]['name']} + {themes[b]['name']}"}
+            for a, b in self.top5_pairs
+        ]
+
+        domain_scores = dict(zip(DOMAIN_KEYS, self.domain_scores))
+        domain_scores['primary_talent_domain'] = self.primary_talent_domain
+
+        # strength_scores keeps fixed theme order rather than payload order
+        strength_scores = {
+            self.theme_name(i): score for i, score in enumerate(self.scores) if not math.isnan(score)
+        }
+
+        return {
+            'candidate': {
+                'id': self.candidate_id,
+                'name': self.name,
+                'email': self.email,
+                'created_at': self.created_at
+            },
+            'domainScores': domain_scores,
+            'strength_scores': strength_scores,
+            'allThemes': all_themes,
+            'top5': top5,
+            'top5Pairs': top5_pairs,
+            'responses': self.responses,
+            'raw': None
+        }
+
+
+def _synthetic_payloads(count: int) -> List[Dict[str, Any]]:
+    payloads = []
+    for n in range(count):
+        subdomains = {name: (n * 7 + i * 13) % 11 for i, name in enumerate(THEME_ORDER)}
+        payloads.append({
+            'body': {
+                'data': {
+                    'id': n,
+                    'student_name': f'Student {n}',
+                    'student_email': f'student{n}@example.com',
+                    'primary_talent_domain': 'Strategic Thinking',
+                    'created_at': '2025-11-13T10:19:26.916Z',
+                    'detailed_scores': {
+                        'executing': 5, 'influencing': 18, 'relationshipBuilding': 20, 'strategicThinking': 33,
+                        'subdomains': subdomains
+                    }
+                }
+            }
+        })
+    return payloads
+
+
+def _measure(build) -> Tuple[Any, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def benchmark(count: int = 10000) -> Dict[str, Any]:
+    """
+    Compare memory held and conversion time of dict records against ProcessedAssessment
+    """
+    payloads = _synthetic_payloads(count)
+    processed = [process_psychometric_data(p) for p in payloads]
+
+    # Payloads stay alive in both cases, so `raw` only counts as a reference; both timings
+    # include tracemalloc overhead and are only comparable with each other
+    dict_records, dict_build_s, dict_bytes = _measure(lambda: [process_psychometric_data(p) for p in payloads])
+    del dict_records
+    models, model_build_s, model_bytes = _measure(lambda: [ProcessedAssessment.from_processed(p) for p in processed])
+
+    start = time.perf_counter()
+    for model in models:
+        model.to_dict()
+    to_dict_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in processed:
+        [t['name'] for t in record['top5']]
+    dict_top5_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for model in models:
+        model.top5
+    model_top5_s = time.perf_counter() - start
+
+    return {
+        'records': count,
+        'dict_bytes_per_record': dict_bytes // count,
+        'model_bytes_per_record': model_bytes // count,
+        'dict_build_us': dict_build_s / count * 1e6,
+        'model_build_us': model_build_s / count * 1e6,
+        'to_dict_us': to_dict_s / count * 1e6,
+        'dict_top5_names_us': dict_top5_s / count * 1e6,
+        'model_top5_indices_us': model_top5_s / count * 1e6
+    }
+
+
+if __name__ == "__main__":
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(json.dumps(benchmark(records), indent=2))
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Batch PDF rendering for StrengthsFinder 360
+Renders many webhook payloads in a worker pool, either into an output directory or streamed
+into a ZIP archive (file or stdout) together with a manifest CSV in the admin export format.
+"""
+
+import sys
+import csv
+import io
+import json
+import os
+import time
+import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from python_pdf_generator import process_psychometric_data, generate_comprehensive_pdf, count_processed
+from team_report import load_cohort
+from render_scheduler import get_scheduler, PRIORITY_BULK
+from render_coalescer import payload_hash
+from history_store import sync_history
+from processing_hooks import record_processed
+from render_metrics import get_registry
+
+# Same columns as the admin `/reports/csv` export (report.csv)
+MANIFEST_FIELDS = [
+    'Response ID', 'Name', 'Email', 'Phone', 'Test Title',
+    'Primary Domain', 'Executing', 'Influencing', 'Relationship Building', 'Strategic Thinking',
+    'Submitted At', 'Auto Submit', 'Questions Answered', 'Report Download Link'
+]
+
+JOURNAL_NAME = 'journal.jsonl'
+PROGRESS_INTERVAL_SECONDS = 5
+
+
+def _payload_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Locate the data object the same way process_psychometric_data does"""
+    if webhook_data.get('body') and webhook_data['body'].get('data'):
+        return webhook_data['body']['data']
+    if webhook_data.get('data'):
+        return webhook_data['data']
+    return webhook_data
+
+
+def report_file_name(candidate: Dict[str, Any]) -> str:
+    return f"response-{candidate['id']}.pdf"
+
+
+def manifest_row(processed_data: Dict[str, Any], data: Dict[str, Any], report_link: str) -> List[Any]:
+    candidate = processed_data['candidate']
+    domain_scores = processed_data['domainScores']
+    questions_answered = data.get('questions_answered') or len(data.get('responses') or {}) or ''
+
+    return [
+        candidate['id'],
+        candidate['name'],
+        candidate['email'],
+        data.get('user_phone') or data.get('phone') or '',
+        data.get('test_title') or '',
+        domain_scores['primary_talent_domain'],
+        f"{domain_scores['executing']:.2f}",
+        f"{domain_scores['influencing']:.2f}",
+        f"{domain_scores['relationship_building']:.2f}",
+        f"{domain_scores['strategic_thinking']:.2f}",
+        candidate['created_at'],
+        'Yes' if data.get('is_auto_submit') else 'No',
+        questions_answered,
+        report_link
+    ]
+
+
+def render_payload(webhook_data: Dict[str, Any], priority: str = PRIORITY_BULK) -> Dict[str, Any]:
+    """
+    Process and render one payload in memory; runs inside a worker process
+    """
+    try:
+        processed_data = process_psychometric_data(webhook_data)
+        count_processed(processed_data)
+        previous_data = sync_history(processed_data)
+        record_processed(processed_data)
+        buffer = io.BytesIO()
+        scheduler = get_scheduler()
+        with scheduler.slot(priority):
+            generate_comprehensive_pdf(processed_data, buffer, previous_data)
+        scheduler.publish()
+        get_registry().publish()
+        file_name = report_file_name(processed_data['candidate'])
+        return {
+            "success": True,
+            "key": payload_key(webhook_data),
+            "fileName": file_name,
+            "candidate": processed_data['candidate'],
+            "manifest": manifest_row(processed_data, _payload_data(webhook_data), file_name),
+            "pdf": buffer.getvalue()
+        }
+    except Exception as e:
+        registry = get_registry()
+        registry.inc('strength360_render_errors_total')
+        registry.publish()
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def iter_rendered(payloads: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                  priority: str = PRIORITY_BULK) -> Iterator[Dict[str, Any]]:
+    """
+    Yield render results in completion order. At most two jobs per worker are in flight, so
+    memory stays bounded no matter how many payloads are passed in.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    payloads = iter(payloads)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                payload = next(payloads, None)
+                if payload is None:
+                    exhausted = True
+                else:
+                    pending.add(executor.submit(render_payload, payload, priority))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def payload_key(webhook_data: Dict[str, Any]) -> str:
+    """
+    Journal key for a payload: its response id plus a content hash, so a re-run whose input
+    changed renders that item again instead of keeping the stale PDF
+    """
+    digest = payload_hash(webhook_data)
+    response_id = _payload_data(webhook_data).get('id')
+    return f"{response_id}:{digest}" if response_id is not None else digest
+
+
+class BatchProgress:
+    """Periodic progress, rate and ETA lines on stderr"""
+
+    def __init__(self, total: Optional[int] = None, interval: float = PROGRESS_INTERVAL_SECONDS):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.skipped = 0
+        self.failed = 0
+        self.start = time.monotonic()
+        self._last_report = self.start
+
+    def advance(self, failed: bool = False) -> None:
+        self.done += 1
+        self.failed += int(failed)
+        self._maybe_report()
+
+    def skip(self) -> None:
+        self.skipped += 1
+        self._maybe_report()
+
+    def _maybe_report(self) -> None:
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        line = f"progress: {self.done} rendered, {self.skipped} skipped, {self.failed} failed, {rate:.1f}/s"
+        if self.total is not None:
+            remaining = self.total - self.done - self.skipped
+            if remaining <= 0:
+                eta = '0s'
+            else:
+                eta = f"{remaining / rate:.0f}s" if rate > 0 else 'unknown'
+            line += f", {self.done + self.skipped}/{self.total}, ETA {eta}"
+        print(line, file=sys.stderr, flush=True)
+
+
+def load_journal(journal_path: str) -> Dict[str, Dict[str, Any]]:
+    """Read completed entries; a torn last line from a crash is ignored"""
+    completed = {}
+    if not os.path.exists(journal_path):
+        return completed
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            completed[entry['key']] = entry
+    return completed
+
+
+def _output_intact(entry: Dict[str, Any]) -> bool:
+    """The journalled PDF is still on disk with the recorded size and content hash"""
+    try:
+        if os.path.getsize(entry['path']) != entry['size']:
+            return False
+        digest = hashlib.sha256()
+        with open(entry['path'], 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return False
+    return digest.hexdigest() == entry.get('sha256')
+
+
+def export_zip(payloads: Iterable[Dict[str, Any]], output, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Stream each finished PDF into a ZIP archive as it completes, then append manifest.csv.
+    `output` may be a path or a binary stream; unseekable streams such as stdout work too.
+    """
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(MANIFEST_FIELDS)
+    errors = []
+    rendered = 0
+    progress = BatchProgress(len(payloads) if hasattr(payloads, '__len__') else None)
+
+    # PDF page streams are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for result in iter_rendered(payloads, workers):
+            progress.advance(failed=not result['success'])
+            if not result['success']:
+                errors.append(result['error'])
+                continue
+            archive.writestr(result['fileName'], result['pdf'])
+            writer.writerow(result['manifest'])
+            rendered += 1
+
+        archive.writestr('manifest.csv', manifest.getvalue())
+
+    progress.report()
+    return {"success": True, "rendered": rendered, "failed": len(errors), "errors": errors}
+
+
+def render_to_directory(payloads: Iterable[Dict[str, Any]], output_dir: str,
+                        workers: Optional[int] = None, journal_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Render each payload to `<output_dir>/response-<id>.pdf` and write manifest.csv alongside.
+    Completed items are appended to a journal; re-running skips every item whose payload is
+    unchanged and whose journalled output is still on disk with the recorded size and hash.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    journal_path = journal_path or os.path.join(output_dir, JOURNAL_NAME)
+    completed = {key: entry for key, entry in load_journal(journal_path).items() if _output_intact(entry)}
+    progress = BatchProgress(len(payloads) if hasattr(payloads, '__len__') else None)
+    errors = []
+    rendered = 0
+
+    with open(os.path.join(output_dir, 'manifest.csv'), 'w', newline='', encoding='utf-8') as manifest, \
+            open(journal_path, 'a', encoding='utf-8') as journal:
+        writer = csv.writer(manifest)
+        writer.writerow(MANIFEST_FIELDS)
+
+        def pending(items):
+            for payload in items:
+                entry = completed.get(payload_key(payload))
+                if entry is None:
+                    yield payload
+                else:
+                    writer.writerow(entry['manifest'])
+                    progress.skip()
+
+        for result in iter_rendered(pending(payloads), workers):
+            progress.advance(failed=not result['success'])
+            if not result['success']:
+                errors.append(result['error'])
+                continue
+
+            path = os.path.join(output_dir, result['fileName'])
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(result['pdf'])
+            os.replace(tmp_path, path)
+            writer.writerow(result['manifest'])
+
+            # Journal only after the PDF is in place, so a crash can at worst re-render an item
+            journal.write(json.dumps({
+                'key': result['key'],
+                'path': path,
+                'size': len(result['pdf']),
+                'sha256': hashlib.sha256(result['pdf']).hexdigest(),
+                'manifest': result['manifest']
+            }) + '\n')
+            journal.flush()
+            rendered += 1
+
+    progress.report()
+    return {"success": True, "rendered": rendered, "skipped": progress.skipped,
+            "failed": len(errors), "errors": errors}
+
+
+def main():
+    """
+    Usage:
+      batch_render.py <payloads.json> --zip <output.zip|->
+      batch_render.py <payloads.json> --output-dir <dir> [--journal <journal.jsonl>]
+    Optional: --workers N
+    """
+    # With `--zip -` stdout carries the archive, so the summary goes to stderr
+    summary_stream = sys.stdout
+    try:
+        args = sys.argv[1:]
+        workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+        journal_path = args[args.index('--journal') + 1] if '--journal' in args else None
+
+        if not args or not ('--zip' in args or '--output-dir' in args):
+            raise ValueError('Usage: batch_render.py <payloads.json> (--zip <output.zip|-> | --output-dir <dir> '
+                             '[--journal <journal.jsonl>]) [--workers N]')
+
+        payloads = load_cohort(args[0])
+
+        if '--zip' in args:
+            target = args[args.index('--zip') + 1]
+            if target == '-':
+                summary_stream = sys.stderr
+                result = export_zip(payloads, sys.stdout.buffer, workers)
+                sys.stdout.buffer.flush()
+            else:
+                result = export_zip(payloads, target, workers)
+                result["filePath"] = os.path.abspath(target)
+        else:
+            target = args[args.index('--output-dir') + 1]
+            result = render_to_directory(payloads, target, workers, journal_path)
+            result["outputDir"] = os.path.abspath(target)
+
+        print(json.dumps(result), file=summary_stream)
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response), file=summary_stream)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Cohort analytics for StrengthsFinder 360
+Maintains a 34x34 co-occurrence matrix of top-5 themes across a cohort, updated incrementally
+as payloads are processed and persisted to disk for fast top-k queries and a summary page.
+Each candidate's counted top 5 is kept in a SQLite sidecar (`<matrix>.members.db`), so a
+re-processed payload replaces that candidate's contribution instead of counting it twice.
+"""
+
+import sys
+import json
+import os
+import fcntl
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from python_pdf_generator import THEME_ORDER, DOMAIN_MAP, process_psychometric_data, get_detailed_combo_analysis
+from assessment_model import THEME_INDEX
+from team_report import load_cohort
+
+DEFAULT_MATRIX_PATH = os.environ.get('COHORT_MATRIX_PATH', 'cohort_cooccurrence.npz')
+# The processing path only updates a matrix when one is configured explicitly
+TRACKED_MATRIX_PATH = os.environ.get('COHORT_MATRIX_PATH')
+
+_MEMBERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    candidate_id TEXT PRIMARY KEY,
+    top5 TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_UPPER = np.triu_indices(len(THEME_ORDER), k=1)
+
+
+def top5_indices(processed_data: Dict[str, Any]) -> List[int]:
+    return [THEME_INDEX[t['name']] for t in processed_data['top5'] if t['name'] in THEME_INDEX]
+
+
+class CooccurrenceMatrix:
+    """
+    Symmetric count matrix: counts[i, j] is the number of candidates with both themes i and j in
+    their top 5, and the diagonal counts[i, i] is how often theme i appears in a top 5
+    """
+
+    def __init__(self, counts: np.ndarray = None, candidates: int = 0, generation: int = 0):
+        size = len(THEME_ORDER)
+        self.counts = counts if counts is not None else np.zeros((size, size), dtype=np.int64)
+        self.candidates = candidates
+        self.generation = generation
+
+    def add(self, processed_data: Dict[str, Any]) -> None:
+        self.add_indices(top5_indices(processed_data))
+
+    def add_indices(self, indices: List[int]) -> None:
+        self.counts[np.ix_(indices, indices)] += 1
+        self.candidates += 1
+
+    def remove_indices(self, indices: List[int]) -> None:
+        self.counts[np.ix_(indices, indices)] -= 1
+        self.candidates -= 1
+
+    def add_many(self, processed_list: Iterable[Dict[str, Any]]) -> None:
+        """Add a batch with a single one-hot matrix product instead of per-candidate updates"""
+        self.add_many_indices([top5_indices(processed_data) for processed_data in processed_list])
+
+    def add_many_indices(self, rows: List[List[int]]) -> None:
+        if not rows:
+            return
+        one_hot = np.zeros((len(rows), len(THEME_ORDER)), dtype=np.int64)
+        for row, indices in enumerate(rows):
+            one_hot[row, indices] = 1
+        self.counts += one_hot.T @ one_hot
+        self.candidates += len(rows)
+
+    def top_pairs(self, k: int = 10) -> List[Tuple[str, str, int]]:
+        values = self.counts[_UPPER]
+        k = min(k, values.size)
+        if k <= 0:
+            return []
+        best = np.argpartition(values, -k)[-k:]
+        best = best[np.argsort(-values[best], kind='stable')]
+        return [
+            (THEME_ORDER[_UPPER[0][i]], THEME_ORDER[_UPPER[1][i]], int(values[i]))
+            for i in best if values[i] > 0
+        ]
+
+    def top_themes(self, k: int = 10) -> List[Tuple[str, int]]:
+        frequency = np.diagonal(self.counts)
+        best = np.argsort(-frequency, kind='stable')[:k]
+        return [(THEME_ORDER[i], int(frequency[i])) for i in best if frequency[i] > 0]
+
+    def partners(self, theme: str, k: int = 5) -> List[Tuple[str, int]]:
+        """Themes that most often share a top 5 with `theme`"""
+        row = self.counts[THEME_INDEX[theme]].copy()
+        row[THEME_INDEX[theme]] = -1
+        best = np.argsort(-row, kind='stable')[:k]
+        return [(THEME_ORDER[i], int(row[i])) for i in best if row[i] > 0]
+
+    def save(self, path: str = DEFAULT_MATRIX_PATH) -> str:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, counts=self.counts, candidates=np.int64(self.candidates),
+                 generation=np.int64(self.generation), themes=np.array(THEME_ORDER))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MATRIX_PATH) -> 'CooccurrenceMatrix':
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as stored:
+            if list(stored['themes']) != THEME_ORDER:
+                raise ValueError('Co-occurrence matrix was built with a different theme order')
+            generation = int(stored['generation']) if 'generation' in stored else 0
+            return cls(stored['counts'].copy(), int(stored['candidates']), generation)
+
+
+def members_path(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}.members.db"
+
+
+def _load_tracked(conn: sqlite3.Connection, path: str) -> CooccurrenceMatrix:
+    """
+    Load the matrix, rebuilding it from the members table when the two disagree (a crash between
+    saving the matrix and committing the members leaves the matrix one generation ahead)
+    """
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    generation = row[0] if row else 0
+    matrix = CooccurrenceMatrix.load(path)
+    if matrix.generation != generation:
+        matrix = CooccurrenceMatrix(generation=generation)
+        matrix.add_many_indices([json.loads(top5) for (top5,) in conn.execute("SELECT top5 FROM members")])
+    return matrix
+
+
+def update_cooccurrence(processed_list: Iterable[Dict[str, Any]],
+                        path: str = DEFAULT_MATRIX_PATH) -> CooccurrenceMatrix:
+    """
+    Count each candidate's top 5 in the persisted matrix, replacing the contribution recorded for
+    a candidate id that was counted before. Serialised across processes by `<matrix>.lock`.
+    """
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with closing(sqlite3.connect(members_path(path), timeout=30)) as conn, conn:
+            conn.executescript(_MEMBERS_SCHEMA)
+            matrix = _load_tracked(conn, path)
+            changed = False
+            for processed_data in processed_list:
+                candidate_id = str(processed_data['candidate']['id'])
+                indices = top5_indices(processed_data)
+                row = conn.execute("SELECT top5 FROM members WHERE candidate_id = ?", (candidate_id,)).fetchone()
+                if row is not None:
+                    if json.loads(row[0]) == indices:
+                        continue
+                    matrix.remove_indices(json.loads(row[0]))
+                matrix.add_indices(indices)
+                conn.execute("INSERT OR REPLACE INTO members (candidate_id, top5) VALUES (?, ?)",
+                             (candidate_id, json.dumps(indices)))
+                changed = True
+
+            if changed:
+                # The matrix is saved before the members commit; see _load_tracked
+                matrix.generation += 1
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                             (matrix.generation,))
+                matrix.save(path)
+    return matrix
+
+
+def record_cooccurrence(processed_data: Dict[str, Any], path: Optional[str] = TRACKED_MATRIX_PATH) -> None:
+    """Count this assessment in the cohort matrix when one is configured (COHORT_MATRIX_PATH)"""
+    if path:
+        update_cooccurrence([processed_data], path)
+
+
+def generate_cohort_summary_pdf(matrix: CooccurrenceMatrix, output_filename: str, k: int = 15) -> str:
+    """
+    Render a one-page summary of the most common top-5 themes and theme combinations
+    """
+    doc = SimpleDocTemplate(
+        output_filename,
+        pagesize=A4,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch
+    )
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=12,
+        alignment=1,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    heading1_style = ParagraphStyle(
+        'CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black
+    )
+
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (-2, 0), (-1, -1), 'CENTER'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F8F9FA')),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ])
+
+    candidates = matrix.candidates or 1
+
+    story = []
+    story.append(Paragraph("COHORT STRENGTH COMBINATIONS", title_style))
+    story.append(Paragraph(f"<b>Candidates:</b> {matrix.candidates}", normal_style))
+    story.append(Spacer(1, 0.2*inch))
+
+    story.append(Paragraph("Most Common Top-5 Theme Pairs", heading1_style))
+    pair_rows = [['Combination', 'Theme Pair', 'Candidates', 'Share']]
+    for theme_a, theme_b, count in matrix.top_pairs(k):
+        pair_rows.append([
+            get_detailed_combo_analysis(theme_a, theme_b)['name'],
+            f"{theme_a} + {theme_b}",
+            str(count),
+            f"{count / candidates * 100:.1f}%"
+        ])
+    pair_table = Table(pair_rows, colWidths=[2.2*inch, 2.6*inch, 0.9*inch, 0.8*inch])
+    pair_table.setStyle(table_style)
+    story.append(pair_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    story.append(Paragraph("Most Common Top-5 Themes", heading1_style))
+    theme_rows = [['Theme', 'Domain', 'Candidates', 'Share']]
+    for theme, count in matrix.top_themes(10):
+        theme_rows.append([theme, DOMAIN_MAP[theme], str(count), f"{count / candidates * 100:.1f}%"])
+    theme_table = Table(theme_rows, colWidths=[2.2*inch, 2.6*inch, 0.9*inch, 0.8*inch])
+    theme_table.setStyle(table_style)
+    story.append(theme_table)
+
+    doc.build(story)
+    return output_filename
+
+
+def main():
+    """
+    Usage:
+      cohort_analytics.py add <payloads.json> [matrix.npz]
+      cohort_analytics.py top [k] [matrix.npz]
+      cohort_analytics.py report <output.pdf> [matrix.npz]
+    """
+    try:
+        if len(sys.argv) < 2 or sys.argv[1] not in ('add', 'top', 'report'):
+            raise ValueError('Usage: cohort_analytics.py (add <payloads.json> | top [k] | report <output.pdf>) [matrix.npz]')
+
+        command = sys.argv[1]
+        matrix_path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_MATRIX_PATH
+
+        if command == 'add':
+            processed_list = []
+            skipped = 0
+            for payload in load_cohort(sys.argv[2]):
+                try:
+                    processed_list.append(process_psychometric_data(payload))
+                except ValueError:
+                    skipped += 1
+            matrix = update_cooccurrence(processed_list, matrix_path)
+            response = {"success": True, "added": len(processed_list), "skipped": skipped,
+                        "candidates": matrix.candidates}
+        elif command == 'top':
+            matrix = CooccurrenceMatrix.load(matrix_path)
+            k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+            response = {
+                "success": True,
+                "candidates": matrix.candidates,
+                "pairs": [{"themeA": a, "themeB": b, "count": c} for a, b, c in matrix.top_pairs(k)],
+                "themes": [{"theme": t, "count": c} for t, c in matrix.top_themes(k)]
+            }
+        else:
+            pdf_path = generate_cohort_summary_pdf(CooccurrenceMatrix.load(matrix_path), sys.argv[2])
+            response = {"success": True, "filePath": os.path.abspath(pdf_path),
+                        "fileName": os.path.basename(pdf_path)}
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
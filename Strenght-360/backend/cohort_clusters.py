@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Cohort archetype clustering for StrengthsFinder 360
+Clusters the N x 34 theme score matrix with k-means (k-means++ seeding; mini-batch updates for
+large cohorts), labels each cluster by its dominant domain and top themes and renders a cohort
+archetype page. Distances are always computed in fixed-size row blocks, so memory beyond the
+score matrix itself stays bounded.
+"""
+
+import sys
+import json
+import os
+import time
+import tracemalloc
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from python_pdf_generator import THEME_ORDER, DOMAIN_MAP, process_psychometric_data
+from profile_index import ProfileIndex, profile_vector
+from team_report import DOMAIN_ORDER, load_cohort
+from score_store import open_store
+
+# Full-batch Lloyd iterations up to this many profiles, mini-batch updates above it
+MINI_BATCH_THRESHOLD = 50000
+MINI_BATCH_SIZE = 4096
+MINI_BATCH_STEPS = 300
+LLOYD_MAX_ITERATIONS = 100
+# Rows per distance block and rows sampled for k-means++ seeding on large cohorts
+BLOCK_ROWS = 32768
+SEED_SAMPLE_ROWS = 20000
+
+_DOMAIN_COLUMNS = np.array([[DOMAIN_MAP[theme] == domain for domain in DOMAIN_ORDER] for theme in THEME_ORDER],
+                           dtype=np.float32)
+
+
+def _squared_distances(rows: np.ndarray, centers: np.ndarray, center_sq_norms: np.ndarray) -> np.ndarray:
+    row_sq_norms = np.einsum('ij,ij->i', rows, rows)[:, None]
+    return np.maximum(row_sq_norms - 2 * rows @ centers.T + center_sq_norms[None, :], 0)
+
+
+def assign(scores: np.ndarray, centers: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Nearest center per row and the total squared distance (inertia), computed block by block"""
+    labels = np.empty(len(scores), dtype=np.int32)
+    inertia = 0.0
+    center_sq_norms = np.einsum('ij,ij->i', centers, centers)
+    for start in range(0, len(scores), BLOCK_ROWS):
+        distances = _squared_distances(np.asarray(scores[start:start + BLOCK_ROWS], dtype=np.float32),
+                                       centers, center_sq_norms)
+        block_labels = distances.argmin(axis=1)
+        labels[start:start + BLOCK_ROWS] = block_labels
+        inertia += float(distances[np.arange(len(block_labels)), block_labels].sum())
+    return labels, inertia
+
+
+def kmeans_plus_plus(scores: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Greedy k-means++ seeding: each step draws a few D^2-weighted candidates and keeps the one
+    that lowers the total distance most. Large cohorts are seeded from a uniform row sample.
+    """
+    if len(scores) > SEED_SAMPLE_ROWS:
+        sample = np.asarray(scores[np.sort(rng.choice(len(scores), SEED_SAMPLE_ROWS, replace=False))],
+                            dtype=np.float32)
+    else:
+        sample = np.asarray(scores, dtype=np.float32)
+    trials = 2 + int(np.log(k))
+
+    centers = np.empty((k, sample.shape[1]), dtype=np.float32)
+    centers[0] = sample[rng.integers(len(sample))]
+    closest = _squared_distances(sample, centers[:1], np.einsum('ij,ij->i', centers[:1], centers[:1]))[:, 0]
+    for i in range(1, k):
+        total = closest.sum()
+        if total > 0:
+            candidates = rng.choice(len(sample), size=trials, p=closest / total)
+        else:
+            candidates = rng.integers(len(sample), size=trials)
+        options = sample[candidates]
+        distances = np.minimum(
+            closest[:, None], _squared_distances(sample, options, np.einsum('ij,ij->i', options, options)))
+        best = int(distances.sum(axis=0).argmin())
+        centers[i] = options[best]
+        closest = distances[:, best]
+    return centers
+
+
+def _lloyd(scores: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    for _ in range(LLOYD_MAX_ITERATIONS):
+        labels, _ = assign(scores, centers)
+        counts = np.bincount(labels, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, scores)
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(updated, centers, atol=1e-4):
+            return updated
+        centers = updated.astype(np.float32)
+    return centers
+
+
+def _mini_batch(scores: np.ndarray, centers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Mini-batch k-means: each center moves toward its batch members with a 1/count step size"""
+    counts = np.zeros(len(centers), dtype=np.int64)
+    for _ in range(MINI_BATCH_STEPS):
+        batch = np.asarray(scores[np.sort(rng.integers(0, len(scores), MINI_BATCH_SIZE))], dtype=np.float32)
+        labels = _squared_distances(batch, centers, np.einsum('ij,ij->i', centers, centers)).argmin(axis=1)
+        batch_counts = np.bincount(labels, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+        counts += batch_counts
+        moved = batch_counts > 0
+        rate = (batch_counts[moved] / counts[moved])[:, None]
+        centers[moved] += rate * (sums[moved] / batch_counts[moved][:, None] - centers[moved])
+    return centers
+
+
+def cluster_profiles(scores: np.ndarray, k: int, seed: int = 0,
+                     mini_batch: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Cluster an N x 34 score matrix (THEME_ORDER columns). Returns centers, labels, sizes and
+    inertia; mini-batch updates are used automatically above MINI_BATCH_THRESHOLD rows.
+    """
+    if k < 1 or k > len(scores):
+        raise ValueError(f'Cannot form {k} clusters from {len(scores)} profiles')
+    rng = np.random.default_rng(seed)
+    if mini_batch is None:
+        mini_batch = len(scores) > MINI_BATCH_THRESHOLD
+
+    centers = kmeans_plus_plus(scores, k, rng)
+    centers = _mini_batch(scores, centers, rng) if mini_batch else _lloyd(scores, centers)
+    labels, inertia = assign(scores, centers)
+    return {
+        'centers': centers,
+        'labels': labels,
+        'sizes': np.bincount(labels, minlength=k),
+        'inertia': inertia,
+        'miniBatch': mini_batch
+    }
+
+
+def describe_archetypes(result: Dict[str, Any], top_themes: int = 3) -> List[Dict[str, Any]]:
+    """Label each cluster by its dominant domain and highest-scoring themes, largest first"""
+    total = int(result['sizes'].sum()) or 1
+    archetypes = []
+    for cluster, center in enumerate(result['centers']):
+        domain_scores = center @ _DOMAIN_COLUMNS
+        dominant = DOMAIN_ORDER[int(domain_scores.argmax())]
+        themes = [THEME_ORDER[i] for i in np.argsort(-center, kind='stable')[:top_themes]]
+        size = int(result['sizes'][cluster])
+        archetypes.append({
+            'cluster': cluster,
+            'label': f"{dominant}: {' / '.join(themes)}",
+            'dominantDomain': dominant,
+            'topThemes': themes,
+            'domainScores': {domain: round(float(score), 1) for domain, score in zip(DOMAIN_ORDER, domain_scores)},
+            'size': size,
+            'share': round(size / total, 4)
+        })
+    archetypes.sort(key=lambda archetype: -archetype['size'])
+    return archetypes
+
+
+def generate_archetype_pdf(archetypes: List[Dict[str, Any]], output_filename: str,
+                           title: str = "COHORT STRENGTH ARCHETYPES") -> str:
+    """
+    Render a one-page cohort archetype summary
+    """
+    doc = SimpleDocTemplate(
+        output_filename,
+        pagesize=landscape(A4),
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=12,
+        alignment=1,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black
+    )
+
+    total = sum(archetype['size'] for archetype in archetypes)
+    story = []
+    story.append(Paragraph(title, title_style))
+    story.append(Paragraph(
+        f"<b>Profiles:</b> {total} &nbsp; <b>Archetypes:</b> {len(archetypes)}. Each archetype is a group of "
+        "candidates with similar theme scores, named after its strongest domain and themes.",
+        normal_style
+    ))
+    story.append(Spacer(1, 0.2*inch))
+
+    rows = [['Archetype', 'Candidates', 'Share', 'Dominant Domain', 'Top Themes'] + DOMAIN_ORDER]
+    for number, archetype in enumerate(archetypes, start=1):
+        rows.append([
+            str(number),
+            str(archetype['size']),
+            f"{archetype['share'] * 100:.1f}%",
+            archetype['dominantDomain'],
+            ', '.join(archetype['topThemes'])
+        ] + [f"{archetype['domainScores'][domain]:.1f}" for domain in DOMAIN_ORDER])
+
+    table = Table(rows, colWidths=[0.7*inch, 0.8*inch, 0.6*inch, 1.3*inch, 2.6*inch] + [1.1*inch] * 4,
+                  repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (2, -1), 'CENTER'),
+        ('ALIGN', (5, 0), (-1, -1), 'CENTER'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ]))
+    story.append(table)
+
+    doc.build(story)
+    return output_filename
+
+
+def load_scores(path: str) -> Tuple[List[str], np.ndarray]:
+    """Candidate ids and score matrix from a profile index (.npz), a score store directory or a payloads file"""
+    if path.endswith('.npz'):
+        index = ProfileIndex.load(path)
+        return index.ids, index.vectors
+    if os.path.isdir(path):
+        # Latest attempt per candidate, unscored themes as 0 like profile_vector
+        columns = open_store(path)
+        rows = columns.latest_rows()
+        ids = [candidate_id.decode('utf-8') for candidate_id in columns.ids[rows].tolist()]
+        return ids, np.nan_to_num(columns.theme_scores[rows], nan=0.0)
+    ids = []
+    rows = []
+    for payload in load_cohort(path):
+        try:
+            processed_data = process_psychometric_data(payload)
+        except ValueError:
+            continue
+        ids.append(str(processed_data['candidate']['id']))
+        rows.append(profile_vector(processed_data['strength_scores']))
+    return ids, np.stack(rows) if rows else np.zeros((0, len(THEME_ORDER)), dtype=np.float32)
+
+
+def benchmark(sizes: List[int], k: int = 8) -> List[Dict[str, Any]]:
+    """Mini-batch clustering time and peak extra memory beyond the score matrix"""
+    results = []
+    for size in sizes:
+        rng = np.random.default_rng(size)
+        # Synthetic archetypes: a few profile templates plus per-candidate noise
+        templates = rng.integers(0, 8, size=(k, len(THEME_ORDER))).astype(np.float32)
+        scores = templates[rng.integers(0, k, size)] + rng.normal(0, 1.0, (size, len(THEME_ORDER))).astype(np.float32)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = cluster_profiles(scores, k, mini_batch=True)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            'profiles': size,
+            'k': k,
+            'seconds': round(elapsed, 2),
+            'score_matrix_mb': round(scores.nbytes / 1e6, 1),
+            'peak_extra_mb': round(peak / 1e6, 1),
+            'inertia_per_profile': round(result['inertia'] / size, 2)
+        })
+    return results
+
+
+def main():
+    """
+    Usage:
+      cohort_clusters.py <payloads.json|profile_index.npz|score_store_dir> --k K [--seed N] [--pdf output.pdf]
+      cohort_clusters.py benchmark [size,size,...]
+    """
+    try:
+        args = sys.argv[1:]
+        if args and args[0] == 'benchmark':
+            sizes = [int(size) for size in args[1].split(',')] if len(args) > 1 else [50000, 100000, 500000]
+            print(json.dumps({"success": True, "benchmark": benchmark(sizes)}))
+            return 0
+
+        if not args or '--k' not in args:
+            raise ValueError('Usage: cohort_clusters.py <payloads.json|profile_index.npz|score_store_dir> --k K [--seed N] '
+                             '[--pdf output.pdf] | benchmark [sizes]')
+
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args else default
+
+        ids, scores = load_scores(args[0])
+        result = cluster_profiles(scores, int(option('--k')), int(option('--seed', 0)))
+        archetypes = describe_archetypes(result)
+        response = {
+            "success": True,
+            "profiles": len(ids),
+            "inertia": round(result['inertia'], 2),
+            "miniBatch": result['miniBatch'],
+            "archetypes": archetypes,
+            "assignments": {candidate_id: int(label) for candidate_id, label in zip(ids, result['labels'])}
+        }
+
+        pdf_path = option('--pdf')
+        if pdf_path:
+            generate_archetype_pdf(archetypes, pdf_path)
+            response["filePath"] = os.path.abspath(pdf_path)
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Content catalog versions for StrengthsFinder 360
+Every theme description (get_elaborate_theme_description) and pair analysis
+(get_detailed_combo_analysis) is a catalog entry whose version is a hash of its text. Stored
+reports record the entry versions they were rendered from (see ReportStorage), so after a
+content fix only the reports that used a changed entry are re-rendered, from their stored
+report models (report_store.py).
+
+Typical use: `snapshot before.json`, edit the content, then `diff before.json` to see what
+changed and `rerender before.json` to refresh the affected reports.
+"""
+
+import sys
+import json
+import os
+import time
+from itertools import permutations
+from typing import Dict, Any, Optional
+
+from python_pdf_generator import (
+    THEME_ORDER,
+    get_elaborate_theme_description,
+    get_detailed_combo_analysis,
+    content_entry_version,
+    theme_entry_key,
+    pair_entry_key,
+)
+from report_storage import ReportStorage
+from report_store import DEFAULT_STORE_DIR, DEFAULT_REPORTS_DIR, model_path, get_or_render_pdf
+from render_scheduler import PRIORITY_BULK
+
+
+def build_catalog() -> Dict[str, str]:
+    """Current version of every theme entry and every ordered pair of themes"""
+    catalog = {theme_entry_key(name): content_entry_version(get_elaborate_theme_description(name))
+               for name in THEME_ORDER}
+    for theme1, theme2 in permutations(THEME_ORDER, 2):
+        catalog[pair_entry_key(theme1, theme2)] = content_entry_version(get_detailed_combo_analysis(theme1, theme2))
+    return catalog
+
+
+def save_catalog(catalog: Dict[str, str], path: str) -> str:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'createdAt': time.time(), 'entries': catalog}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_catalog(path: str) -> Dict[str, str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get('entries'), dict):
+        raise ValueError(f"{path} is not a content catalog snapshot")
+    return data['entries']
+
+
+def diff_catalogs(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Entries added, changed or removed between two catalogs, with their new version (None = removed)"""
+    return {entry: new.get(entry) for entry in sorted(set(old) | set(new)) if old.get(entry) != new.get(entry)}
+
+
+def rerender_affected(changed: Dict[str, Optional[str]], storage_dir: str = DEFAULT_REPORTS_DIR,
+                      store_dir: str = DEFAULT_STORE_DIR, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Re-render the stored reports that used a changed entry at an older version. Reports without
+    a stored model cannot be rebuilt here and are listed as missing; a report that fails to
+    render is listed as failed and the rest carry on.
+    """
+    storage = ReportStorage(storage_dir)
+    affected = storage.reports_using(changed)
+    rerendered, missing, failed = [], [], []
+    start = time.perf_counter()
+    for response_id in affected:
+        if not os.path.exists(model_path(response_id, store_dir)):
+            missing.append(response_id)
+            continue
+        if not dry_run:
+            try:
+                get_or_render_pdf(response_id, store_dir, storage_dir, force=True, priority=PRIORITY_BULK)
+            except Exception as e:
+                failed.append({'responseId': response_id, 'error': str(e)})
+                continue
+        rerendered.append(response_id)
+
+    return {
+        'changedEntries': len(changed),
+        'storedReports': storage.stats()['reports'],
+        'affected': len(affected),
+        'rerendered': len(rerendered),
+        'missing': missing[:50],
+        'missingCount': len(missing),
+        'failed': failed[:50],
+        'failedCount': len(failed),
+        'dryRun': dry_run,
+        'elapsedSeconds': round(time.perf_counter() - start, 2)
+    }
+
+
+def main():
+    """
+    Usage:
+      content_catalog.py snapshot <catalog.json>
+      content_catalog.py diff <old_catalog.json> [new_catalog.json] [--storage-dir DIR]
+      content_catalog.py rerender <old_catalog.json> [--storage-dir DIR] [--store-dir DIR] [--dry-run]
+    The new catalog defaults to the content in the current code; rerender always renders with
+    the current code. Directories default to REPORTS_DIR / REPORT_STORE_DIR.
+    """
+    try:
+        args = sys.argv[1:]
+        options = {}
+        for flag in ('--storage-dir', '--store-dir'):
+            if flag in args:
+                position = args.index(flag)
+                if position + 1 >= len(args):
+                    raise ValueError(f'{flag} needs a directory')
+                options[flag] = args[position + 1]
+                del args[position:position + 2]
+        dry_run = '--dry-run' in args
+        args = [arg for arg in args if arg != '--dry-run']
+        if len(args) < 2 or args[0] not in ('snapshot', 'diff', 'rerender'):
+            raise ValueError('Usage: content_catalog.py snapshot <catalog.json> | diff <old.json> [new.json] '
+                             '[--storage-dir DIR] | rerender <old.json> [--storage-dir DIR] [--store-dir DIR] [--dry-run]')
+
+        command = args[0]
+        storage_dir = options.get('--storage-dir', DEFAULT_REPORTS_DIR)
+        if command == 'snapshot':
+            catalog = build_catalog()
+            response = {"success": True, "catalogPath": os.path.abspath(save_catalog(catalog, args[1])),
+                        "entries": len(catalog)}
+        elif command == 'diff':
+            new = load_catalog(args[2]) if len(args) > 2 else build_catalog()
+            changed = diff_catalogs(load_catalog(args[1]), new)
+            storage = ReportStorage(storage_dir)
+            response = {
+                "success": True,
+                "changed": changed,
+                "storedReports": storage.stats()['reports'],
+                "affected": len(storage.reports_using(changed))
+            }
+        else:
+            changed = diff_catalogs(load_catalog(args[1]), build_catalog())
+            response = {"success": True, **rerender_affected(
+                changed, storage_dir, options.get('--store-dir', DEFAULT_STORE_DIR), dry_run)}
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+CSV ingestion for StrengthsFinder 360
+Streams an admin report export (report.csv) in chunks, converts each chunk column-wise to typed
+values and maps the rows to webhook payloads for batch rendering. Rows with a malformed cell are
+skipped and reported rather than ending the run.
+"""
+
+import sys
+import csv
+import json
+import os
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from batch_render import MANIFEST_FIELDS, export_zip, render_to_directory
+
+DEFAULT_CHUNK_SIZE = 500
+
+SCORE_COLUMNS = ['Executing', 'Influencing', 'Relationship Building', 'Strategic Thinking']
+
+
+def _to_float(value: str) -> float:
+    return float(value) if value else 0.0
+
+
+def _to_int(value: str) -> int:
+    return int(value) if value else 0
+
+
+def _to_flag(value: str) -> bool:
+    return value == 'Yes'
+
+
+CONVERTERS = {
+    **{name: _to_float for name in SCORE_COLUMNS},
+    'Questions Answered': _to_int,
+    'Auto Submit': _to_flag,
+}
+
+
+def iter_csv_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    rejected: Optional[List[str]] = None) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Yield the export in column-oriented chunks with numeric and flag columns already converted.
+    Rows that fail conversion are left out of their chunk and described in `rejected`.
+    """
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        missing = [name for name in ('Response ID', 'Name', 'Email') if name not in header]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+        positions = {name: header.index(name) for name in MANIFEST_FIELDS if name in header}
+
+        rows = []
+        for row in reader:
+            if row:
+                rows.append((reader.line_num, row))
+            if len(rows) == chunk_size:
+                yield _columns(rows, positions, rejected)
+                rows = []
+        if rows:
+            yield _columns(rows, positions, rejected)
+
+
+def _columns(rows: List[Tuple[int, List[str]]], positions: Dict[str, int],
+             rejected: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    fields = [(name, position, CONVERTERS.get(name)) for name, position in positions.items()]
+    columns = {name: [] for name in positions}
+    kept = 0
+    for line, row in rows:
+        values = []
+        try:
+            for name, position, convert in fields:
+                value = row[position] if position < len(row) else ''
+                values.append(convert(value) if convert else value)
+        except ValueError as e:
+            if rejected is not None:
+                rejected.append(f"line {line}: {name}: {e}")
+            continue
+        for (name, _, _), value in zip(fields, values):
+            columns[name].append(value)
+        kept += 1
+
+    columns['_rows'] = kept
+    return columns
+
+
+def chunk_to_payloads(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Map one columnar chunk to `process_psychometric_data` input. The export has no subdomain
+    scores, so processing uses its domain-score fallback.
+    """
+    empty_text = [''] * columns['_rows']
+    empty_score = [0.0] * columns['_rows']
+
+    return [
+        {
+            'data': {
+                'id': response_id,
+                'student_name': name,
+                'student_email': email,
+                'user_phone': phone,
+                'test_title': test_title,
+                'primary_talent_domain': primary or 'Not Specified',
+                'executing_score': executing,
+                'influencing_score': influencing,
+                'relationship_building_score': relationship_building,
+                'strategic_thinking_score': strategic_thinking,
+                'created_at': submitted_at,
+                'is_auto_submit': auto_submit,
+                'questions_answered': questions_answered
+            }
+        }
+        for (response_id, name, email, phone, test_title, primary, executing, influencing,
+             relationship_building, strategic_thinking, submitted_at, auto_submit, questions_answered)
+        in zip(
+            columns['Response ID'],
+            columns['Name'],
+            columns['Email'],
+            columns.get('Phone', empty_text),
+            columns.get('Test Title', empty_text),
+            columns.get('Primary Domain', empty_text),
+            columns.get('Executing', empty_score),
+            columns.get('Influencing', empty_score),
+            columns.get('Relationship Building', empty_score),
+            columns.get('Strategic Thinking', empty_score),
+            columns.get('Submitted At', empty_text),
+            columns.get('Auto Submit', [False] * columns['_rows']),
+            columns.get('Questions Answered', [0] * columns['_rows'])
+        )
+    ]
+
+
+def iter_payloads(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  rejected: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    for columns in iter_csv_chunks(path, chunk_size, rejected):
+        yield from chunk_to_payloads(columns)
+
+
+def main():
+    """
+    Usage:
+      csv_ingest.py <report.csv> --zip <output.zip|->
+      csv_ingest.py <report.csv> --output-dir <dir>
+    Optional: --workers N --chunk-size N
+    """
+    summary_stream = sys.stdout
+    try:
+        args = sys.argv[1:]
+        workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+        chunk_size = int(args[args.index('--chunk-size') + 1]) if '--chunk-size' in args else DEFAULT_CHUNK_SIZE
+
+        if not args or not ('--zip' in args or '--output-dir' in args):
+            raise ValueError('Usage: csv_ingest.py <report.csv> (--zip <output.zip|-> | --output-dir <dir>) '
+                             '[--workers N] [--chunk-size N]')
+
+        # Rows are parsed lazily, so rendering starts before the whole export has been read
+        rejected = []
+        payloads = iter_payloads(args[0], chunk_size, rejected)
+
+        if '--zip' in args:
+            target = args[args.index('--zip') + 1]
+            if target == '-':
+                summary_stream = sys.stderr
+                result = export_zip(payloads, sys.stdout.buffer, workers)
+                sys.stdout.buffer.flush()
+            else:
+                result = export_zip(payloads, target, workers)
+                result["filePath"] = os.path.abspath(target)
+        else:
+            target = args[args.index('--output-dir') + 1]
+            result = render_to_directory(payloads, target, workers)
+            result["outputDir"] = os.path.abspath(target)
+
+        result["rejectedRows"] = len(rejected)
+        result["rejected"] = rejected[:10]
+        print(json.dumps(result), file=summary_stream)
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response), file=summary_stream)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Assessment history store for StrengthsFinder 360
+Keeps every processed assessment in a local SQLite database indexed by (email, created_at), so
+a report can compare the current attempt with the candidate's previous one.
+"""
+
+import sys
+import json
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Any, Optional
+
+# History is only recorded when a database path is configured
+DEFAULT_HISTORY_DB = os.environ.get('REPORT_HISTORY_DB')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    response_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    primary_talent_domain TEXT,
+    executing REAL,
+    influencing REAL,
+    relationship_building REAL,
+    strategic_thinking REAL,
+    theme_scores TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_email_created ON assessments (email, created_at);
+"""
+
+_COLUMNS = ('response_id', 'email', 'name', 'created_at', 'primary_talent_domain', 'executing',
+            'influencing', 'relationship_building', 'strategic_thinking', 'theme_scores')
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _row_to_assessment(row: tuple) -> Dict[str, Any]:
+    """Shape a stored row like the parts of `process_psychometric_data` output reports use"""
+    values = dict(zip(_COLUMNS, row))
+    return {
+        'candidate': {
+            'id': values['response_id'],
+            'name': values['name'],
+            'email': values['email'],
+            'created_at': values['created_at']
+        },
+        'domainScores': {
+            'executing': values['executing'],
+            'influencing': values['influencing'],
+            'relationship_building': values['relationship_building'],
+            'strategic_thinking': values['strategic_thinking'],
+            'primary_talent_domain': values['primary_talent_domain']
+        },
+        'strength_scores': json.loads(values['theme_scores'])
+    }
+
+
+def record_assessment(processed_data: Dict[str, Any], db_path: str) -> None:
+    candidate = processed_data['candidate']
+    domain_scores = processed_data['domainScores']
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO assessments ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+            (
+                str(candidate['id']),
+                str(candidate['email']).strip().lower(),
+                candidate['name'],
+                candidate['created_at'],
+                domain_scores['primary_talent_domain'],
+                domain_scores['executing'],
+                domain_scores['influencing'],
+                domain_scores['relationship_building'],
+                domain_scores['strategic_thinking'],
+                json.dumps(processed_data['strength_scores'], separators=(',', ':'))
+            )
+        )
+
+
+def previous_assessment(candidate: Dict[str, Any], db_path: str) -> Optional[Dict[str, Any]]:
+    """Latest stored attempt by the same email taken before this one (index range scan)"""
+    with closing(_connect(db_path)) as conn:
+        row = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM assessments "
+            "WHERE email = ? AND created_at < ? AND response_id != ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (str(candidate['email']).strip().lower(), candidate['created_at'], str(candidate['id']))
+        ).fetchone()
+    return _row_to_assessment(row) if row else None
+
+
+def assessment_history(email: str, db_path: str) -> List[Dict[str, Any]]:
+    with closing(_connect(db_path)) as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM assessments WHERE email = ? ORDER BY created_at",
+            (email.strip().lower(),)
+        ).fetchall()
+    return [_row_to_assessment(row) for row in rows]
+
+
+def sync_history(processed_data: Dict[str, Any], db_path: Optional[str] = DEFAULT_HISTORY_DB) -> Optional[Dict[str, Any]]:
+    """
+    Record this assessment and return the previous attempt, or None when history is disabled
+    or this is the candidate's first attempt
+    """
+    if not db_path:
+        return None
+    previous = previous_assessment(processed_data['candidate'], db_path)
+    record_assessment(processed_data, db_path)
+    return previous
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"success": False, "error": "Usage: history_store.py <email> [history.db]"}))
+        sys.exit(1)
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_HISTORY_DB
+    if not db_path:
+        print(json.dumps({"success": False, "error": "No history database configured (REPORT_HISTORY_DB)"}))
+        sys.exit(1)
+    print(json.dumps({"success": True, "history": assessment_history(sys.argv[1], db_path)}))
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Load-test harness for the StrengthsFinder 360 render path
+Synthesizes webhook payloads in the PDF_GENERATION.py sample format and drives the CLI
+generator, the batch worker path or a local HTTP service at a target arrival rate (open loop)
+or concurrency (closed loop). Reports latency percentiles, error rate, host CPU and the RSS of
+the harness process tree over time; sweeping several levels gives a saturation curve.
+The `tiers` mode instead renders in-process and compares latency and size per report tier.
+Stores the render path writes to when configured (score store, cohort matrix, theme index,
+history, report storage) are pointed at throwaway copies for the run, so synthetic payloads
+never reach the real ones.
+"""
+
+import sys
+import csv
+import io
+import json
+import os
+import multiprocessing
+import random
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+from python_pdf_generator import (
+    DOMAIN_MAP, THEME_ORDER, REPORT_TIERS, process_psychometric_data, generate_comprehensive_pdf
+)
+from batch_render import render_payload
+from render_scheduler import PRIORITY_INTERACTIVE
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_SCRIPT = os.path.join(BACKEND_DIR, 'python_pdf_generator.py')
+QUESTION_COUNT = 77
+SAMPLE_INTERVAL_SECONDS = 0.5
+
+# Environment variables naming stores the render path writes to, and their throwaway names
+ISOLATED_STORES = {
+    'SCORE_STORE_DIR': 'scores',
+    'COHORT_MATRIX_PATH': 'cohort.npz',
+    'THEME_INDEX_PATH': 'themes.npz',
+    'REPORT_HISTORY_DB': 'history.db',
+    'REPORT_STORAGE_DIR': 'reports',
+    'REPORT_STORE_DIR': 'models',
+}
+
+_DOMAIN_FIELDS = [
+    ('Executing', 'executing', 'executing_score'),
+    ('Influencing', 'influencing', 'influencing_score'),
+    ('Relationship Building', 'relationshipBuilding', 'relationship_building_score'),
+    ('Strategic Thinking', 'strategicThinking', 'strategic_thinking_score'),
+]
+
+
+def synthesize_payload(n: int, rng: random.Random) -> Dict[str, Any]:
+    """One webhook payload shaped like the PDF_GENERATION.py sample, with random answers"""
+    # Each forced-choice answer credits one theme; a per-candidate bias gives realistic top 5s
+    weights = [rng.random() ** 3 for _ in THEME_ORDER]
+    subdomains = dict.fromkeys(THEME_ORDER, 0)
+    for theme in rng.choices(THEME_ORDER, weights=weights, k=QUESTION_COUNT):
+        subdomains[theme] += 1
+
+    domains = {label: sum(score for theme, score in subdomains.items() if DOMAIN_MAP[theme] == label)
+               for label, _, _ in _DOMAIN_FIELDS}
+    data = {
+        'id': n,
+        'student_name': f'Load Test {n}',
+        'student_email': f'loadtest{n}@example.com',
+        'user_phone': f'9{n:09d}'[-10:],
+        'test_title': 'Strength 360 Assessment',
+        'primary_talent_domain': max(domains, key=domains.get),
+        'detailed_scores': {key: domains[label] for label, key, _ in _DOMAIN_FIELDS},
+        'responses': {str(q): {'selectedStatement': rng.choice('AB')} for q in range(1, QUESTION_COUNT + 1)},
+        'questions_answered': QUESTION_COUNT,
+        'is_auto_submit': False,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+    }
+    data.update({field: domains[label] for label, _, field in _DOMAIN_FIELDS})
+    data['detailed_scores']['subdomains'] = subdomains
+    return {'body': {'type': 'psychometric_test_result', 'source': 'strength360-server', 'data': data}}
+
+
+class ResourceSampler:
+    """Samples host CPU busy % (/proc/stat) and RSS of this process and its descendants"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+
+    @staticmethod
+    def _cpu_times():
+        with open('/proc/stat', 'r') as f:
+            fields = [int(value) for value in f.readline().split()[1:]]
+        idle = fields[3] + fields[4]
+        return sum(fields) - idle, sum(fields)
+
+    def _tree_rss(self) -> int:
+        parents, rss = {}, {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', 'r') as f:
+                    # Fields after the parenthesised command name; ppid is the 2nd, rss the 22nd
+                    fields = f.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            parents[int(entry)] = int(fields[1])
+            rss[int(entry)] = int(fields[21]) * self._page_size
+
+        root = os.getpid()
+        total = 0
+        for pid in rss:
+            ancestor = pid
+            while ancestor and ancestor != root:
+                ancestor = parents.get(ancestor, 0)
+            if ancestor == root:
+                total += rss[pid]
+        return total
+
+    def _run(self) -> None:
+        start = time.monotonic()
+        busy, total = self._cpu_times()
+        while not self._stop.wait(self.interval):
+            now_busy, now_total = self._cpu_times()
+            cpu = 100.0 * (now_busy - busy) / (now_total - total) if now_total > total else 0.0
+            busy, total = now_busy, now_total
+            self.samples.append({
+                't': round(time.monotonic() - start, 2),
+                'cpu_percent': round(cpu, 1),
+                'rss_mb': round(self._tree_rss() / 1e6, 1)
+            })
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def isolate_stores(work_dir: str) -> Dict[str, Optional[str]]:
+    """
+    Point every configured store at a copy under `work_dir`, keeping the same stores enabled so
+    the measured path matches the caller's. Report models (REPORT_STORE_DIR) are always moved
+    since report storage writes them to a default directory. Returns the previous values.
+    """
+    stores_dir = os.path.join(work_dir, 'stores')
+    os.makedirs(stores_dir, exist_ok=True)
+    previous = {}
+    for name, store in ISOLATED_STORES.items():
+        if os.environ.get(name) or name == 'REPORT_STORE_DIR':
+            previous[name] = os.environ.get(name)
+            os.environ[name] = os.path.join(stores_dir, store)
+    return previous
+
+
+def restore_stores(previous: Dict[str, Optional[str]]) -> None:
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_target(mode: str, work_dir: str, url: Optional[str] = None,
+                workers: Optional[int] = None) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Build the function one request goes through:
+      cli   - a python_pdf_generator.py process per payload (the webhook server path)
+      batch - batch_render.render_payload in a process pool (the batch worker path)
+      http  - POST the payload as JSON to `url`
+    """
+    if mode == 'cli':
+        def run_cli(payload):
+            key = payload['body']['data']['id']
+            payload_path = os.path.join(work_dir, f'payload-{key}.json')
+            with open(payload_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            completed = subprocess.run(
+                [sys.executable, GENERATOR_SCRIPT, payload_path, os.path.join(work_dir, f'report-{key}.pdf')],
+                capture_output=True, text=True
+            )
+            result = json.loads(completed.stdout or '{}')
+            if not result.get('success'):
+                raise RuntimeError(result.get('error') or completed.stderr.strip())
+        return run_cli
+
+    if mode == 'batch':
+        # Spawned workers import the render modules afresh, so store paths read at import time
+        # (REPORT_HISTORY_DB) come from the isolated environment
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+        def run_batch(payload):
+            result = pool.submit(render_payload, payload, PRIORITY_INTERACTIVE).result()
+            if not result['success']:
+                raise RuntimeError(result['error'])
+        run_batch.pool = pool
+        return run_batch
+
+    if mode == 'http':
+        if not url:
+            raise ValueError('http mode needs --url')
+
+        def run_http(payload):
+            request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+        return run_http
+
+    raise ValueError(f'Unknown mode: {mode}')
+
+
+def run_level(target: Callable[[Dict[str, Any]], Any], duration: float, rate: Optional[float] = None,
+              concurrency: Optional[int] = None, seed: int = 0, first_id: int = 0) -> Dict[str, Any]:
+    """
+    Drive `target` for `duration` seconds, either at `rate` arrivals per second (open loop;
+    latency is measured from the scheduled arrival, so queueing delay is included) or with
+    `concurrency` requests always outstanding (closed loop).
+    """
+    rng = random.Random(seed)
+    arrivals = random.Random(seed + 1)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(first_id, first_id + 10_000_000))
+
+    def one(scheduled: float) -> None:
+        with lock:
+            payload = synthesize_payload(next(counter), rng)
+        try:
+            target(payload)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        with lock:
+            latencies.append(time.monotonic() - scheduled)
+
+    with ResourceSampler() as sampler:
+        start = time.monotonic()
+        deadline = start + duration
+        if rate:
+            # Enough threads that a slow target shows up as latency rather than a lower offered rate
+            with ThreadPoolExecutor(max_workers=max(4, int(rate * 60))) as executor:
+                arrival = start
+                while arrival < deadline:
+                    delay = arrival - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    executor.submit(one, arrival)
+                    arrival += arrivals.expovariate(rate)
+        else:
+            def loop():
+                while time.monotonic() < deadline:
+                    one(time.monotonic())
+            threads = [threading.Thread(target=loop) for _ in range(concurrency or 1)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.monotonic() - start
+
+    ordered = sorted(latencies)
+    attempted = len(latencies) + len(errors)
+    samples = sampler.samples
+    return {
+        'offered_rate': rate,
+        'concurrency': concurrency,
+        'requests': attempted,
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'error_rate': round(len(errors) / attempted, 4) if attempted else 0.0,
+        'p50_ms': round(_percentile(ordered, 0.50) * 1000, 1),
+        'p95_ms': round(_percentile(ordered, 0.95) * 1000, 1),
+        'p99_ms': round(_percentile(ordered, 0.99) * 1000, 1),
+        'max_ms': round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        'cpu_percent_mean': round(sum(s['cpu_percent'] for s in samples) / len(samples), 1) if samples else 0.0,
+        'rss_mb_max': max((s['rss_mb'] for s in samples), default=0.0),
+        'errors': sorted(set(errors))[:5],
+        'timeline': samples
+    }
+
+
+def saturation_curve(target: Callable[[Dict[str, Any]], Any], levels: List[float], duration: float,
+                     by_rate: bool) -> List[Dict[str, Any]]:
+    results = []
+    first_id = 0
+    for level in levels:
+        if by_rate:
+            result = run_level(target, duration, rate=level, first_id=first_id)
+        else:
+            result = run_level(target, duration, concurrency=int(level), first_id=first_id)
+        first_id += result['requests']
+        results.append(result)
+        print(f"{'rate' if by_rate else 'concurrency'}={level:g}: {result['throughput_per_s']}/s, "
+              f"p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, p99 {result['p99_ms']}ms, "
+              f"errors {result['error_rate']:.1%}, cpu {result['cpu_percent_mean']}%, "
+              f"rss {result['rss_mb_max']}MB", file=sys.stderr, flush=True)
+    return results
+
+
+def benchmark_tiers(runs: int = 30, seed: int = 0) -> Dict[str, Any]:
+    """Render the same synthetic payloads at every report tier; latency covers story build and layout"""
+    rng = random.Random(seed)
+    processed = [process_psychometric_data(synthesize_payload(n, rng)) for n in range(runs)]
+    results = {}
+    for tier, sections in REPORT_TIERS.items():
+        generate_comprehensive_pdf(processed[0], io.BytesIO(), sections=sections)
+        timings, sizes, pages = [], [], []
+        for processed_data in processed:
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            generate_comprehensive_pdf(processed_data, buffer, sections=sections)
+            timings.append(time.perf_counter() - start)
+            sizes.append(buffer.tell())
+            pages.append(len(re.findall(rb'/Type /Page\b(?!s)', buffer.getvalue())))
+        timings.sort()
+        results[tier] = {
+            'sections': list(sections),
+            'mean_ms': round(sum(timings) / len(timings) * 1000, 2),
+            'p95_ms': round(_percentile(timings, 0.95) * 1000, 2),
+            'mean_bytes': round(sum(sizes) / len(sizes)),
+            'mean_pages': round(sum(pages) / len(pages), 1)
+        }
+    return {'runs': runs, 'tiers': results}
+
+
+def main():
+    """
+    Usage:
+      load_test.py (cli|batch|http) (--rate R[,R...] | --concurrency C[,C...])
+                   [--duration S] [--url URL] [--workers N] [--csv curve.csv]
+      load_test.py tiers [--runs N]
+    A comma-separated list of levels runs one level after another and reports the saturation curve.
+    """
+    work_dir = None
+    target = None
+    previous_stores = {}
+    try:
+        args = sys.argv[1:]
+
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args else default
+
+        if args and args[0] == 'tiers':
+            print(json.dumps({"success": True, "mode": "tiers", **benchmark_tiers(int(option('--runs', 30)))}))
+            return 0
+
+        if not args or args[0] not in ('cli', 'batch', 'http') or not ('--rate' in args or '--concurrency' in args):
+            raise ValueError('Usage: load_test.py (cli|batch|http) (--rate R[,R...] | --concurrency C[,C...]) '
+                             '[--duration S] [--url URL] [--workers N] [--csv curve.csv] | tiers [--runs N]')
+
+        by_rate = '--rate' in args
+        levels = [float(level) for level in option('--rate' if by_rate else '--concurrency').split(',')]
+        duration = float(option('--duration', 30))
+        workers = int(option('--workers')) if '--workers' in args else None
+
+        work_dir = tempfile.mkdtemp(prefix='strength360-load-')
+        previous_stores = isolate_stores(work_dir)
+        target = make_target(args[0], work_dir, option('--url'), workers)
+        curve = saturation_curve(target, levels, duration, by_rate)
+
+        csv_path = option('--csv')
+        if csv_path:
+            fields = ['offered_rate', 'concurrency', 'requests', 'throughput_per_s', 'error_rate',
+                      'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'cpu_percent_mean', 'rss_mb_max']
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(curve)
+
+        print(json.dumps({"success": True, "mode": args[0], "curve": curve}))
+        return 0
+
+    except Exception as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        return 1
+
+    finally:
+        if target is not None and hasattr(target, 'pool'):
+            target.pool.shutdown()
+        restore_stores(previous_stores)
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Per-assessment analytics hooks for StrengthsFinder 360
+Called wherever a payload is processed (interactive renders, batch renders, stored models) to
+keep the optional cohort stores current. Each store is only imported when it is configured, so
+renders that use none of them never load numpy or the analytics modules.
+"""
+
+import os
+from typing import Dict, Any
+
+
+def record_processed(processed_data: Dict[str, Any]) -> None:
+    """
+    Append to the score store (SCORE_STORE_DIR), count in the cohort matrix (COHORT_MATRIX_PATH)
+    and add to the theme index (THEME_INDEX_PATH)
+    """
+    if os.environ.get('SCORE_STORE_DIR'):
+        from score_store import record_scores
+        record_scores(processed_data, os.environ['SCORE_STORE_DIR'])
+    if os.environ.get('COHORT_MATRIX_PATH'):
+        from cohort_analytics import record_cooccurrence
+        record_cooccurrence(processed_data, os.environ['COHORT_MATRIX_PATH'])
+    if os.environ.get('THEME_INDEX_PATH'):
+        from theme_index import record_theme_index
+        record_theme_index(processed_data, os.environ['THEME_INDEX_PATH'])
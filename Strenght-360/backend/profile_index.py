@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Strength profile similarity search for StrengthsFinder 360
+Stores each candidate's theme scores as a 34-float vector in THEME_ORDER and answers top-k
+cosine or Euclidean queries against a student or an ideal role profile with blocked NumPy
+brute force over a local .npz file. Saving also writes the query-ready matrices (raw rows, unit
+rows and squared norms) as .npy files next to the index, which later loads memory-map instead
+of recomputing.
+"""
+
+import sys
+import glob
+import json
+import os
+import fcntl
+import math
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from python_pdf_generator import THEME_ORDER, process_psychometric_data
+from assessment_model import THEME_INDEX
+from team_report import load_cohort
+
+DEFAULT_INDEX_PATH = os.environ.get('PROFILE_INDEX_PATH', 'profile_index.npz')
+
+METRICS = ('cosine', 'euclidean')
+
+# Rows scored per matrix-vector product; keeps temporaries small (~128 KB of scores per block)
+BLOCK_ROWS = 32768
+
+PREPARED_ARRAYS = ('vectors', 'unit', 'sqnorms')
+
+
+def profile_vector(strength_scores: Dict[str, float]) -> np.ndarray:
+    """Theme scores in THEME_ORDER; unscored and unknown themes count as 0"""
+    vector = np.zeros(len(THEME_ORDER), dtype=np.float32)
+    for name, score in strength_scores.items():
+        index = THEME_INDEX.get(name)
+        if index is not None and score is not None and not math.isnan(score):
+            vector[index] = score
+    return vector
+
+
+class ProfileIndex:
+    """Candidate ids with one float32 profile row each; normalized rows and norms are cached"""
+
+    def __init__(self, ids: Optional[List[str]] = None, vectors: Optional[np.ndarray] = None):
+        self.ids = list(ids or [])
+        self._vectors = vectors if vectors is not None else np.zeros((0, len(THEME_ORDER)), dtype=np.float32)
+        # id -> row, built on first add; one-off lookups scan the id list instead
+        self._row_map = None
+        self._pending = []
+        self._unit = None
+        self._sq_norms = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _row(self, candidate_id: str) -> Optional[int]:
+        if self._row_map is not None:
+            return self._row_map.get(candidate_id)
+        try:
+            return self.ids.index(candidate_id)
+        except ValueError:
+            return None
+
+    def add(self, processed_data: Dict[str, Any]) -> None:
+        """Add or replace a candidate's profile"""
+        candidate_id = str(processed_data['candidate']['id'])
+        vector = profile_vector(processed_data['strength_scores'])
+        if self._row_map is None:
+            self._row_map = {candidate_id: row for row, candidate_id in enumerate(self.ids)}
+        row = self._row_map.get(candidate_id)
+        if row is None:
+            self._row_map[candidate_id] = len(self.ids)
+            self.ids.append(candidate_id)
+            self._pending.append(vector)
+        else:
+            if not self.vectors.flags.writeable:
+                # Rows loaded from a memory-mapped file are read-only
+                self._vectors = np.array(self._vectors)
+            self.vectors[row] = vector
+        self._unit = None
+        self._sq_norms = None
+
+    def add_many(self, processed_list: Iterable[Dict[str, Any]]) -> None:
+        for processed_data in processed_list:
+            self.add(processed_data)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self._pending:
+            self._vectors = np.vstack([self._vectors, np.stack(self._pending)])
+            self._pending = []
+        return self._vectors
+
+    def _prepare(self, metric: str) -> np.ndarray:
+        vectors = self.vectors
+        if metric == 'cosine':
+            if self._unit is None:
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                self._unit = vectors / np.where(norms > 0, norms, 1)
+            return self._unit
+        if self._sq_norms is None:
+            self._sq_norms = np.einsum('ij,ij->i', vectors, vectors)
+        return vectors
+
+    def query(self, vector: np.ndarray, k: int = 10, metric: str = 'cosine',
+              exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k most similar candidates as (id, score): cosine similarity (higher is closer) or
+        Euclidean distance (lower is closer)
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        matrix = self._prepare(metric)
+        query = np.asarray(vector, dtype=np.float32)
+        if metric == 'cosine':
+            norm = np.linalg.norm(query)
+            query = query / norm if norm > 0 else query
+
+        excluded = self._row(exclude) if exclude is not None else None
+        wanted = k + (excluded is not None)
+        candidates = []
+        for start in range(0, len(matrix), BLOCK_ROWS):
+            dots = matrix[start:start + BLOCK_ROWS] @ query
+            if metric == 'cosine':
+                # Negate so smaller is always better
+                keys = -dots
+            else:
+                keys = self._sq_norms[start:start + BLOCK_ROWS] - 2 * dots
+            if len(keys) > wanted:
+                best = np.argpartition(keys, wanted - 1)[:wanted]
+            else:
+                best = np.arange(len(keys))
+            candidates.extend(zip(keys[best].tolist(), (best + start).tolist()))
+
+        candidates.sort()
+        results = []
+        query_sq_norm = float(query @ query)
+        for key, row in candidates:
+            if row == excluded:
+                continue
+            score = -key if metric == 'cosine' else math.sqrt(max(key + query_sq_norm, 0.0))
+            results.append((self.ids[row], score))
+            if len(results) == k:
+                break
+        return results
+
+    def query_candidate(self, candidate_id: Any, k: int = 10, metric: str = 'cosine') -> List[Tuple[str, float]]:
+        row = self._row(str(candidate_id))
+        if row is None:
+            raise ValueError(f"Candidate {candidate_id} is not in the profile index")
+        return self.query(self.vectors[row], k, metric, exclude=str(candidate_id))
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> str:
+        """
+        Write the index and its prepared matrices. The matrices carry a fresh stamp recorded in the
+        index, so a reader never pairs an index with matrices from another save.
+        """
+        stamp = os.urandom(8).hex()
+        unit = self._prepare('cosine')
+        self._prepare('euclidean')
+        prepared = {'vectors': self.vectors, 'unit': unit, 'sqnorms': self._sq_norms}
+        for name, array in prepared.items():
+            target = _prepared_path(path, stamp, name)
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+            os.replace(tmp_path, target)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, vectors=self.vectors, ids=np.array(self.ids, dtype=str),
+                 themes=np.array(THEME_ORDER), prepared=np.array(stamp))
+        os.replace(tmp_path, path)
+
+        # Matrices from earlier saves are no longer referenced
+        for name in PREPARED_ARRAYS:
+            for stale in glob.glob(_prepared_path(path, '*', name)):
+                if stale != _prepared_path(path, stamp, name):
+                    try:
+                        os.unlink(stale)
+                    except FileNotFoundError:
+                        pass
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'ProfileIndex':
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as stored:
+            if list(stored['themes']) != THEME_ORDER:
+                raise ValueError('Profile index was built with a different theme order')
+            ids = stored['ids'].tolist()
+            stamp = str(stored['prepared']) if 'prepared' in stored.files else None
+            if stamp:
+                try:
+                    prepared = {name: np.load(_prepared_path(path, stamp, name), mmap_mode='r')
+                                for name in PREPARED_ARRAYS}
+                except FileNotFoundError:
+                    prepared = None
+                if prepared and all(len(array) == len(ids) for array in prepared.values()):
+                    index = cls(ids, prepared['vectors'])
+                    index._unit = prepared['unit']
+                    index._sq_norms = prepared['sqnorms']
+                    return index
+            # Indexes saved before the matrices were persisted, or whose matrices are missing
+            return cls(ids, stored['vectors'])
+
+
+def _prepared_path(path: str, stamp: str, name: str) -> str:
+    return f"{os.path.splitext(path)[0]}.{stamp}.{name}.npy"
+
+
+def update_index(processed_list: Iterable[Dict[str, Any]], path: str = DEFAULT_INDEX_PATH) -> ProfileIndex:
+    """Add or replace profiles in the persisted index. Serialised across processes by `<index>.lock`."""
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        index = ProfileIndex.load(path)
+        index.add_many(processed_list)
+        index.save(path)
+    return index
+
+
+def benchmark(count: int = 200000, queries: int = 100, k: int = 10) -> Dict[str, Any]:
+    """Query latency over `count` synthetic profiles loaded back from a local file"""
+    rng = np.random.default_rng(0)
+    vectors = rng.integers(0, 11, size=(count, len(THEME_ORDER))).astype(np.float32)
+    path = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'profile_index_bench_{os.getpid()}.npz')
+    ProfileIndex([str(i) for i in range(count)], vectors).save(path)
+
+    try:
+        start = time.perf_counter()
+        index = ProfileIndex.load(path)
+        load_s = time.perf_counter() - start
+    finally:
+        for stale in [path] + glob.glob(_prepared_path(path, '*', '*')):
+            os.unlink(stale)
+
+    result = {'profiles': count, 'k': k, 'load_ms': round(load_s * 1000, 1)}
+    for metric in METRICS:
+        start = time.perf_counter()
+        index._prepare(metric)
+        prepare_s = time.perf_counter() - start
+
+        timings = []
+        for i in range(queries):
+            start = time.perf_counter()
+            index.query_candidate(i, k, metric)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        result[metric] = {
+            'prepare_ms': round(prepare_s * 1000, 1),
+            'mean_ms': round(sum(timings) / len(timings) * 1000, 2),
+            'p95_ms': round(timings[int(0.95 * len(timings))] * 1000, 2)
+        }
+    return result
+
+
+def main():
+    """
+    Usage:
+      profile_index.py add <payloads.json> [index.npz]
+      profile_index.py similar <candidate_id> [--k N] [--metric cosine|euclidean] [index.npz]
+      profile_index.py ideal <profile.json> [--k N] [--metric cosine|euclidean] [index.npz]
+      profile_index.py benchmark [count]
+    An ideal profile is a JSON object of theme name -> score; themes left out count as 0.
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or args[0] not in ('add', 'similar', 'ideal', 'benchmark'):
+            raise ValueError('Usage: profile_index.py add <payloads.json> | similar <candidate_id> | '
+                             'ideal <profile.json> [--k N] [--metric cosine|euclidean] [index.npz] | benchmark [count]')
+
+        command = args.pop(0)
+        k = int(args[args.index('--k') + 1]) if '--k' in args else 10
+        metric = args[args.index('--metric') + 1] if '--metric' in args else 'cosine'
+        for flag in ('--k', '--metric'):
+            if flag in args:
+                del args[args.index(flag):args.index(flag) + 2]
+
+        if command == 'benchmark':
+            print(json.dumps({"success": True, **benchmark(int(args[0]) if args else 200000)}))
+            return 0
+
+        if not args:
+            raise ValueError(f'Missing argument for {command}')
+        index_path = args[1] if len(args) > 1 else DEFAULT_INDEX_PATH
+
+        if command == 'add':
+            processed_list = []
+            skipped = 0
+            for payload in load_cohort(args[0]):
+                try:
+                    processed_list.append(process_psychometric_data(payload))
+                except ValueError:
+                    skipped += 1
+            index = update_index(processed_list, index_path)
+            response = {"success": True, "added": len(processed_list), "skipped": skipped,
+                        "profiles": len(index)}
+        else:
+            index = ProfileIndex.load(index_path)
+            if command == 'similar':
+                matches = index.query_candidate(args[0], k, metric)
+            else:
+                with open(args[0], 'r', encoding='utf-8') as f:
+                    matches = index.query(profile_vector(json.load(f)), k, metric)
+            response = {
+                "success": True,
+                "metric": metric,
+                "matches": [{"candidateId": candidate_id, "score": round(score, 4)} for candidate_id, score in matches]
+            }
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
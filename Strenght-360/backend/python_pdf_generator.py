@@ -7,16 +7,84 @@ This service receives JSON data and generates comprehensive PDF reports using th
 import sys
 import json
 import os
+import time
+import hashlib
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from render_scheduler import get_scheduler, PRIORITY_INTERACTIVE
+from render_coalescer import render_once, payload_hash
+from history_store import sync_history
+from processing_hooks import record_processed
+from report_storage import ReportStorage
+from render_metrics import get_registry
+from report_navigation import ReportDocTemplate, OutlineHeading, TableOfContents
+
+# Theme → Domain mapping (CliftonStrengths style)
+DOMAIN_MAP = {
+    # Executing Domain
+    'Achiever': "Executing",
+    'Arranger': "Executing", 
+    'Belief': "Executing",
+    'Consistency': "Executing",
+    'Deliberative': "Executing",
+    'Discipline': "Executing",
+    'Focus': "Executing",
+    'Responsibility': "Executing",
+    'Restorative': "Executing",
+
+    # Influencing Domain
+    'Activator': "Influencing",
+    'Command': "Influencing",
+    'Communication': "Influencing",
+    'Competition': "Influencing",
+    'Maximizer': "Influencing",
+    'SelfAssurance': "Influencing",
+    'Significance': "Influencing",
+    'Woo': "Influencing",
+
+    # Relationship Building Domain
+    'Adaptability': "Relationship Building",
+    'Connectedness': "Relationship Building",
+    'Developer': "Relationship Building",
+    'Empathy': "Relationship Building",
+    'Harmony': "Relationship Building",
+    'Includer': "Relationship Building",
+    'Individualization': "Relationship Building",
+    'Positivity': "Relationship Building",
+    'Relator': "Relationship Building",
+
+    # Strategic Thinking Domain
+    'Analytical': "Strategic Thinking",
+    'Context': "Strategic Thinking",
+    'Futuristic': "Strategic Thinking",
+    'Ideation': "Strategic Thinking",
+    'Input': "Strategic Thinking",
+    'Intellection': "Strategic Thinking",
+    'Learner': "Strategic Thinking",
+    'Strategic': "Strategic Thinking",
+}
+
+# Fixed theme order used for compact score vectors
+THEME_ORDER = list(DOMAIN_MAP)
+
+# Report sections in rendering order; a tier is the subset of sections it builds
+REPORT_SECTIONS = ('cover', 'contents', 'executive_summary', 'strengths', 'combinations', 'development', 'progress')
+REPORT_TIERS = {
+    'summary': ('cover', 'executive_summary'),
+    'standard': ('cover', 'contents', 'executive_summary', 'strengths', 'development', 'progress'),
+    'comprehensive': REPORT_SECTIONS,
+}
+# The default tier matches the report as rendered before tiers existed
+DEFAULT_REPORT_TIER = os.environ.get('REPORT_TIER', 'standard')
+
 def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process psychometric test data from webhook and prepare for AI report generation
@@ -46,22 +114,34 @@ def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     if not data.get('student_name') or not data.get('student_email'):
         raise ValueError('Missing student information (name or email) in the data')
     
-    # 2) Candidate information
+    # 2) Candidate information. Payloads without a response id are named after a hash of their
+    # data, so they keep distinct report files, ZIP entries and history rows
+    response_id = data.get('id')
     candidate = {
-        'id': data.get('id', 'Unknown'),
+        'id': response_id if response_id not in (None, '') else f"anon-{payload_hash(data)[:16]}",
         'name': data['student_name'],
         'email': data['student_email'],
         'created_at': data.get('created_at', datetime.now().isoformat())
     }
     
     # 3) Domain scores with proper fallbacks
-    detailed_scores = data.get('detailed_scores', {})
+    detailed_scores = data.get('detailed_scores') or {}
+    primary_talent_domain = data.get('primary_talent_domain') or 'Not Specified'
+    
+    # Submissions stored without scores are scored from their raw forced-choice answers.
+    # scoring (and numpy) is only imported for those, so already-scored renders stay light.
+    if not detailed_scores.get('subdomains') and data.get('responses'):
+        from scoring import calculate_detailed_scores, get_primary_talent_domain, has_forced_choice_answers
+        if has_forced_choice_answers(data['responses']):
+            detailed_scores = calculate_detailed_scores(data['responses'])
+            primary_talent_domain = get_primary_talent_domain(detailed_scores)
+    
     domain_scores = {
-        'executing': float(detailed_scores.get('executing', data.get('executing_score', 0))),
-        'influencing': float(detailed_scores.get('influencing', data.get('influencing_score', 0))),
-        'relationship_building': float(detailed_scores.get('relationshipBuilding', data.get('relationship_building_score', 0))),
-        'strategic_thinking': float(detailed_scores.get('strategicThinking', data.get('strategic_thinking_score', 0))),
-        'primary_talent_domain': data.get('primary_talent_domain', 'Not Specified')
+        'executing': float(detailed_scores.get('executing', data.get('executing_score') or 0)),
+        'influencing': float(detailed_scores.get('influencing', data.get('influencing_score') or 0)),
+        'relationship_building': float(detailed_scores.get('relationshipBuilding', data.get('relationship_building_score') or 0)),
+        'strategic_thinking': float(detailed_scores.get('strategicThinking', data.get('strategic_thinking_score') or 0)),
+        'primary_talent_domain': primary_talent_domain
     }
     
     # 4) Process subdomain/strength scores
@@ -69,7 +149,7 @@ def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     
     # If no subdomains found, create a fallback structure
     if not subdomains:
-        print('Warning: No subdomain scores found. Using domain scores as fallback.')
+        print('Warning: No subdomain scores found. Using domain scores as fallback.', file=sys.stderr)
         # Create basic theme structure from domain scores
         subdomains = {
             'Analytical': domain_scores['strategic_thinking'] * 0.8,
@@ -80,51 +160,6 @@ def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
             'Harmony': domain_scores['relationship_building'] * 0.7
         }
     
-    # Theme → Domain mapping (CliftonStrengths style)
-    domain_map = {
-        # Executing Domain
-        'Achiever': "Executing",
-        'Arranger': "Executing", 
-        'Belief': "Executing",
-        'Consistency': "Executing",
-        'Deliberative': "Executing",
-        'Discipline': "Executing",
-        'Focus': "Executing",
-        'Responsibility': "Executing",
-        'Restorative': "Executing",
-
-        # Influencing Domain
-        'Activator': "Influencing",
-        'Command': "Influencing",
-        'Communication': "Influencing",
-        'Competition': "Influencing",
-        'Maximizer': "Influencing",
-        'SelfAssurance': "Influencing",
-        'Significance': "Influencing",
-        'Woo': "Influencing",
-
-        # Relationship Building Domain
-        'Adaptability': "Relationship Building",
-        'Connectedness': "Relationship Building",
-        'Developer': "Relationship Building",
-        'Empathy': "Relationship Building",
-        'Harmony': "Relationship Building",
-        'Includer': "Relationship Building",
-        'Individualization': "Relationship Building",
-        'Positivity': "Relationship Building",
-        'Relator': "Relationship Building",
-
-        # Strategic Thinking Domain
-        'Analytical': "Strategic Thinking",
-        'Context': "Strategic Thinking",
-        'Futuristic': "Strategic Thinking",
-        'Ideation': "Strategic Thinking",
-        'Input': "Strategic Thinking",
-        'Intellection': "Strategic Thinking",
-        'Learner': "Strategic Thinking",
-        'Strategic': "Strategic Thinking",
-    }
-    
     # Build strength scores from subdomains
     strength_scores = {}
     for name, raw_score in subdomains.items():
@@ -136,7 +171,7 @@ def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         all_themes.append({
             'name': name,
             'score': score,
-            'domain': domain_map.get(name, "Unknown")
+            'domain': DOMAIN_MAP.get(name, "Unknown")
         })
     
     # Sort by score DESC, then name ASC for consistent ordering
@@ -164,11 +199,22 @@ def process_psychometric_data(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         'top5': top5,
         'top5Pairs': top5_pairs,
         'responses': data.get('responses'),
+        'subdomainFallback': not detailed_scores.get('subdomains'),
         'raw': body  # Keep original for reference
     }
     
     return processed_data
 
+def count_processed(processed_data: Dict[str, Any]) -> None:
+    """
+    Count a payload taken in for ingest or rendering. Called by the entry points rather than
+    process_psychometric_data, so re-processing stored data for a lazy re-render is not counted.
+    """
+    registry = get_registry()
+    registry.inc('strength360_payloads_processed_total')
+    if processed_data.get('subdomainFallback'):
+        registry.inc('strength360_subdomain_fallback_total')
+
 def get_elaborate_theme_description(theme_name: str) -> Dict[str, Any]:
     """Get comprehensive description for each strength theme"""
     theme_data = {
@@ -261,101 +307,197 @@ def get_elaborate_theme_description(theme_name: str) -> Dict[str, Any]:
     
     return theme_data.get(theme_name, default_structure)
 
-def generate_comprehensive_pdf(processed_data: Dict[str, Any], output_filename: str) -> str:
+def get_detailed_combo_analysis(theme1: str, theme2: str) -> Dict[str, Any]:
+    """Generate comprehensive and detailed analysis for strength combinations"""
+    combo_data = {
+        ('Ideation', 'Analytical'): {
+            'name': 'Strategic Inspiration',
+            'positive_synergy': 'When Ideation and Analytical come together, a powerful engine of strategic inspiration is ignited. This combination allows you to generate numerous creative ideas while critically evaluating their feasibility and potential impact. Your thought processes are fueled by both creativity and logic, enabling you to develop innovative solutions with solid foundations.',
+            'risks': 'Overusing Ideation and Analytical could lead to spending excessive time exploring ideas without taking decisive action or becoming paralyzed by choosing between multiple viable options. In some cases, this combination might cause you to overthink situations, leading to indecision or analysis paralysis.',
+            'practical_applications': [
+                'Use in innovation teams where both creative thinking and practical evaluation are needed',
+                'Excellent for research and development roles that require both imagination and rigor',
+                'Valuable in strategic planning where multiple scenarios need to be generated and assessed',
+                'Effective in consulting roles that require both creative problem-solving and analytical depth'
+            ],
+            'balance_strategies': [
+                'Set clear deadlines for moving from ideation to decision-making',
+                'Use the good enough principle for less critical decisions',
+                'Practice rapid prototyping rather than perfect planning',
+                'Seek input from more action-oriented colleagues when needed'
+            ]
+        },
+        ('Ideation', 'Harmony'): {
+            'name': 'Inclusive Creativity',
+            'positive_synergy': 'By blending Ideation with Harmony, you have the unique ability to produce a wide array of creative ideas while maintaining genuine consideration for others perspectives and feelings. This combination encourages inclusiveness in brainstorming sessions, ensuring that everyone viewpoints are taken into account and valued.',
+            'risks': 'The potential risks with Ideation and Harmony include giving too much weight to others opinions or over-considering harmony at the expense of your most innovative ideas. In some cases, you may find yourself struggling to make decisions when faced with multiple, equally appealing options.',
+            'practical_applications': [
+                'Ideal for leadership roles in creative teams that require balancing innovation with team cohesion',
+                'Excellent for change management initiatives that need both new ideas and buy-in from stakeholders',
+                'Valuable in cross-functional projects that require integrating diverse perspectives',
+                'Effective in customer-facing innovation roles that require understanding diverse user needs'
+            ],
+            'balance_strategies': [
+                'Practice distinguishing between constructive feedback and resistance to change',
+                'Set clear criteria for when consensus is necessary versus when decisive leadership is needed',
+                'Develop confidence in presenting and defending your most innovative ideas',
+                'Create processes that allow for both divergent thinking and convergent decision-making'
+            ]
+        }
+    }
+    
+    # Check both orders of the combination
+    if (theme1, theme2) in combo_data:
+        return combo_data[(theme1, theme2)]
+    elif (theme2, theme1) in combo_data:
+        return combo_data[(theme2, theme1)]
+    else:
+        return {
+            'name': f'{theme1} + {theme2}',
+            'positive_synergy': f'The combination of {theme1} and {theme2} creates a unique synergy that enhances your overall effectiveness. {theme1} brings specific qualities that complement and amplify your {theme2} abilities, allowing you to approach situations with distinctive insight and comprehensive capability.',
+            'risks': f'Be mindful of potential overuse of either {theme1} or {theme2}, as this could lead to imbalance in your approach to challenges. There may be situations where one strength dominates at the expense of the other, limiting your effectiveness.',
+            'practical_applications': [
+                'This combination is valuable in roles requiring both specialized depth and broad perspective',
+                'Useful in situations that demand both creative and systematic thinking',
+                'Effective for leadership positions that require multiple complementary skills'
+            ],
+            'balance_strategies': [
+                'Regularly assess whether you are leveraging both strengths appropriately',
+                'Seek feedback from others about your approach balance',
+                'Practice consciously applying each strength in appropriate contexts'
+            ]
+        }
+
+def content_entry_version(content: Dict[str, Any]) -> str:
+    """Short hash of a content entry; it changes whenever any of the entry's text does"""
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def theme_entry_key(theme_name: str) -> str:
+    return f"theme:{theme_name}"
+
+def pair_entry_key(theme1: str, theme2: str) -> str:
+    # Ordered: the fallback text for unwritten pairs names the themes in rank order
+    return f"pair:{theme1}+{theme2}"
+
+def build_progression_section(processed_data: Dict[str, Any], previous_data: Dict[str, Any],
+                              heading1_style: ParagraphStyle, heading2_style: ParagraphStyle,
+                              normal_style: ParagraphStyle, toc: Optional[TableOfContents] = None) -> List[Any]:
     """
-    Generate a comprehensive PDF report using advanced ReportLab features
+    Build flowables comparing the current domain and theme scores with the previous attempt;
+    with `toc`, the section heading is added to the outline and table of contents
     """
-    
-    # Create the document
-    doc = SimpleDocTemplate(
-        output_filename,
-        pagesize=A4,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch
-    )
-    
-    # Get default styles and create custom ones
-    styles = getSampleStyleSheet()
-    
-    # Custom styles with professional appearance
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        spaceAfter=30,
-        alignment=1,  # Center alignment
-        textColor=colors.HexColor('#2E86AB'),
-        fontName='Helvetica-Bold'
-    )
-    
-    heading1_style = ParagraphStyle(
-        'CustomHeading1',
-        parent=styles['Heading1'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.HexColor('#2E86AB'),
-        fontName='Helvetica-Bold'
-    )
-    
-    heading2_style = ParagraphStyle(
-        'CustomHeading2',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceAfter=6,
-        textColor=colors.HexColor('#1B4F72'),
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6,
-        textColor=colors.black,
-        alignment=0  # Left alignment
-    )
-    
-    bullet_style = ParagraphStyle(
-        'CustomBullet',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=3,
-        leftIndent=20,
-        textColor=colors.black
-    )
-    
-    # Story to hold all elements
-    story = []
-    
-    # 1. Cover Page
-    story.append(Paragraph("COMPREHENSIVE STRENGTHS ASSESSMENT REPORT", title_style))
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph("Detailed Analysis of Your Natural Talents and Potential", styles['Heading2']))
-    story.append(Spacer(1, 0.5*inch))
+    section = []
+    current_scores = processed_data['domainScores']
+    previous_scores = previous_data['domainScores']
+    previous_date = str(previous_data['candidate']['created_at'])[:10]
+
+    title = "Progress Since Your Previous Assessment"
+    section.append(toc.heading(title, heading1_style, 'progress') if toc else Paragraph(title, heading1_style))
+    section.append(Paragraph(
+        f"This section compares your current results with your previous assessment taken on {previous_date}.",
+        normal_style
+    ))
+
+    section.append(Spacer(1, 0.1*inch))
+    section.append(Paragraph("Domain Score Changes", heading2_style))
+    domain_rows = [['Talent Domain', 'Previous', 'Current', 'Change']]
+    for key, label in [('strategic_thinking', 'Strategic Thinking'),
+                       ('relationship_building', 'Relationship Building'),
+                       ('influencing', 'Influencing'),
+                       ('executing', 'Executing')]:
+        previous = previous_scores[key] or 0.0
+        current = current_scores[key]
+        domain_rows.append([label, f"{previous:.1f}", f"{current:.1f}", f"{current - previous:+.1f}"])
+
+    previous_themes = previous_data['strength_scores']
+    previous_ranking = sorted(previous_themes, key=lambda name: (-previous_themes[name], name))
+    theme_rows = [['Current Top 5 Theme', 'Previous Rank', 'Previous', 'Current', 'Change']]
+    for theme in processed_data['top5']:
+        name = theme['name']
+        if name in previous_themes:
+            theme_rows.append([
+                name,
+                str(previous_ranking.index(name) + 1),
+                f"{previous_themes[name]:.1f}",
+                f"{theme['score']:.1f}",
+                f"{theme['score'] - previous_themes[name]:+.1f}"
+            ])
+        else:
+            theme_rows.append([name, '-', '-', f"{theme['score']:.1f}", 'New'])
+
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F8F9FA')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+    domain_table = Table(domain_rows, colWidths=[2.5*inch, 1*inch, 1*inch, 1*inch])
+    domain_table.setStyle(table_style)
+    section.append(domain_table)
+
+    section.append(Spacer(1, 0.2*inch))
+    section.append(Paragraph("Top 5 Theme Changes", heading2_style))
+    theme_table = Table(theme_rows, colWidths=[2*inch, 1.1*inch, 0.9*inch, 0.9*inch, 0.9*inch])
+    theme_table.setStyle(table_style)
+    section.append(theme_table)
+
+    current_top5 = {theme['name'] for theme in processed_data['top5']}
+    left_top5 = [name for name in previous_ranking[:5] if name not in current_top5]
+    if left_top5:
+        section.append(Spacer(1, 0.1*inch))
+        section.append(Paragraph(
+            f"<b>No longer in your top 5:</b> {', '.join(left_top5)}",
+            normal_style
+        ))
+
+    return section
+
+def build_cover_section(processed_data: Dict[str, Any], title_style: ParagraphStyle,
+                        subtitle_style: ParagraphStyle, normal_style: ParagraphStyle,
+                        toc: TableOfContents) -> List[Any]:
+    """
+    Build the cover page flowables
+    """
+    section = []
+    section.append(OutlineHeading("COMPREHENSIVE STRENGTHS ASSESSMENT REPORT", title_style,
+                                  toc.entry('cover', 'Cover', in_toc=False)))
+    section.append(Spacer(1, 0.3*inch))
+    section.append(Paragraph("Detailed Analysis of Your Natural Talents and Potential", subtitle_style))
+    section.append(Spacer(1, 0.5*inch))
     
     candidate = processed_data['candidate']
-    story.append(Paragraph(f"<b>Prepared for:</b> {candidate['name']}", normal_style))
-    story.append(Paragraph(f"<b>Email:</b> {candidate['email']}", normal_style))
-    story.append(Paragraph(f"<b>Assessment Date:</b> {candidate['created_at'][:10]}", normal_style))
-    story.append(Paragraph(f"<b>Primary Talent Domain:</b> {processed_data['domainScores']['primary_talent_domain']}", normal_style))
-    story.append(Paragraph(f"<b>Report ID:</b> {candidate['id']}", normal_style))
-    
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph(
+    section.append(Paragraph(f"<b>Prepared for:</b> {candidate['name']}", normal_style))
+    section.append(Paragraph(f"<b>Email:</b> {candidate['email']}", normal_style))
+    section.append(Paragraph(f"<b>Assessment Date:</b> {candidate['created_at'][:10]}", normal_style))
+    section.append(Paragraph(f"<b>Primary Talent Domain:</b> {processed_data['domainScores']['primary_talent_domain']}", normal_style))
+    section.append(Paragraph(f"<b>Report ID:</b> {candidate['id']}", normal_style))
+    
+    section.append(Spacer(1, 0.3*inch))
+    section.append(Paragraph(
         "This comprehensive report provides detailed insights into your unique strengths pattern, "
         "practical applications, and development strategies for personal and professional growth.",
         normal_style
     ))
     
-    story.append(PageBreak())
-    
-    # 2. Executive Summary
-    story.append(Paragraph("Executive Summary", heading1_style))
-    story.append(Spacer(1, 0.1*inch))
+    return section
+
+def build_executive_summary_section(processed_data: Dict[str, Any], heading1_style: ParagraphStyle,
+                                    heading2_style: ParagraphStyle, normal_style: ParagraphStyle,
+                                    toc: TableOfContents) -> List[Any]:
+    """
+    Build the executive summary with the domain scores table
+    """
+    section = []
+    candidate = processed_data['candidate']
+    section.append(toc.heading("Executive Summary", heading1_style, 'executive-summary'))
+    section.append(Spacer(1, 0.1*inch))
     
-    story.append(Paragraph(
+    section.append(Paragraph(
         f"This StrengthsFinder 360 assessment reveals that {candidate['name']} demonstrates a distinctive "
         f"talent pattern with primary strength in {processed_data['domainScores']['primary_talent_domain']}. "
         "Your unique combination of strengths suggests particular aptitudes for strategic thinking, "
@@ -364,8 +506,8 @@ def generate_comprehensive_pdf(processed_data: Dict[str, Any], output_filename:
     ))
     
     # Domain Scores Table
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph("Domain Scores Overview", heading2_style))
+    section.append(Spacer(1, 0.2*inch))
+    section.append(toc.heading("Domain Scores Overview", heading2_style, 'domain-scores', level=1))
     
     domain_data = [
         ['Talent Domain', 'Score', 'Level'],
@@ -388,14 +530,20 @@ def generate_comprehensive_pdf(processed_data: Dict[str, Any], output_filename:
         ('FONTSIZE', (0, 1), (-1, -1), 9),
     ]))
     
-    story.append(domain_table)
-    story.append(PageBreak())
-    
-    # 3. Top 5 Strengths Analysis
-    story.append(Paragraph("Your Top 5 Signature Strengths", heading1_style))
-    story.append(Spacer(1, 0.1*inch))
+    section.append(domain_table)
+    return section
+
+def build_strengths_section(processed_data: Dict[str, Any], heading1_style: ParagraphStyle,
+                            heading2_style: ParagraphStyle, normal_style: ParagraphStyle,
+                            bullet_style: ParagraphStyle, toc: TableOfContents) -> List[Any]:
+    """
+    Build the deep-dive pages for each of the top 5 themes
+    """
+    section = []
+    section.append(toc.heading("Your Top 5 Signature Strengths", heading1_style, 'top5'))
+    section.append(Spacer(1, 0.1*inch))
     
-    story.append(Paragraph(
+    section.append(Paragraph(
         "Your signature strengths represent your most dominant natural talents. "
         "Understanding these strengths provides the foundation for maximizing your potential.",
         normal_style
@@ -405,123 +553,438 @@ def generate_comprehensive_pdf(processed_data: Dict[str, Any], output_filename:
         theme_name = theme['name']
         theme_info = get_elaborate_theme_description(theme_name)
         
-        story.append(Spacer(1, 0.2*inch))
-        story.append(Paragraph(
+        section.append(Spacer(1, 0.2*inch))
+        section.append(toc.heading(
             f"Strength {i}: {theme_name} ({theme_info['domain']} - Score: {theme['score']:.1f})", 
-            heading1_style
+            heading1_style, f'strength-{i}', level=1, title=f"Strength {i}: {theme_name}"
         ))
         
         # Core Description
-        story.append(Paragraph("<b>Description:</b>", heading2_style))
-        story.append(Paragraph(theme_info['description'], normal_style))
+        section.append(Paragraph("<b>Description:</b>", heading2_style))
+        section.append(Paragraph(theme_info['description'], normal_style))
         
         # Elaborate Description
-        story.append(Paragraph("<b>Detailed Analysis:</b>", heading2_style))
-        story.append(Paragraph(theme_info['elaborate_description'], normal_style))
+        section.append(Paragraph("<b>Detailed Analysis:</b>", heading2_style))
+        section.append(Paragraph(theme_info['elaborate_description'], normal_style))
         
         # Core Characteristics
-        story.append(Paragraph("<b>Key Characteristics:</b>", heading2_style))
+        section.append(Paragraph("<b>Key Characteristics:</b>", heading2_style))
         for characteristic in theme_info['core_characteristics']:
-            story.append(Paragraph(f"• {characteristic}", bullet_style))
+            section.append(Paragraph(f"• {characteristic}", bullet_style))
         
         if i < len(processed_data['top5']):
-            story.append(Spacer(1, 0.3*inch))
+            section.append(Spacer(1, 0.3*inch))
         
         # Add page break after every 2 strengths for better readability
         if i % 2 == 0 and i < len(processed_data['top5']):
-            story.append(PageBreak())
+            section.append(PageBreak())
     
-    # 4. Development Recommendations
-    story.append(PageBreak())
-    story.append(Paragraph("Development Recommendations", heading1_style))
-    story.append(Spacer(1, 0.1*inch))
+    return section
+
+def build_development_section(processed_data: Dict[str, Any], heading1_style: ParagraphStyle,
+                              heading2_style: ParagraphStyle, normal_style: ParagraphStyle,
+                              toc: TableOfContents) -> List[Any]:
+    """
+    Build the development recommendations
+    """
+    section = []
+    section.append(toc.heading("Development Recommendations", heading1_style, 'development'))
+    section.append(Spacer(1, 0.1*inch))
     
-    story.append(Paragraph(
+    section.append(Paragraph(
         "Based on your unique strengths pattern, here are specific recommendations for personal "
         "and professional development:",
         normal_style
     ))
     
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph("<b>Leverage Your Strengths:</b>", heading2_style))
-    story.append(Paragraph(
+    section.append(Spacer(1, 0.1*inch))
+    section.append(Paragraph("<b>Leverage Your Strengths:</b>", heading2_style))
+    section.append(Paragraph(
         f"Your dominant {processed_data['domainScores']['primary_talent_domain']} talents should be "
         "the foundation of your development strategy. Focus on roles and activities that allow you "
         "to use these natural abilities.",
         normal_style
     ))
     
-    story.append(Paragraph("<b>Build Supporting Skills:</b>", heading2_style))
-    story.append(Paragraph(
+    section.append(Paragraph("<b>Build Supporting Skills:</b>", heading2_style))
+    section.append(Paragraph(
         "Develop complementary skills that support your primary strengths. This creates a more "
         "complete and effective talent profile.",
         normal_style
     ))
     
-    story.append(Paragraph("<b>Team Collaboration:</b>", heading2_style))
-    story.append(Paragraph(
+    section.append(Paragraph("<b>Team Collaboration:</b>", heading2_style))
+    section.append(Paragraph(
         "Partner with individuals whose strengths complement yours. This creates powerful "
         "synergies and covers potential blind spots.",
         normal_style
     ))
     
-    # 5. Footer Information
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(
+    return section
+
+def build_combinations_section(processed_data: Dict[str, Any], heading1_style: ParagraphStyle,
+                               heading2_style: ParagraphStyle, normal_style: ParagraphStyle,
+                               bullet_style: ParagraphStyle, toc: TableOfContents) -> List[Any]:
+    """
+    Build flowables analysing each pair of top 5 themes, with practical applications and balance strategies
+    """
+    section = []
+    section.append(toc.heading("Strength Combinations", heading1_style, 'combinations'))
+    section.append(Paragraph(
+        "Your strengths do not work in isolation. Each pair of your top 5 themes combines in a way "
+        "that shapes how you approach work, learning and relationships.",
+        normal_style
+    ))
+    
+    for i, pair in enumerate(processed_data['top5Pairs'], 1):
+        combo = get_detailed_combo_analysis(pair['themeA']['name'], pair['themeB']['name'])
+        
+        # Pairs without written content are named after the pair itself
+        heading = pair['pairLabel'] if combo['name'] == pair['pairLabel'] else f"{pair['pairLabel']}: {combo['name']}"
+        section.append(Spacer(1, 0.15*inch))
+        section.append(toc.heading(heading, heading2_style, f'combination-{i}', level=1, title=pair['pairLabel']))
+        section.append(Paragraph(f"<b>Positive Synergy:</b> {combo['positive_synergy']}", normal_style))
+        section.append(Paragraph(f"<b>Risks:</b> {combo['risks']}", normal_style))
+        
+        section.append(Paragraph("<b>Practical Applications:</b>", normal_style))
+        for application in combo['practical_applications']:
+            section.append(Paragraph(f"• {application}", bullet_style))
+        
+        section.append(Paragraph("<b>Balance Strategies:</b>", normal_style))
+        for strategy in combo['balance_strategies']:
+            section.append(Paragraph(f"• {strategy}", bullet_style))
+    
+    return section
+
+def resolve_sections(tier: Optional[str] = None, sections: Optional[Any] = None) -> Tuple[str, ...]:
+    """
+    Sections to build for a report tier or an explicit list/comma-separated string of sections,
+    in rendering order
+    """
+    if sections:
+        requested = sections.split(',') if isinstance(sections, str) else list(sections)
+        requested = [section.strip() for section in requested if section.strip()]
+        unknown = [section for section in requested if section not in REPORT_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown report sections: {', '.join(unknown)} (expected {', '.join(REPORT_SECTIONS)})")
+        return tuple(section for section in REPORT_SECTIONS if section in requested)
+    tier = tier or DEFAULT_REPORT_TIER
+    if tier not in REPORT_TIERS:
+        raise ValueError(f"Unknown report tier: {tier} (expected {', '.join(REPORT_TIERS)})")
+    return REPORT_TIERS[tier]
+
+def report_content_entries(processed_data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Content catalog entries ({entry: version}) a report on this assessment can take its text
+    from: the top 5 theme descriptions and the top 5 pair analyses. Recorded whatever tier was
+    rendered, since a re-render uses the tier configured at that time.
+    """
+    entries = {}
+    for theme in processed_data['top5']:
+        entries[theme_entry_key(theme['name'])] = content_entry_version(
+            get_elaborate_theme_description(theme['name']))
+    for pair in processed_data.get('top5Pairs', []):
+        theme1, theme2 = pair['themeA']['name'], pair['themeB']['name']
+        entries[pair_entry_key(theme1, theme2)] = content_entry_version(
+            get_detailed_combo_analysis(theme1, theme2))
+    return entries
+
+def build_report_styles() -> Dict[str, ParagraphStyle]:
+    """
+    Paragraph styles shared by every section of a report (and by every report in a booklet)
+    """
+    # Get default styles and create custom ones
+    styles = getSampleStyleSheet()
+    
+    # Custom styles with professional appearance
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        spaceAfter=30,
+        alignment=1,  # Center alignment
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+    
+    heading1_style = ParagraphStyle(
+        'CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+    
+    heading2_style = ParagraphStyle(
+        'CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=12,
+        spaceAfter=6,
+        textColor=colors.HexColor('#1B4F72'),
+        fontName='Helvetica-Bold'
+    )
+    
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black,
+        alignment=0  # Left alignment
+    )
+    
+    bullet_style = ParagraphStyle(
+        'CustomBullet',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=3,
+        leftIndent=20,
+        textColor=colors.black
+    )
+    
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=1  # Center alignment
+    )
+    
+    return {
+        'title': title_style,
+        'subtitle': styles['Heading2'],
+        'heading1': heading1_style,
+        'heading2': heading2_style,
+        'normal': normal_style,
+        'bullet': bullet_style,
+        'footer': footer_style,
+    }
+
+def build_report_footer(styles: Dict[str, ParagraphStyle]) -> Paragraph:
+    return Paragraph(
         "This report was generated by the StrengthsFinder 360 Assessment Tool. "
         "For questions about your results, please contact your assessment administrator.",
-        ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=1  # Center alignment
-        )
-    ))
+        styles['footer']
+    )
+
+def build_report_story(processed_data: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                       previous_data: Optional[Dict[str, Any]] = None,
+                       sections: Optional[Tuple[str, ...]] = None,
+                       toc: Optional[TableOfContents] = None, footer: Optional[Any] = None) -> List[Any]:
+    """
+    Build the flowables for one report. `sections` (see resolve_sections) selects what to build;
+    unselected sections are never constructed. `footer` replaces the closing paragraph.
+    """
+    sections = sections or REPORT_TIERS[DEFAULT_REPORT_TIER]
+    toc = toc or TableOfContents()
+    heading1_style = styles['heading1']
+    heading2_style = styles['heading2']
+    normal_style = styles['normal']
+    bullet_style = styles['bullet']
+    
+    # Story to hold all elements
+    story = []
+    
+    # Every section after the first starts on a new page
+    def start_section():
+        if story:
+            story.append(PageBreak())
+    
+    # 1. Cover Page
+    if 'cover' in sections:
+        start_section()
+        story.extend(build_cover_section(processed_data, styles['title'], styles['subtitle'], normal_style, toc))
+    
+    # Contents; its page numbers are filled in after the last page is laid out
+    if 'contents' in sections:
+        start_section()
+        story.append(OutlineHeading("Contents", heading1_style, toc.entry('contents', 'Contents', in_toc=False)))
+        story.append(Spacer(1, 0.1*inch))
+        story.append(toc.page_flowable())
+    
+    # 2. Executive Summary
+    if 'executive_summary' in sections:
+        start_section()
+        story.extend(build_executive_summary_section(processed_data, heading1_style, heading2_style,
+                                                     normal_style, toc))
+    
+    # 3. Top 5 Strengths Analysis
+    if 'strengths' in sections:
+        start_section()
+        story.extend(build_strengths_section(processed_data, heading1_style, heading2_style,
+                                             normal_style, bullet_style, toc))
+    
+    # 4. Strength Combinations
+    if 'combinations' in sections and processed_data.get('top5Pairs'):
+        start_section()
+        story.extend(build_combinations_section(processed_data, heading1_style, heading2_style,
+                                                normal_style, bullet_style, toc))
+    
+    # 5. Development Recommendations
+    if 'development' in sections:
+        start_section()
+        story.extend(build_development_section(processed_data, heading1_style, heading2_style,
+                                               normal_style, toc))
+    
+    # 6. Progress since the previous attempt
+    if 'progress' in sections and previous_data:
+        start_section()
+        story.extend(build_progression_section(
+            processed_data, previous_data, heading1_style, heading2_style, normal_style, toc
+        ))
+    
+    # 7. Footer Information
+    story.append(Spacer(1, 0.5*inch))
+    story.append(footer or build_report_footer(styles))
+    if 'contents' in sections:
+        story.append(toc.numbers_flowable())
+    
+    return story
+
+def generate_comprehensive_pdf(processed_data: Dict[str, Any], output_filename: str,
+                               previous_data: Optional[Dict[str, Any]] = None,
+                               sections: Optional[Tuple[str, ...]] = None) -> str:
+    """
+    Generate a comprehensive PDF report using advanced ReportLab features.
+    When `previous_data` (an earlier attempt) is given, a progression section is included.
+    `sections` (see resolve_sections) selects what to build; unselected sections are never constructed.
+    """
+    # Create the document; it adds bookmarks, outline entries and page numbers
+    doc = ReportDocTemplate(
+        output_filename,
+        pagesize=A4,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch
+    )
+    
+    story = build_report_story(processed_data, build_report_styles(), previous_data, sections)
     
     # Build PDF
+    build_start = time.perf_counter()
     doc.build(story)
+    build_seconds = time.perf_counter() - build_start
+    size = os.path.getsize(output_filename) if isinstance(output_filename, str) else output_filename.tell()
+    get_registry().observe_render(build_seconds, doc.page, size)
     return output_filename
 
-def main():
-    """Main function to process JSON input and generate PDF"""
+def render_report(webhook_data: Dict[str, Any], output_file: Optional[str] = None,
+                  priority: str = PRIORITY_INTERACTIVE, output_dir: Optional[str] = None,
+                  tier: Optional[str] = None, sections: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Process a payload and render its report, returning the JSON response printed by main().
+    Without an output path the report goes to sharded storage when REPORT_STORAGE_DIR is set,
+    otherwise to `<output_dir>/response-<id>.pdf` or strength_report.pdf. The tier or section
+    list falls back to the payload's `report_tier` / `report_sections` options.
+    """
     try:
-        # Read JSON data from stdin or from file argument
-        if len(sys.argv) > 1:
-            # Read from file
-            with open(sys.argv[1], 'r', encoding='utf-8') as f:
-                webhook_data = json.load(f)
-            output_file = sys.argv[2] if len(sys.argv) > 2 else "strength_report.pdf"
-        else:
-            # Read from stdin
-            webhook_data = json.load(sys.stdin)
-            output_file = "strength_report.pdf"
+        sections = resolve_sections(tier or webhook_data.get('report_tier'),
+                                    sections or webhook_data.get('report_sections'))
+        default_report = sections == REPORT_TIERS[DEFAULT_REPORT_TIER]
         
         # Process the data
         processed_data = process_psychometric_data(webhook_data)
+        count_processed(processed_data)
+        response_id = processed_data['candidate']['id']
         
-        # Generate PDF
-        pdf_path = generate_comprehensive_pdf(processed_data, output_file)
+        # Record the attempt and fetch the previous one when REPORT_HISTORY_DB is set
+        previous_data = sync_history(processed_data)
+        record_processed(processed_data)
+        
+        # Only the default tier is kept in storage; other tiers never replace it
+        storage = ReportStorage() if output_file is None and default_report and os.environ.get('REPORT_STORAGE_DIR') else None
+        if storage is not None:
+            output_file = storage.path_for(response_id)
+            # Keep the report model so content fixes can re-render it (content_catalog.py);
+            # written before the PDF so the stored report counts as current
+            from report_store import save_assessment
+            save_assessment(processed_data)
+        elif output_file is None and output_dir is not None:
+            output_file = os.path.join(output_dir, f"response-{response_id}.pdf")
+        elif output_file is None:
+            output_file = "strength_report.pdf"
         
-        # Return success response
-        response = {
+        # Generate PDF in a render slot, sharing any identical render in flight
+        def render(path):
+            scheduler = get_scheduler()
+            with scheduler.slot(priority):
+                if storage is not None:
+                    storage.store(response_id, lambda tmp_path: generate_comprehensive_pdf(
+                        processed_data, tmp_path, previous_data, sections),
+                        report_content_entries(processed_data))
+                else:
+                    generate_comprehensive_pdf(processed_data, path, previous_data, sections)
+            scheduler.publish()
+            get_registry().publish()
+
+        # Other tiers of the same payload are coalesced separately from the default report
+        coalesce_payload = webhook_data if default_report else {'payload': webhook_data, 'sections': list(sections)}
+        pdf_path, _ = render_once(response_id, coalesce_payload, output_file, render)
+        
+        return {
             "success": True,
             "filePath": os.path.abspath(pdf_path),
             "fileName": os.path.basename(pdf_path),
             "candidate": processed_data['candidate']
         }
         
-        print(json.dumps(response))
-        return 0
-        
     except Exception as e:
-        # Return error response
-        error_response = {
-            "success": False,
-            "error": str(e)
-        }
-        print(json.dumps(error_response))
+        return _error_response(e)
+
+
+def _error_response(error: Exception) -> Dict[str, Any]:
+    registry = get_registry()
+    registry.inc('strength360_render_errors_total')
+    registry.publish()
+    return {
+        "success": False,
+        "error": str(error)
+    }
+
+
+def pop_options(args: List[str], flags: Tuple[str, ...]) -> Dict[str, str]:
+    """Remove `--flag value` pairs from args and return them; a flag without a value is a usage error"""
+    options = {}
+    for flag in flags:
+        if flag in args:
+            position = args.index(flag)
+            if position + 1 >= len(args):
+                raise ValueError(f'{flag} needs a value')
+            options[flag] = args[position + 1]
+            del args[position:position + 2]
+    return options
+
+
+def main():
+    """
+    Main function to process JSON input and generate PDF
+    Usage: python_pdf_generator.py [payload.json [output.pdf]] [--tier summary|standard|comprehensive]
+                                   [--sections cover,executive_summary,...]
+    """
+    try:
+        args = sys.argv[1:]
+        options = pop_options(args, ('--tier', '--sections'))
+
+        # Read JSON data from stdin or from file argument
+        if args:
+            # Read from file
+            with open(args[0], 'r', encoding='utf-8') as f:
+                webhook_data = json.load(f)
+            output_file = args[1] if len(args) > 1 else None
+        else:
+            # Read from stdin
+            webhook_data = json.load(sys.stdin)
+            output_file = None
+    except Exception as e:
+        print(json.dumps(_error_response(e)))
         return 1
+    
+    response = render_report(webhook_data, output_file, tier=options.get('--tier'),
+                             sections=options.get('--sections'))
+    print(json.dumps(response))
+    return 0 if response["success"] else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Single-flight render coalescing for StrengthsFinder 360
+Identical render requests (same response id and payload hash) that overlap in time share one
+render: the first caller renders while the others wait on a lock file in a host-local rendezvous
+directory and then copy its result. Works across threads and worker processes. Lock files are
+removed by their last holder and leftover results are swept on a timer, so the directory only
+holds recent flights; waiters stop waiting on a stuck render after RENDER_COALESCE_WAIT_SECONDS.
+"""
+
+import sys
+import json
+import os
+import time
+import fcntl
+import hashlib
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, Tuple
+
+DEFAULT_RENDEZVOUS_DIR = os.environ.get(
+    'RENDER_COALESCE_DIR', os.path.join(tempfile.gettempdir(), 'strength360-inflight'))
+
+# Results left behind by finished renders are only useful to callers that were already waiting,
+# which copy them as soon as the lock is released
+RESULT_MAX_AGE_SECONDS = 60
+SWEEP_INTERVAL_SECONDS = 15
+
+# Waiters give up on a stuck render after this long and render themselves
+COALESCE_WAIT_SECONDS = float(os.environ.get('RENDER_COALESCE_WAIT_SECONDS', '120'))
+
+
+def payload_hash(payload: Any) -> str:
+    if isinstance(payload, bytes):
+        data = payload
+    else:
+        data = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def coalesce_key(response_id: Any, payload: Any) -> str:
+    safe_id = ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(response_id))
+    return f"{safe_id}-{payload_hash(payload)[:32]}"
+
+
+def _copy_result(source: str, output_path: str) -> None:
+    if os.path.exists(output_path) and os.path.samefile(source, output_path):
+        return
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, output_path)
+
+
+def _render_privately(render: Callable[[str], Any], output_path: str) -> None:
+    """
+    Render into a private file and move it over `output_path`, for callers that render without
+    holding the lock while another render may still be writing the same path. Renders that
+    publish their output themselves (ReportStorage.store ignores the path) leave no file to move.
+    """
+    root, extension = os.path.splitext(output_path)
+    tmp_path = f"{root}.{os.getpid()}.{os.urandom(4).hex()}.tmp{extension}"
+    try:
+        render(tmp_path)
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _publish_result(output_path: str, result_path: str) -> None:
+    tmp_path = f"{result_path}.{os.getpid()}.tmp"
+    try:
+        os.link(output_path, tmp_path)
+    except OSError:
+        shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, result_path)
+
+
+def _count(rendezvous_dir: str, field: str) -> None:
+    """Bump a host-wide counter in metrics.json"""
+    with open(os.path.join(rendezvous_dir, 'metrics.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        metrics = read_metrics(rendezvous_dir)
+        metrics[field] += 1
+        path = os.path.join(rendezvous_dir, 'metrics.json')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f)
+        os.replace(tmp_path, path)
+
+
+def read_metrics(rendezvous_dir: str = DEFAULT_RENDEZVOUS_DIR) -> Dict[str, int]:
+    try:
+        with open(os.path.join(rendezvous_dir, 'metrics.json'), 'r', encoding='utf-8') as f:
+            metrics = json.load(f)
+    except (OSError, ValueError):
+        metrics = {}
+    metrics.setdefault('renders', 0)
+    metrics.setdefault('coalesced', 0)
+    metrics.setdefault('timeouts', 0)
+    return metrics
+
+
+def sweep(rendezvous_dir: str = DEFAULT_RENDEZVOUS_DIR, max_age: float = RESULT_MAX_AGE_SECONDS) -> int:
+    """
+    Remove stale shared results and lock files left by crashed renders. A lock file is only
+    removed while holding it, and lockers re-check its inode, so removal never splits a flight.
+    """
+    removed = 0
+    cutoff = time.time() - max_age
+    for entry in os.scandir(rendezvous_dir):
+        try:
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.name.endswith('.result'):
+                os.unlink(entry.path)
+                removed += 1
+            elif entry.name.endswith('.lock') and entry.name != 'metrics.lock':
+                with open(entry.path, 'a') as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    if _same_file(lock, entry.path):
+                        os.unlink(entry.path)
+                        removed += 1
+        except (FileNotFoundError, BlockingIOError):
+            pass
+    return removed
+
+
+def _maybe_sweep(rendezvous_dir: str) -> None:
+    """Sweep at most once per SWEEP_INTERVAL_SECONDS across all processes on the host"""
+    marker = os.path.join(rendezvous_dir, 'last-sweep')
+    try:
+        if time.time() - os.path.getmtime(marker) < SWEEP_INTERVAL_SECONDS:
+            return
+    except FileNotFoundError:
+        pass
+    with open(marker, 'a'):
+        os.utime(marker)
+    sweep(rendezvous_dir)
+
+
+def _same_file(f, path: str) -> bool:
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _acquire(lock_path: str, deadline: float):
+    """
+    Lock `lock_path`, polling until `deadline`. Returns (lock_file or None on timeout, waited).
+    A lock file unlinked by the previous holder is still returned once so the caller can pick
+    up that holder's result; callers retry with a fresh file when it has no result.
+    """
+    waited = False
+    delay = 0.01
+    while True:
+        lock = open(lock_path, 'a')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock, waited
+        except BlockingIOError:
+            lock.close()
+        waited = True
+        if time.monotonic() >= deadline:
+            return None, waited
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+
+
+def render_once(response_id: Any, payload: Any, output_path: str, render: Callable[[str], Any],
+                rendezvous_dir: str = DEFAULT_RENDEZVOUS_DIR,
+                wait_seconds: float = COALESCE_WAIT_SECONDS) -> Tuple[str, bool]:
+    """
+    Run `render(output_path)` unless an identical render is already in flight, in which case wait
+    for it (at most `wait_seconds`, then render independently) and copy its output.
+    Returns (output_path, coalesced).
+    """
+    os.makedirs(rendezvous_dir, exist_ok=True)
+    key = coalesce_key(response_id, payload)
+    result_path = os.path.join(rendezvous_dir, f"{key}.result")
+    lock_path = os.path.join(rendezvous_dir, f"{key}.lock")
+    deadline = time.monotonic() + wait_seconds
+
+    while True:
+        lock, waited = _acquire(lock_path, deadline)
+        if lock is None:
+            # The stuck render may still be writing output_path
+            _count(rendezvous_dir, 'timeouts')
+            _render_privately(render, output_path)
+            _count(rendezvous_dir, 'renders')
+            return output_path, False
+
+        with lock:
+            current = _same_file(lock, lock_path)
+            try:
+                # A result is only trusted if this caller overlapped with the render that produced it
+                if waited and os.path.exists(result_path):
+                    _copy_result(result_path, output_path)
+                    _count(rendezvous_dir, 'coalesced')
+                    return output_path, True
+                if not current:
+                    # The previous holder removed this file without leaving a result; lock afresh
+                    continue
+
+                try:
+                    os.unlink(result_path)
+                except FileNotFoundError:
+                    pass
+                render(output_path)
+                _publish_result(output_path, result_path)
+                _count(rendezvous_dir, 'renders')
+            finally:
+                # Removed while still held: waiters on this inode see it is gone and new callers
+                # create a fresh file, so lock files never accumulate
+                if current:
+                    os.unlink(lock_path)
+        break
+
+    _maybe_sweep(rendezvous_dir)
+    return output_path, False
+
+
+if __name__ == "__main__":
+    rendezvous_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_RENDEZVOUS_DIR
+    print(json.dumps({"success": True, "metrics": read_metrics(rendezvous_dir)}))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Render metrics for StrengthsFinder 360
+Each renderer process counts renders, render latency, page counts, output sizes and subdomain
+fallbacks in memory, then merges them into a host-wide state file under a lock. The totals are
+exposed in Prometheus text format, either as a file (node_exporter textfile collector) or over a
+small local HTTP endpoint.
+"""
+
+import sys
+import json
+import os
+import fcntl
+import tempfile
+from bisect import bisect_left
+from typing import Dict, Any, Tuple
+
+DEFAULT_METRICS_DIR = os.environ.get(
+    'RENDER_METRICS_DIR', os.path.join(tempfile.gettempdir(), 'strength360-metrics'))
+DEFAULT_METRICS_PORT = int(os.environ.get('RENDER_METRICS_PORT', 9464))
+
+PROM_FILE_NAME = 'strength360.prom'
+
+COUNTERS = {
+    'strength360_payloads_processed_total': 'Webhook payloads processed into report data',
+    'strength360_subdomain_fallback_total': 'Payloads without subdomain scores that fell back to domain scores',
+    'strength360_reports_rendered_total': 'PDF reports rendered',
+    'strength360_render_errors_total': 'Report jobs that failed',
+}
+
+HISTOGRAMS = {
+    'strength360_render_seconds': (
+        'Time spent building one PDF report',
+        (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)),
+    'strength360_report_pages': (
+        'Pages per rendered report',
+        (1, 2, 4, 6, 8, 10, 15, 20, 50)),
+    'strength360_report_bytes': (
+        'Size of each rendered report in bytes',
+        (5_000, 7_500, 10_000, 15_000, 25_000, 50_000, 100_000, 250_000, 1_000_000)),
+}
+
+
+class MetricsRegistry:
+    """In-process metric values; `publish` moves them into the host-wide state file"""
+
+    def __init__(self, metrics_dir: str = DEFAULT_METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._reset()
+
+    def _reset(self) -> None:
+        self.counters = {name: 0 for name in COUNTERS}
+        self.histograms = {
+            name: {'buckets': [0] * (len(bounds) + 1), 'sum': 0.0, 'count': 0}
+            for name, (_, bounds) in HISTOGRAMS.items()
+        }
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        histogram = self.histograms[name]
+        # Bucket i counts values <= bound i; the last bucket is +Inf
+        histogram['buckets'][bisect_left(HISTOGRAMS[name][1], value)] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+    def observe_render(self, seconds: float, pages: int, size: int) -> None:
+        self.inc('strength360_reports_rendered_total')
+        self.observe('strength360_render_seconds', seconds)
+        self.observe('strength360_report_pages', pages)
+        self.observe('strength360_report_bytes', size)
+
+    def publish(self) -> None:
+        """Merge values recorded since the last publish into the state file and the .prom file"""
+        if not any(self.counters.values()):
+            return
+
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        with open(os.path.join(self.metrics_dir, 'metrics.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = read_state(self.metrics_dir)
+            for name, value in self.counters.items():
+                state['counters'][name] += value
+            for name, histogram in self.histograms.items():
+                shared = state['histograms'][name]
+                shared['buckets'] = [a + b for a, b in zip(shared['buckets'], histogram['buckets'])]
+                shared['sum'] += histogram['sum']
+                shared['count'] += histogram['count']
+
+            _atomic_write(os.path.join(self.metrics_dir, 'metrics.json'), json.dumps(state))
+            _atomic_write(os.path.join(self.metrics_dir, PROM_FILE_NAME), format_prometheus(state))
+
+        self._reset()
+
+
+def _atomic_write(path: str, text: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def read_state(metrics_dir: str = DEFAULT_METRICS_DIR) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(metrics_dir, 'metrics.json'), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault('counters', {})
+    state.setdefault('histograms', {})
+    for name in COUNTERS:
+        state['counters'].setdefault(name, 0)
+    for name, (_, bounds) in HISTOGRAMS.items():
+        state['histograms'].setdefault(name, {'buckets': [0] * (len(bounds) + 1), 'sum': 0.0, 'count': 0})
+    return state
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else repr(float(bound))
+
+
+def format_prometheus(state: Dict[str, Any]) -> str:
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {state['counters'][name]}")
+
+    for name, (help_text, bounds) in HISTOGRAMS.items():
+        histogram = state['histograms'][name]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(bounds, histogram['buckets']):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{name}_sum {histogram['sum']}")
+        lines.append(f"{name}_count {histogram['count']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+_registry = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry built from RENDER_METRICS_DIR"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def serve(port: int = DEFAULT_METRICS_PORT, metrics_dir: str = DEFAULT_METRICS_DIR,
+          host: str = '127.0.0.1') -> None:
+    """Serve the host-wide totals at http://host:port/metrics"""
+    # Only the metrics server needs http.server; keep it out of every renderer's imports
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = format_prometheus(read_state(metrics_dir)).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    HTTPServer((host, port), MetricsHandler).serve_forever()
+
+
+def _parse_args(args) -> Tuple[str, str, int]:
+    if not args or args[0] not in ('dump', 'serve'):
+        raise ValueError('Usage: render_metrics.py dump [metrics_dir] | serve [port] [metrics_dir]')
+    if args[0] == 'serve':
+        port = int(args[1]) if len(args) > 1 else DEFAULT_METRICS_PORT
+        return 'serve', args[2] if len(args) > 2 else DEFAULT_METRICS_DIR, port
+    return 'dump', args[1] if len(args) > 1 else DEFAULT_METRICS_DIR, 0
+
+
+if __name__ == "__main__":
+    try:
+        command, metrics_dir, port = _parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        sys.exit(1)
+    if command == 'serve':
+        serve(port, metrics_dir)
+    else:
+        sys.stdout.write(format_prometheus(read_state(metrics_dir)))
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Priority-aware render scheduling for StrengthsFinder 360
+Render slots are lock files shared by every renderer process on the host (CLI, batch, store).
+Some slots are reserved for interactive downloads. Bulk jobs that have waited longer than the
+aging limit are promoted within the bulk class (they poll for shared slots as eagerly as
+interactive jobs) and may borrow at most a fraction of the reserved slots, so a sustained bulk
+run can never take the whole reservation. Per-class wait times are merged into a host-wide
+stats file.
+"""
+
+import sys
+import json
+import os
+import time
+import fcntl
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BULK = 'bulk'
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BULK)
+
+DEFAULT_STATE_DIR = os.environ.get(
+    'RENDER_SCHEDULER_DIR', os.path.join(tempfile.gettempdir(), 'strength360-render-slots'))
+DEFAULT_SLOTS = int(os.environ.get('RENDER_SLOTS', os.cpu_count() or 1))
+DEFAULT_RESERVED_SLOTS = int(os.environ.get('RENDER_RESERVED_SLOTS', max(1, DEFAULT_SLOTS // 4)))
+DEFAULT_AGING_SECONDS = float(os.environ.get('RENDER_AGING_SECONDS', 30))
+# Share of the reserved slots aged bulk jobs may borrow (rounded down: one reserved slot is never lent)
+DEFAULT_AGED_BORROW_FRACTION = float(os.environ.get('RENDER_AGED_BORROW_FRACTION', 0.5))
+
+INTERACTIVE_POLL_SECONDS = 0.002
+BULK_POLL_SECONDS = 0.01
+MAX_POLL_SECONDS = 0.05
+
+# Keep a bounded window of recent waits per class for percentiles
+STATS_WINDOW = 1000
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize_waits(samples: List[float], count: int, total: float) -> Dict[str, Any]:
+    return {
+        'count': count,
+        'mean_ms': total / count * 1000 if count else 0.0,
+        'p50_ms': _percentile(samples, 0.50) * 1000,
+        'p95_ms': _percentile(samples, 0.95) * 1000,
+        'p99_ms': _percentile(samples, 0.99) * 1000,
+        'max_ms': max(samples) * 1000 if samples else 0.0
+    }
+
+
+class RenderScheduler:
+    """
+    Host-wide render slots. Slots [0, reserved) are for interactive jobs and slots [reserved, slots)
+    are shared. A bulk job that has waited longer than `aging_seconds` may also use the last
+    `aged_borrow_fraction` of the reserved slots.
+    """
+
+    def __init__(self, state_dir: str = DEFAULT_STATE_DIR, slots: int = DEFAULT_SLOTS,
+                 reserved: int = DEFAULT_RESERVED_SLOTS, aging_seconds: float = DEFAULT_AGING_SECONDS,
+                 aged_borrow_fraction: float = DEFAULT_AGED_BORROW_FRACTION):
+        if slots < 1:
+            raise ValueError('Render scheduler needs at least one slot')
+        self.state_dir = state_dir
+        self.slots = slots
+        # At least one slot always stays open to bulk work
+        self.reserved = max(0, min(reserved, slots - 1))
+        self.aging_seconds = aging_seconds
+        self.borrowable = min(self.reserved, int(self.reserved * aged_borrow_fraction))
+        self._waits = {priority: deque(maxlen=STATS_WINDOW) for priority in PRIORITIES}
+        self._counts = {priority: 0 for priority in PRIORITIES}
+        self._totals = {priority: 0.0 for priority in PRIORITIES}
+        self._unpublished = {priority: 0 for priority in PRIORITIES}
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _try_lock(self, index: int) -> Optional[int]:
+        fd = os.open(os.path.join(self.state_dir, f"slot-{index}.lock"), os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            os.close(fd)
+            return None
+
+    def _candidate_slots(self, priority: str, waited: float) -> List[int]:
+        shared = list(range(self.reserved, self.slots))
+        reserved = list(range(self.reserved))
+        if priority == PRIORITY_INTERACTIVE:
+            return reserved + shared
+        if waited >= self.aging_seconds:
+            # Interactive jobs try reserved slots from the front, so lend the ones at the back
+            return shared + reserved[self.reserved - self.borrowable:]
+        return shared
+
+    @contextmanager
+    def slot(self, priority: str = PRIORITY_INTERACTIVE):
+        """Block until a slot is free for `priority`, hold it for the duration of the block"""
+        if priority not in PRIORITIES:
+            raise ValueError(f'Unknown render priority: {priority}')
+
+        start = time.monotonic()
+        delay = INTERACTIVE_POLL_SECONDS if priority == PRIORITY_INTERACTIVE else BULK_POLL_SECONDS
+        fd = None
+        while fd is None:
+            waited = time.monotonic() - start
+            for index in self._candidate_slots(priority, waited):
+                fd = self._try_lock(index)
+                if fd is not None:
+                    break
+            else:
+                time.sleep(delay)
+                if priority == PRIORITY_BULK and waited >= self.aging_seconds:
+                    # Aged bulk jobs poll as often as interactive ones, so they get the next
+                    # free shared slot ahead of younger bulk jobs
+                    delay = INTERACTIVE_POLL_SECONDS
+                else:
+                    delay = min(delay * 2, MAX_POLL_SECONDS)
+
+        waited = time.monotonic() - start
+        self._waits[priority].append(waited)
+        self._counts[priority] += 1
+        self._totals[priority] += waited
+        self._unpublished[priority] = min(self._unpublished[priority] + 1, STATS_WINDOW)
+        try:
+            yield waited
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Wait-time stats for jobs scheduled by this process"""
+        return {
+            priority: summarize_waits(list(self._waits[priority]), self._counts[priority], self._totals[priority])
+            for priority in PRIORITIES
+        }
+
+    def publish(self) -> None:
+        """Merge waits recorded since the last publish into the host-wide stats file"""
+        pending = {priority: list(self._waits[priority])[-self._unpublished[priority]:]
+                   if self._unpublished[priority] else []
+                   for priority in PRIORITIES}
+        if not any(pending.values()):
+            return
+
+        with open(os.path.join(self.state_dir, 'stats.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            shared = _read_shared_stats(self.state_dir)
+            for priority in PRIORITIES:
+                entry = shared[priority]
+                entry['count'] += len(pending[priority])
+                entry['total'] += sum(pending[priority])
+                entry['samples'] = (entry['samples'] + pending[priority])[-STATS_WINDOW:]
+
+            path = os.path.join(self.state_dir, 'stats.json')
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(shared, f)
+            os.replace(tmp_path, path)
+
+        self._unpublished = {priority: 0 for priority in PRIORITIES}
+
+
+def _read_shared_stats(state_dir: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(os.path.join(state_dir, 'stats.json'), 'r', encoding='utf-8') as f:
+            shared = json.load(f)
+    except (OSError, ValueError):
+        shared = {}
+    for priority in PRIORITIES:
+        shared.setdefault(priority, {'count': 0, 'total': 0.0, 'samples': []})
+    return shared
+
+
+def collect_stats(state_dir: str = DEFAULT_STATE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Host-wide wait-time stats published by every renderer process"""
+    shared = _read_shared_stats(state_dir)
+    return {
+        priority: summarize_waits(shared[priority]['samples'], shared[priority]['count'], shared[priority]['total'])
+        for priority in PRIORITIES
+    }
+
+
+def benchmark(duration: float = 10.0, aging_seconds: float = 2.0, slots: int = 4, reserved: int = 2,
+              bulk_workers: int = 12, render_seconds: float = 0.05, interactive_interval: float = 0.1,
+              borrow_fractions: tuple = (1.0, DEFAULT_AGED_BORROW_FRACTION)) -> List[Dict[str, Any]]:
+    """
+    Saturate the slots with bulk jobs for several aging windows while interactive jobs arrive at a
+    steady rate, once per borrow fraction (1.0 lets aged bulk jobs take the whole reservation).
+    Renders are simulated with sleeps, so only the scheduling policy is measured.
+    """
+    results = []
+    for fraction in borrow_fractions:
+        state_dir = tempfile.mkdtemp(prefix='strength360-slots-bench-')
+        scheduler = RenderScheduler(state_dir, slots, reserved, aging_seconds, fraction)
+        deadline = time.monotonic() + duration
+        bulk_done = [0]
+
+        def bulk_loop():
+            while time.monotonic() < deadline:
+                with scheduler.slot(PRIORITY_BULK):
+                    time.sleep(render_seconds)
+                bulk_done[0] += 1
+
+        threads = [threading.Thread(target=bulk_loop) for _ in range(bulk_workers)]
+        for thread in threads:
+            thread.start()
+        interactive_waits = []
+        while time.monotonic() < deadline:
+            with scheduler.slot(PRIORITY_INTERACTIVE) as waited:
+                interactive_waits.append(waited)
+                time.sleep(render_seconds)
+            time.sleep(interactive_interval)
+        for thread in threads:
+            thread.join()
+
+        for name in os.listdir(state_dir):
+            os.unlink(os.path.join(state_dir, name))
+        os.rmdir(state_dir)
+        results.append({
+            'borrowFraction': fraction,
+            'borrowableSlots': scheduler.borrowable,
+            'interactive': summarize_waits(interactive_waits, len(interactive_waits), sum(interactive_waits)),
+            'bulkRendered': bulk_done[0]
+        })
+    return results
+
+
+_scheduler = None
+
+
+def get_scheduler() -> RenderScheduler:
+    """Process-wide scheduler built from the RENDER_* environment settings"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RenderScheduler()
+    return _scheduler
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ('stats', 'benchmark'):
+        print(json.dumps({"success": False,
+                          "error": "Usage: render_scheduler.py stats [state_dir] | benchmark [seconds] [aging_seconds]"}))
+        sys.exit(1)
+    if sys.argv[1] == 'benchmark':
+        duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+        aging = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+        print(json.dumps({"success": True, "durationSeconds": duration, "agingSeconds": aging,
+                          "results": benchmark(duration, aging)}))
+    else:
+        state_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STATE_DIR
+        print(json.dumps({"success": True, "waits": collect_stats(state_dir)}))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Class booklet rendering for StrengthsFinder 360
+Binds the reports for many payloads into one PDF for counselling sessions. Styles and the
+closing boilerplate are created once and shared by every report, each student gets a top-level
+bookmark with their sections nested under it, and page numbering restarts at every cover.
+Each student's story is only built when layout reaches it, so only one report's flowables
+are alive at a time; what remains per student is ReportLab's finished page objects (a few KB
+each) until the file is written.
+"""
+
+import sys
+import json
+import os
+import time
+from itertools import chain
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak
+from reportlab.platypus.flowables import Flowable
+
+from python_pdf_generator import (
+    process_psychometric_data, count_processed, build_report_styles, build_report_story, build_report_footer,
+    resolve_sections, pop_options
+)
+from report_navigation import ReportDocTemplate, ReportStart, OutlineEntry, TableOfContents
+from history_store import previous_assessment, DEFAULT_HISTORY_DB
+from team_report import load_cohort
+from render_metrics import get_registry
+
+
+class StoryStream(list):
+    """
+    Story list that pulls the next report's flowables from a generator whenever layout has
+    consumed the previous ones. Platypus checks len() before taking each flowable, so refilling
+    there keeps at most one report's story in memory.
+    """
+
+    def __init__(self, stories: Iterator[List[Any]]):
+        super().__init__()
+        self._stories = stories
+        self._exhausted = False
+
+    def __len__(self):
+        while not self._exhausted and super().__len__() == 0:
+            story = next(self._stories, None)
+            if story is None:
+                self._exhausted = True
+            else:
+                self.extend(story)
+        return super().__len__()
+
+
+class SharedStatic(Flowable):
+    """
+    Static flowable drawn into a form XObject the first time it is placed; every later
+    placement references the same form, so repeated boilerplate is stored once per document
+    """
+
+    def __init__(self, flowable: Flowable, form_name: str):
+        super().__init__()
+        self.flowable = flowable
+        self.form_name = form_name
+        self._defined_on = None
+        self._size = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._size is None:
+            self._size = self.flowable.wrap(availWidth, availHeight)
+        return self._size
+
+    def draw(self):
+        canvas = self.canv
+        if self._defined_on is not canvas:
+            width, height = self._size
+            canvas.beginForm(self.form_name, 0, 0, width, height)
+            self.flowable.drawOn(canvas, 0, 0)
+            canvas.endForm()
+            self._defined_on = canvas
+        canvas.doForm(self.form_name)
+
+
+def booklet_stories(processed_list: Iterable[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+                    sections: Tuple[str, ...]) -> Iterator[List[Any]]:
+    """One story per (processed_data, previous_data), each starting on a fresh, renumbered page"""
+    styles = build_report_styles()
+    footer = SharedStatic(build_report_footer(styles), 'bookletFooter')
+    for number, (processed_data, previous_data) in enumerate(processed_list, start=1):
+        candidate = processed_data['candidate']
+        prefix = f"student{number}-"
+        student = OutlineEntry(f"{prefix}start", f"{candidate['name']} ({candidate['id']})")
+        toc = TableOfContents(f"tocPageNumbers{number}", key_prefix=prefix, level_offset=1)
+        story = [PageBreak()] if number > 1 else []
+        story.append(ReportStart(student))
+        story.extend(build_report_story(processed_data, styles, previous_data, sections, toc, footer))
+        yield story
+
+
+def generate_booklet_pdf(payloads: Iterable[Dict[str, Any]], output_filename, sections: Optional[Any] = None,
+                         history_db: Optional[str] = DEFAULT_HISTORY_DB) -> Dict[str, Any]:
+    """
+    Render every valid payload into one booklet; payloads that fail processing are skipped and
+    reported. When `history_db` is set each report includes progress since the previous attempt.
+    """
+    sections = resolve_sections(sections=sections)
+    skipped = []
+    students = 0
+
+    def processed():
+        nonlocal students
+        for payload in payloads:
+            try:
+                processed_data = process_psychometric_data(payload)
+            except Exception as e:
+                # Any payload that would fail render_report is skipped, not just invalid ones
+                skipped.append(str(e))
+                continue
+            count_processed(processed_data)
+            previous_data = previous_assessment(processed_data['candidate'], history_db) if history_db else None
+            students += 1
+            yield processed_data, previous_data
+
+    # Find the first valid payload before the output file is opened, so a cohort with none
+    # leaves no empty booklet (or overwritten one) behind
+    reports = processed()
+    first = next(reports, None)
+    if first is None:
+        raise ValueError('No valid payloads to render')
+
+    doc = ReportDocTemplate(
+        output_filename,
+        pagesize=A4,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch,
+        title='Strengths Report Booklet'
+    )
+
+    start = time.perf_counter()
+    doc.build(StoryStream(booklet_stories(chain([first], reports), sections)))
+    elapsed = time.perf_counter() - start
+
+    registry = get_registry()
+    registry.inc('strength360_reports_rendered_total', students)
+    registry.publish()
+    return {'students': students, 'pages': doc.page, 'skipped': len(skipped), 'errors': skipped[:10],
+            'elapsedSeconds': round(elapsed, 2)}
+
+
+def main():
+    """
+    Usage:
+      report_booklet.py <payloads.json> [output.pdf] [--tier summary|standard|comprehensive]
+                        [--sections cover,executive_summary,...]
+    """
+    try:
+        args = sys.argv[1:]
+        options = pop_options(args, ('--tier', '--sections'))
+        if not args:
+            raise ValueError('Usage: report_booklet.py <payloads.json> [output.pdf] [--tier T | --sections a,b]')
+
+        output_file = args[1] if len(args) > 1 else "strength_booklet.pdf"
+        sections = resolve_sections(options.get('--tier'), options.get('--sections'))
+        result = generate_booklet_pdf(load_cohort(args[0]), output_file, sections)
+
+        response = {
+            "success": True,
+            "filePath": os.path.abspath(output_file),
+            "fileName": os.path.basename(output_file),
+            **result
+        }
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Lightweight report export for StrengthsFinder 360
+Builds a structured JSON report model from processed assessment data and renders it
+to a static HTML document, so results can be shown on screen without building the PDF.
+"""
+
+import sys
+import json
+import os
+from html import escape
+from typing import Dict, List, Any
+
+from python_pdf_generator import (
+    process_psychometric_data,
+    get_elaborate_theme_description,
+    get_detailed_combo_analysis,
+)
+
+REPORT_MODEL_VERSION = 1
+
+DOMAIN_LABELS = [
+    ('strategic_thinking', 'Strategic Thinking'),
+    ('relationship_building', 'Relationship Building'),
+    ('influencing', 'Influencing'),
+    ('executing', 'Executing'),
+]
+
+
+def build_report_model(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a JSON-serialisable report model with the same content the PDF report uses
+    """
+    domain_scores = processed_data['domainScores']
+
+    domains = [
+        {'key': key, 'name': label, 'score': domain_scores[key]}
+        for key, label in DOMAIN_LABELS
+    ]
+    domains.sort(key=lambda d: (-d['score'], d['name']))
+
+    themes = [
+        {'rank': rank, 'name': t['name'], 'score': t['score'], 'domain': t['domain']}
+        for rank, t in enumerate(processed_data['allThemes'], 1)
+    ]
+
+    top5 = []
+    for rank, theme in enumerate(processed_data['top5'], 1):
+        top5.append({
+            'rank': rank,
+            'name': theme['name'],
+            'score': theme['score'],
+            'domain': theme['domain'],
+            'content': get_elaborate_theme_description(theme['name'])
+        })
+
+    combinations = []
+    for pair in processed_data['top5Pairs']:
+        theme_a = pair['themeA']['name']
+        theme_b = pair['themeB']['name']
+        combinations.append({
+            'pairLabel': pair['pairLabel'],
+            'themeA': theme_a,
+            'themeB': theme_b,
+            'content': get_detailed_combo_analysis(theme_a, theme_b)
+        })
+
+    return {
+        'version': REPORT_MODEL_VERSION,
+        'candidate': processed_data['candidate'],
+        'primaryTalentDomain': domain_scores['primary_talent_domain'],
+        'domains': domains,
+        'themes': themes,
+        'top5': top5,
+        'combinations': combinations
+    }
+
+
+# HTML templates - plain string formatting keeps rendering to a single pass over the model
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Strengths Report - {name}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #000; max-width: 860px; margin: 0 auto; padding: 24px; }}
+h1 {{ color: #2E86AB; text-align: center; }}
+h2 {{ color: #2E86AB; border-bottom: 1px solid #2E86AB; padding-bottom: 4px; }}
+h3 {{ color: #1B4F72; }}
+table {{ border-collapse: collapse; width: 100%; margin: 12px 0; }}
+th {{ background: #2E86AB; color: #fff; text-align: left; padding: 6px; }}
+td {{ background: #F8F9FA; border: 1px solid #ccc; padding: 6px; }}
+.meta p {{ margin: 4px 0; }}
+.footer {{ color: grey; font-size: 11px; text-align: center; margin-top: 32px; }}
+</style>
+</head>
+<body>
+<h1>COMPREHENSIVE STRENGTHS ASSESSMENT REPORT</h1>
+<div class="meta">
+<p><b>Prepared for:</b> {name}</p>
+<p><b>Email:</b> {email}</p>
+<p><b>Assessment Date:</b> {date}</p>
+<p><b>Primary Talent Domain:</b> {primary}</p>
+<p><b>Report ID:</b> {report_id}</p>
+</div>
+<h2>Domain Scores Overview</h2>
+<table>
+<tr><th>Talent Domain</th><th>Score</th></tr>
+{domain_rows}
+</table>
+<h2>Your Top 5 Signature Strengths</h2>
+{top5_sections}
+<h2>Strength Combinations</h2>
+{combo_sections}
+<h2>All Themes</h2>
+<table>
+<tr><th>Rank</th><th>Theme</th><th>Domain</th><th>Score</th></tr>
+{theme_rows}
+</table>
+<p class="footer">This report was generated by the StrengthsFinder 360 Assessment Tool.
+For questions about your results, please contact your assessment administrator.</p>
+</body>
+</html>
+"""
+
+_THEME_TEMPLATE = """<section>
+<h3>Strength {rank}: {name} ({domain} - Score: {score:.1f})</h3>
+<p><b>Description:</b> {description}</p>
+<p><b>Detailed Analysis:</b> {elaborate}</p>
+<p><b>Key Characteristics:</b></p>
+<ul>{characteristics}</ul>
+</section>"""
+
+_COMBO_TEMPLATE = """<section>
+<h3>{heading}</h3>
+<p><b>Positive Synergy:</b> {synergy}</p>
+<p><b>Risks:</b> {risks}</p>
+<p><b>Practical Applications:</b></p>
+<ul>{applications}</ul>
+<p><b>Balance Strategies:</b></p>
+<ul>{strategies}</ul>
+</section>"""
+
+
+def _list_items(items: List[str]) -> str:
+    return ''.join(f'<li>{escape(item)}</li>' for item in items)
+
+
+def _combo_heading(combination: Dict[str, Any]) -> str:
+    # Fallback pairs are named after their label; don't repeat it
+    label, name = combination['pairLabel'], combination['content']['name']
+    return label if name == label else f"{label}: {name}"
+
+
+def render_report_html(report_model: Dict[str, Any]) -> str:
+    """
+    Render a report model to a static HTML document
+    """
+    candidate = report_model['candidate']
+
+    domain_rows = '\n'.join(
+        f"<tr><td>{escape(d['name'])}</td><td>{d['score']:.1f}</td></tr>"
+        for d in report_model['domains']
+    )
+
+    top5_sections = '\n'.join(
+        _THEME_TEMPLATE.format(
+            rank=t['rank'],
+            name=escape(t['name']),
+            domain=escape(t['content']['domain']),
+            score=t['score'],
+            description=escape(t['content']['description']),
+            elaborate=escape(t['content']['elaborate_description']),
+            characteristics=_list_items(t['content']['core_characteristics'])
+        )
+        for t in report_model['top5']
+    )
+
+    combo_sections = '\n'.join(
+        _COMBO_TEMPLATE.format(
+            heading=escape(_combo_heading(c)),
+            synergy=escape(c['content']['positive_synergy']),
+            risks=escape(c['content']['risks']),
+            applications=_list_items(c['content']['practical_applications']),
+            strategies=_list_items(c['content']['balance_strategies'])
+        )
+        for c in report_model['combinations']
+    )
+
+    theme_rows = '\n'.join(
+        f"<tr><td>{t['rank']}</td><td>{escape(t['name'])}</td>"
+        f"<td>{escape(t['domain'])}</td><td>{t['score']:.1f}</td></tr>"
+        for t in report_model['themes']
+    )
+
+    return _PAGE_TEMPLATE.format(
+        name=escape(str(candidate['name'])),
+        email=escape(str(candidate['email'])),
+        date=escape(str(candidate['created_at'])[:10]),
+        primary=escape(str(report_model['primaryTalentDomain'])),
+        report_id=escape(str(candidate['id'])),
+        domain_rows=domain_rows,
+        top5_sections=top5_sections,
+        combo_sections=combo_sections,
+        theme_rows=theme_rows
+    )
+
+
+def main():
+    """Process JSON input and write the report as HTML (default) or as the JSON report model"""
+    try:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        output_format = 'json' if '--json' in sys.argv[1:] else 'html'
+
+        # Read JSON data from a file argument or from stdin
+        if args and args[0] != '-':
+            with open(args[0], 'r', encoding='utf-8') as f:
+                webhook_data = json.load(f)
+        else:
+            webhook_data = json.load(sys.stdin)
+        output_file = args[1] if len(args) > 1 else f"strength_report.{output_format}"
+
+        processed_data = process_psychometric_data(webhook_data)
+        report_model = build_report_model(processed_data)
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            if output_format == 'json':
+                json.dump(report_model, f, ensure_ascii=False)
+            else:
+                f.write(render_report_html(report_model))
+
+        response = {
+            "success": True,
+            "filePath": os.path.abspath(output_file),
+            "fileName": os.path.basename(output_file),
+            "candidate": processed_data['candidate']
+        }
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
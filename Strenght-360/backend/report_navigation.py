@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+PDF navigation for StrengthsFinder 360 reports
+Outline (bookmark) entries, page numbers and a printed table of contents in a single layout
+pass. The contents page reserves one row per known heading and draws its page numbers through
+a PDF form XObject that is only filled in once the last page has been laid out, instead of
+running platypus `multiBuild` to converge on the numbers.
+"""
+
+from typing import List, Any, Optional
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph
+from reportlab.platypus.flowables import Flowable
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+TOC_ROW_HEIGHTS = (20, 16)
+TOC_FONTS = (('Helvetica-Bold', 11), ('Helvetica', 10))
+TOC_INDENT = 18
+TOC_NUMBER_WIDTH = 30
+
+
+class OutlineEntry:
+    """A heading that gets a bookmark, an outline entry and (optionally) a contents row"""
+
+    def __init__(self, key: str, title: str, level: int = 0, in_toc: bool = True):
+        self.key = key
+        self.title = title
+        self.level = level
+        self.in_toc = in_toc
+        self.page = None
+
+
+class OutlineHeading(Paragraph):
+    """Paragraph that registers its OutlineEntry with ReportDocTemplate when it is laid out"""
+
+    def __init__(self, text: str, style, entry: OutlineEntry, toc: Optional['TableOfContents'] = None):
+        super().__init__(text, style)
+        self.outline_entry = entry
+        if toc is not None:
+            toc.entries.append(entry)
+
+
+class TableOfContents:
+    """
+    Entries collected while the story is built, shared by the contents page and its numbers.
+    Reports bound into one document need distinct form names and key prefixes; `level_offset`
+    nests their outline under a per-report entry.
+    """
+
+    def __init__(self, form_name: str = 'tocPageNumbers', key_prefix: str = '', level_offset: int = 0):
+        self.form_name = form_name
+        self.key_prefix = key_prefix
+        self.level_offset = level_offset
+        self.entries: List[OutlineEntry] = []
+        self.rows = []
+        self.width = 0
+        self.height = 0
+
+    def entry(self, key: str, title: str, level: int = 0, in_toc: bool = True) -> OutlineEntry:
+        return OutlineEntry(self.key_prefix + key, title, level + self.level_offset, in_toc)
+
+    def heading(self, text: str, style, key: str, level: int = 0, title: Optional[str] = None) -> OutlineHeading:
+        return OutlineHeading(text, style, self.entry(key, title or text, level), self)
+
+    def page_flowable(self) -> 'TableOfContentsPage':
+        return TableOfContentsPage(self)
+
+    def numbers_flowable(self) -> 'TableOfContentsNumbers':
+        return TableOfContentsNumbers(self)
+
+
+class TableOfContentsPage(Flowable):
+    """
+    Contents rows with dot leaders and links. Page numbers are a forward reference to a form
+    drawn by TableOfContentsNumbers at the end of the story.
+    """
+
+    def __init__(self, toc: TableOfContents):
+        super().__init__()
+        self.toc = toc
+
+    def _visible(self) -> List[OutlineEntry]:
+        return [entry for entry in self.toc.entries if entry.in_toc]
+
+    def _row_level(self, entry: OutlineEntry) -> int:
+        return min(entry.level - self.toc.level_offset, 1)
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = sum(TOC_ROW_HEIGHTS[self._row_level(entry)] for entry in self._visible())
+        return self.width, self.height
+
+    def draw(self):
+        canvas = self.canv
+        self.toc.rows = []
+        y = self.height
+        for entry in self._visible():
+            level = self._row_level(entry)
+            y -= TOC_ROW_HEIGHTS[level]
+            font, size = TOC_FONTS[level]
+            indent = TOC_INDENT * level
+            canvas.setFont(font, size)
+            canvas.setFillColor(colors.black)
+            canvas.drawString(indent, y + 4, entry.title)
+
+            leader_start = indent + stringWidth(entry.title, font, size) + 4
+            leader_end = self.width - TOC_NUMBER_WIDTH
+            dot_width = stringWidth('. ', 'Helvetica', size)
+            if leader_end > leader_start:
+                canvas.setFont('Helvetica', size)
+                canvas.setFillColor(colors.grey)
+                canvas.drawRightString(leader_end, y + 4, '. ' * int((leader_end - leader_start) / dot_width))
+
+            canvas.linkRect('', entry.key, (0, y, self.width, y + TOC_ROW_HEIGHTS[level]), relative=1, thickness=0)
+            self.toc.rows.append((entry, y + 4, font, size))
+
+        self.toc.width = self.width
+        self.toc.height = self.height
+        canvas.doForm(self.toc.form_name)
+
+
+class TableOfContentsNumbers(Flowable):
+    """Zero-size flowable placed last in the story; fills in the contents page numbers"""
+
+    def __init__(self, toc: TableOfContents):
+        super().__init__()
+        self.toc = toc
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        canvas = self.canv
+        canvas.beginForm(self.toc.form_name, 0, 0, self.toc.width, self.toc.height)
+        canvas.setFillColor(colors.black)
+        for entry, y, font, size in self.toc.rows:
+            if entry.page is not None:
+                canvas.setFont(font, size)
+                canvas.drawRightString(self.toc.width, y, str(entry.page))
+        canvas.endForm()
+
+
+class ReportStart(Flowable):
+    """
+    Zero-size marker that restarts page numbering; the page it lands on is the cover. With an
+    entry it also becomes the outline entry (and bookmark) for the whole report.
+    """
+
+    def __init__(self, entry: Optional[OutlineEntry] = None):
+        super().__init__()
+        self.outline_entry = entry
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+class ReportDocTemplate(SimpleDocTemplate):
+    """
+    SimpleDocTemplate that turns OutlineHeading flowables into bookmarks and outline entries
+    and numbers every page after each report's cover in the footer
+    """
+
+    def __init__(self, filename, **kw):
+        super().__init__(filename, **kw)
+        self.report_start_page = 1
+
+    def page_label(self) -> int:
+        return self.page - self.report_start_page + 1
+
+    def afterFlowable(self, flowable: Any):
+        if isinstance(flowable, ReportStart):
+            self.report_start_page = self.page
+        entry = getattr(flowable, 'outline_entry', None)
+        if entry is None:
+            return
+        entry.page = self.page_label()
+        self.canv.bookmarkPage(entry.key)
+        self.canv.addOutlineEntry(entry.title, entry.key, entry.level)
+
+    def afterPage(self):
+        if self.page == self.report_start_page:
+            return
+        self.canv.saveState()
+        self.canv.setFont('Helvetica', 8)
+        self.canv.setFillColor(colors.grey)
+        self.canv.drawCentredString(self.pagesize[0] / 2, self.bottomMargin / 2, f"Page {self.page_label()}")
+        self.canv.restoreState()
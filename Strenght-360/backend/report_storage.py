@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Sharded report storage for StrengthsFinder 360
+PDFs are written to a temp file and atomically renamed into a directory sharded by a hash of the
+response id, so no directory grows past a few hundred entries and a reader never sees a partial
+file. A SQLite index maps each response id to its path, size and content hash; lookups and
+retention sweeps go through the index instead of listing directories. The index also records
+which content catalog entries (theme and pair texts) each report was rendered from, so a content
+fix only needs to re-render the reports that used the changed entries.
+"""
+
+import sys
+import json
+import os
+import re
+import time
+import hashlib
+import sqlite3
+from contextlib import closing
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_STORAGE_DIR = os.environ.get('REPORT_STORAGE_DIR', 'reports')
+INDEX_NAME = 'index.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    response_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 BLOB NOT NULL,
+    stored_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_reports_stored_at ON reports (stored_at);
+CREATE TABLE IF NOT EXISTS report_entries (
+    response_id TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (response_id, entry)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_report_entries_entry ON report_entries (entry, version);
+"""
+
+
+def safe_id(response_id: Any) -> str:
+    """
+    File name component for a response id. Ids that are already safe are used as they are; any
+    other id is sanitized and suffixed with a hash of the raw id (after a '.', which safe ids
+    never contain), so distinct ids such as 'a.b', 'a/b' and 'a_b' never share a file.
+    """
+    raw = str(response_id)
+    if not raw:
+        raise ValueError('Empty response id')
+    safe = re.sub(r'[^A-Za-z0-9_-]', '_', raw)
+    if safe == raw:
+        return safe
+    return f"{safe}.{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def shard_path(response_id: Any) -> str:
+    """Relative path of a report: two levels of 256 directories picked by a hash of the id"""
+    digest = hashlib.sha1(str(response_id).encode('utf-8')).hexdigest()
+    return os.path.join(digest[:2], digest[2:4], f"response-{safe_id(response_id)}.pdf")
+
+
+def _file_sha256(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+class ReportStorage:
+    """Sharded PDF store rooted at `root`, with its index at `<root>/index.db`"""
+
+    def __init__(self, root: str = DEFAULT_STORAGE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.index_path = os.path.join(root, INDEX_NAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def path_for(self, response_id: Any) -> str:
+        return os.path.join(self.root, shard_path(response_id))
+
+    def store(self, response_id: Any, write: Callable[[str], Any], entries: Optional[Dict[str, str]] = None) -> str:
+        """
+        Call `write(tmp_path)` to produce the PDF, then rename it into place and index it along
+        with the content `entries` ({entry: version}) it was rendered from. A failed write leaves
+        neither a file nor an index entry behind.
+        """
+        path = self.path_for(response_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            write(tmp_path)
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            size = os.path.getsize(tmp_path)
+            sha256 = _file_sha256(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (response_id, path, size, sha256, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (str(response_id), shard_path(response_id), size, sha256, time.time())
+            )
+            conn.execute("DELETE FROM report_entries WHERE response_id = ?", (str(response_id),))
+            conn.executemany(
+                "INSERT INTO report_entries (response_id, entry, version) VALUES (?, ?, ?)",
+                [(str(response_id), entry, version) for entry, version in (entries or {}).items()]
+            )
+        return path
+
+    def store_bytes(self, response_id: Any, data: bytes, entries: Optional[Dict[str, str]] = None) -> str:
+        def write(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        return self.store(response_id, write, entries)
+
+    def lookup(self, response_id: Any) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT path, size, sha256, stored_at FROM reports WHERE response_id = ?",
+                (str(response_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'responseId': str(response_id),
+            'path': os.path.join(self.root, row[0]),
+            'size': row[1],
+            'sha256': row[2].hex(),
+            'storedAt': row[3]
+        }
+
+    def _remove(self, conn: sqlite3.Connection, entries: List[tuple]) -> int:
+        for response_id, path in entries:
+            try:
+                os.unlink(os.path.join(self.root, path))
+            except FileNotFoundError:
+                pass
+        conn.executemany("DELETE FROM reports WHERE response_id = ?", [(entry[0],) for entry in entries])
+        conn.executemany("DELETE FROM report_entries WHERE response_id = ?", [(entry[0],) for entry in entries])
+        return len(entries)
+
+    def delete(self, response_id: Any) -> bool:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT response_id, path FROM reports WHERE response_id = ?",
+                               (str(response_id),)).fetchone()
+            return bool(row) and self._remove(conn, [row]) == 1
+
+    def sweep(self, max_age_seconds: Optional[float] = None, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Remove reports older than `max_age_seconds`, then the oldest remaining ones until the
+        store fits in `max_bytes`. Both passes walk the stored_at index only.
+        """
+        removed = 0
+        with closing(self._connect()) as conn, conn:
+            if max_age_seconds is not None:
+                expired = conn.execute(
+                    "SELECT response_id, path FROM reports WHERE stored_at < ?",
+                    (time.time() - max_age_seconds,)
+                ).fetchall()
+                removed += self._remove(conn, expired)
+
+            if max_bytes is not None:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+                evict = []
+                if total > max_bytes:
+                    for response_id, path, size in conn.execute(
+                            "SELECT response_id, path, size FROM reports ORDER BY stored_at"):
+                        evict.append((response_id, path))
+                        total -= size
+                        if total <= max_bytes:
+                            break
+                removed += self._remove(conn, evict)
+
+        return {'removed': removed, **self.stats()}
+
+    def reports_using(self, versions: Dict[str, Optional[str]]) -> List[str]:
+        """
+        Response ids of stored reports rendered from any of the given entries at a version other
+        than the one given (None = the entry no longer exists). Walks the entry index only.
+        """
+        if not versions:
+            return []
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE changed_entries (entry TEXT PRIMARY KEY, version TEXT)")
+            conn.executemany("INSERT INTO changed_entries (entry, version) VALUES (?, ?)", versions.items())
+            rows = conn.execute(
+                "SELECT DISTINCT r.response_id FROM changed_entries c "
+                "JOIN report_entries r ON r.entry = c.entry "
+                "WHERE c.version IS NULL OR r.version != c.version ORDER BY r.response_id"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports").fetchone()
+        return {'reports': count, 'bytes': total}
+
+
+def main():
+    """
+    Usage:
+      report_storage.py lookup <response_id> [storage_dir]
+      report_storage.py sweep [--max-age-days N] [--max-bytes N] [storage_dir]
+      report_storage.py stats [storage_dir]
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or args[0] not in ('lookup', 'sweep', 'stats'):
+            raise ValueError('Usage: report_storage.py lookup <response_id> [storage_dir] | '
+                             'sweep [--max-age-days N] [--max-bytes N] [storage_dir] | stats [storage_dir]')
+
+        command = args.pop(0)
+        max_age_days = float(args[args.index('--max-age-days') + 1]) if '--max-age-days' in args else None
+        max_bytes = int(args[args.index('--max-bytes') + 1]) if '--max-bytes' in args else None
+        for flag in ('--max-age-days', '--max-bytes'):
+            if flag in args:
+                del args[args.index(flag):args.index(flag) + 2]
+
+        if command == 'lookup':
+            if not args:
+                raise ValueError('Missing response id')
+            storage = ReportStorage(args[1] if len(args) > 1 else DEFAULT_STORAGE_DIR)
+            entry = storage.lookup(args[0])
+            if entry is None:
+                raise ValueError(f"No stored report for response {args[0]}")
+            response = {"success": True, **entry}
+        else:
+            storage = ReportStorage(args[0] if args else DEFAULT_STORAGE_DIR)
+            if command == 'sweep':
+                max_age = max_age_days * 86400 if max_age_days is not None else None
+                response = {"success": True, **storage.sweep(max_age, max_bytes)}
+            else:
+                response = {"success": True, **storage.stats()}
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
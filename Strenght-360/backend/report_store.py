@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Compact report model store for StrengthsFinder 360
+Persists processed assessment data at submit time in a small binary form and renders the
+PDF lazily on the first download request, caching it for later downloads.
+"""
+
+import sys
+import json
+import os
+import math
+import struct
+from typing import Dict, Any, Tuple
+
+from python_pdf_generator import (
+    THEME_ORDER,
+    DOMAIN_MAP,
+    process_psychometric_data,
+    generate_comprehensive_pdf,
+    report_content_entries,
+    count_processed,
+)
+from render_scheduler import get_scheduler, PRIORITY_INTERACTIVE
+from render_coalescer import render_once
+from report_storage import DEFAULT_STORAGE_DIR, ReportStorage, safe_id
+from render_metrics import get_registry
+from history_store import DEFAULT_HISTORY_DB, previous_assessment, sync_history
+from processing_hooks import record_processed
+
+DEFAULT_STORE_DIR = os.environ.get('REPORT_STORE_DIR', 'report_models')
+DEFAULT_REPORTS_DIR = os.environ.get('REPORTS_DIR', DEFAULT_STORAGE_DIR)
+
+# Binary layout: header, 4 domain scores, one score per theme in THEME_ORDER (NaN when the
+# theme was not scored), then compact JSON candidate metadata
+MODEL_MAGIC = b'S36M'
+MODEL_VERSION = 1
+_HEADER = struct.Struct('<4sBxxxI')
+_DOMAINS = struct.Struct('<4d')
+_SCORES = struct.Struct(f'<{len(THEME_ORDER)}d')
+
+_DOMAIN_KEYS = ['executing', 'influencing', 'relationship_building', 'strategic_thinking']
+
+
+def pack_processed(processed_data: Dict[str, Any]) -> bytes:
+    """
+    Pack processed assessment data into the compact binary model (without `raw`/`responses`)
+    """
+    domain_scores = processed_data['domainScores']
+    strength_scores = processed_data['strength_scores']
+
+    scores = [strength_scores.get(name, math.nan) for name in THEME_ORDER]
+    extra_scores = {name: score for name, score in strength_scores.items() if name not in DOMAIN_MAP}
+
+    metadata = {
+        'candidate': processed_data['candidate'],
+        'primary_talent_domain': domain_scores['primary_talent_domain']
+    }
+    if extra_scores:
+        metadata['extra_scores'] = extra_scores
+    meta_bytes = json.dumps(metadata, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    return b''.join([
+        _HEADER.pack(MODEL_MAGIC, MODEL_VERSION, len(meta_bytes)),
+        _DOMAINS.pack(*(domain_scores[key] for key in _DOMAIN_KEYS)),
+        _SCORES.pack(*scores),
+        meta_bytes
+    ])
+
+
+def unpack_processed(blob: bytes) -> Dict[str, Any]:
+    """
+    Rebuild the `process_psychometric_data` output from a packed model
+    """
+    magic, version, meta_len = _HEADER.unpack_from(blob, 0)
+    if magic != MODEL_MAGIC or version != MODEL_VERSION:
+        raise ValueError('Unsupported report model format')
+
+    offset = _HEADER.size
+    domains = _DOMAINS.unpack_from(blob, offset)
+    offset += _DOMAINS.size
+    scores = _SCORES.unpack_from(blob, offset)
+    offset += _SCORES.size
+    metadata = json.loads(blob[offset:offset + meta_len].decode('utf-8'))
+
+    subdomains = {name: score for name, score in zip(THEME_ORDER, scores) if not math.isnan(score)}
+    subdomains.update(metadata.get('extra_scores', {}))
+
+    candidate = metadata['candidate']
+    executing, influencing, relationship_building, strategic_thinking = domains
+
+    # Re-run the regular processing so rankings and pairs come from the same code path
+    processed_data = process_psychometric_data({
+        'data': {
+            'id': candidate['id'],
+            'student_name': candidate['name'],
+            'student_email': candidate['email'],
+            'created_at': candidate['created_at'],
+            'primary_talent_domain': metadata['primary_talent_domain'],
+            'detailed_scores': {
+                'executing': executing,
+                'influencing': influencing,
+                'relationshipBuilding': relationship_building,
+                'strategicThinking': strategic_thinking,
+                'subdomains': subdomains
+            }
+        }
+    })
+    processed_data['raw'] = None
+    return processed_data
+
+
+def model_path(response_id: Any, store_dir: str = DEFAULT_STORE_DIR) -> str:
+    return os.path.join(store_dir, f"{safe_id(response_id)}.s36m")
+
+
+def report_path(response_id: Any, reports_dir: str = DEFAULT_REPORTS_DIR) -> str:
+    return ReportStorage(reports_dir).path_for(response_id)
+
+
+def save_assessment(processed_data: Dict[str, Any], store_dir: str = DEFAULT_STORE_DIR) -> str:
+    """
+    Persist processed assessment data; called at submit time instead of rendering the PDF, and
+    by render_report alongside every report it keeps in storage
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    path = model_path(processed_data['candidate']['id'], store_dir)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(pack_processed(processed_data))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_assessment(response_id: Any, store_dir: str = DEFAULT_STORE_DIR) -> Dict[str, Any]:
+    with open(model_path(response_id, store_dir), 'rb') as f:
+        return unpack_processed(f.read())
+
+
+def get_or_render_pdf(response_id: Any, store_dir: str = DEFAULT_STORE_DIR,
+                      reports_dir: str = DEFAULT_REPORTS_DIR, force: bool = False,
+                      priority: str = PRIORITY_INTERACTIVE) -> Tuple[str, bool]:
+    """
+    Return the cached PDF for a response, rendering it from the stored model on first request.
+    `force` renders again even when the cached PDF is current, e.g. after a content fix.
+    Returns (pdf_path, rendered_now).
+    """
+    source = model_path(response_id, store_dir)
+    pdf_path = report_path(response_id, reports_dir)
+
+    # Cached render is valid as long as the model has not been re-submitted since
+    if not force and os.path.exists(pdf_path) and os.path.getmtime(pdf_path) >= os.path.getmtime(source):
+        return pdf_path, False
+
+    with open(source, 'rb') as f:
+        blob = f.read()
+    processed_data = unpack_processed(blob)
+    previous_data = (previous_assessment(processed_data['candidate'], DEFAULT_HISTORY_DB)
+                     if DEFAULT_HISTORY_DB else None)
+
+    def render(path):
+        scheduler = get_scheduler()
+        with scheduler.slot(priority):
+            ReportStorage(reports_dir).store(response_id, lambda tmp_path: generate_comprehensive_pdf(
+                processed_data, tmp_path, previous_data), report_content_entries(processed_data))
+        scheduler.publish()
+        get_registry().publish()
+
+    # Concurrent first downloads of the same stored model share one render
+    _, coalesced = render_once(response_id, blob, pdf_path, render)
+    return pdf_path, not coalesced
+
+
+def main():
+    """
+    Usage:
+      report_store.py store <payload.json|-> [store_dir]
+      report_store.py pdf <response_id> [store_dir] [reports_dir]
+    """
+    try:
+        if len(sys.argv) < 3 or sys.argv[1] not in ('store', 'pdf'):
+            raise ValueError('Usage: report_store.py store <payload.json|-> [store_dir] | '
+                             'pdf <response_id> [store_dir] [reports_dir]')
+
+        command = sys.argv[1]
+        store_dir = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_STORE_DIR
+
+        if command == 'store':
+            if sys.argv[2] == '-':
+                webhook_data = json.load(sys.stdin)
+            else:
+                with open(sys.argv[2], 'r', encoding='utf-8') as f:
+                    webhook_data = json.load(f)
+
+            processed_data = process_psychometric_data(webhook_data)
+            count_processed(processed_data)
+            path = save_assessment(processed_data, store_dir)
+            sync_history(processed_data)
+            record_processed(processed_data)
+            get_registry().publish()
+            response = {
+                "success": True,
+                "modelPath": os.path.abspath(path),
+                "candidate": processed_data['candidate']
+            }
+        else:
+            reports_dir = sys.argv[4] if len(sys.argv) > 4 else DEFAULT_REPORTS_DIR
+            pdf_path, rendered = get_or_render_pdf(sys.argv[2], store_dir, reports_dir)
+            response = {
+                "success": True,
+                "filePath": os.path.abspath(pdf_path),
+                "fileName": os.path.basename(pdf_path),
+                "cached": not rendered
+            }
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
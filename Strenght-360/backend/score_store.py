@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Columnar cohort score store for StrengthsFinder 360
+An append-only directory holding one float32 row per processed assessment (the 34 theme scores
+in THEME_ORDER, then the four domain scores in DOMAIN_KEYS order; NaN = not scored), a parallel
+id column and a JSON-lines sidecar with candidate metadata. The matrices are .npy files with a
+fixed-size header, so analysis code opens them with np.load(mmap_mode='r') without copying and
+a writer appends rows in place and then commits them by rewriting the header's row count.
+"""
+
+import sys
+import ast
+import json
+import os
+import re
+import fcntl
+import hashlib
+import math
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from python_pdf_generator import THEME_ORDER, process_psychometric_data
+from assessment_model import THEME_INDEX, DOMAIN_KEYS
+from team_report import load_cohort
+
+# Scores are only appended when a store directory is configured
+DEFAULT_STORE_DIR = os.environ.get('SCORE_STORE_DIR')
+
+COLUMNS = tuple(THEME_ORDER) + DOMAIN_KEYS
+ID_WIDTH = 40
+
+SCORES_FILE = 'scores.npy'
+IDS_FILE = 'ids.npy'
+META_FILE = 'candidates.jsonl'
+SCHEMA_FILE = 'schema.json'
+LOCK_FILE = 'store.lock'
+
+# Fixed .npy header size (format 1.0), so the row count can be rewritten in place. The score
+# header's padding also carries the committed length of the sidecar as a comment, which numpy
+# ignores, so one header write commits both.
+HEADER_SIZE = 128
+_MAGIC = b'\x93NUMPY\x01\x00'
+_SIDECAR_COMMENT = re.compile(r'# sidecar_bytes=(\d+)')
+
+
+def _header(dtype: np.dtype, rows: int, width: Optional[int], sidecar_bytes: Optional[int] = None) -> bytes:
+    shape = (rows, width) if width is not None else (rows,)
+    text = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': shape})
+    if sidecar_bytes is not None:
+        text += f" # sidecar_bytes={sidecar_bytes}"
+    body_size = HEADER_SIZE - len(_MAGIC) - 2
+    text = text.ljust(body_size - 1) + '\n'
+    return _MAGIC + body_size.to_bytes(2, 'little') + text.encode('latin1')
+
+
+def _committed(path: str) -> Tuple[int, Optional[int]]:
+    """Committed row count and sidecar length (None for stores written before it was recorded)"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)[len(_MAGIC) + 2:].decode('latin1')
+    match = _SIDECAR_COMMENT.search(header)
+    return ast.literal_eval(header)['shape'][0], int(match.group(1)) if match else None
+
+
+def store_id(candidate_id: Any) -> bytes:
+    """Id column value; ids longer than ID_WIDTH bytes are stored as a hash so they never collide"""
+    encoded = str(candidate_id).encode('utf-8')
+    if len(encoded) <= ID_WIDTH:
+        return encoded
+    return b'sha1:' + hashlib.sha1(encoded).hexdigest()[:ID_WIDTH - 5].encode('ascii')
+
+
+def score_row(processed_data: Dict[str, Any]) -> np.ndarray:
+    row = np.full(len(COLUMNS), np.nan, dtype=np.float32)
+    for name, score in processed_data['strength_scores'].items():
+        index = THEME_INDEX.get(name)
+        if index is not None and score is not None and not math.isnan(score):
+            row[index] = score
+    domain_scores = processed_data['domainScores']
+    for offset, key in enumerate(DOMAIN_KEYS):
+        if domain_scores.get(key) is not None:
+            row[len(THEME_ORDER) + offset] = domain_scores[key]
+    return row
+
+
+class ScoreStore:
+    """Writer side: appends rows under an exclusive lock shared by every process on the host"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        schema_path = self._path(SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            # Created under the store lock and renamed into place, so readers never see half a schema
+            with open(self._path(LOCK_FILE), 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not os.path.exists(schema_path):
+                    tmp_path = f"{schema_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump({'version': 1, 'columns': list(COLUMNS), 'idWidth': ID_WIDTH}, f)
+                    os.replace(tmp_path, schema_path)
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            if tuple(json.load(f)['columns']) != COLUMNS:
+                raise ValueError('Score store was built with a different column layout')
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _open_matrix(self, name: str, dtype: np.dtype, width: Optional[int]):
+        path = self._path(name)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(_header(dtype, 0, width))
+        return open(path, 'r+b')
+
+    def append_many(self, processed_list: Iterable[Dict[str, Any]]) -> int:
+        """Append rows and commit them together; returns the committed row count"""
+        rows, ids, meta = [], [], []
+        for processed_data in processed_list:
+            candidate = processed_data['candidate']
+            rows.append(score_row(processed_data))
+            ids.append(store_id(candidate['id']))
+            meta.append(json.dumps({
+                'id': candidate['id'],
+                'name': candidate.get('name'),
+                'email': candidate.get('email'),
+                'created_at': candidate.get('created_at'),
+                'primary_talent_domain': processed_data['domainScores'].get('primary_talent_domain')
+            }) + '\n')
+
+        score_dtype = np.dtype('<f4')
+        id_dtype = np.dtype(f'S{ID_WIDTH}')
+        with open(self._path(LOCK_FILE), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with self._open_matrix(SCORES_FILE, score_dtype, len(COLUMNS)) as scores, \
+                    self._open_matrix(IDS_FILE, id_dtype, None) as id_column, \
+                    open(self._path(META_FILE), 'a+b') as sidecar:
+                committed, sidecar_bytes = _committed(self._path(SCORES_FILE))
+                if not rows:
+                    return committed
+
+                # Rows past the committed count are leftovers from an interrupted append
+                scores.truncate(HEADER_SIZE + committed * len(COLUMNS) * score_dtype.itemsize)
+                id_column.truncate(HEADER_SIZE + committed * id_dtype.itemsize)
+                if sidecar_bytes is None:
+                    sidecar_bytes = _truncate_lines(sidecar, committed)
+                sidecar.truncate(sidecar_bytes)
+
+                scores.seek(0, os.SEEK_END)
+                scores.write(np.stack(rows).astype(score_dtype).tobytes())
+                id_column.seek(0, os.SEEK_END)
+                id_column.write(np.array(ids, dtype=id_dtype).tobytes())
+                meta_bytes = ''.join(meta).encode('utf-8')
+                sidecar.seek(sidecar_bytes)
+                sidecar.write(meta_bytes)
+                for f in (scores, id_column, sidecar):
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # Commit: the id header first, then the score header readers size themselves by
+                total = committed + len(rows)
+                id_column.seek(0)
+                id_column.write(_header(id_dtype, total, None))
+                id_column.flush()
+                scores.seek(0)
+                scores.write(_header(score_dtype, total, len(COLUMNS), sidecar_bytes + len(meta_bytes)))
+                scores.flush()
+                os.fsync(scores.fileno())
+                return total
+
+    def append(self, processed_data: Dict[str, Any]) -> int:
+        return self.append_many([processed_data])
+
+
+def _truncate_lines(f, lines: int) -> int:
+    """Byte length of the first `lines` lines; only needed once for stores without a recorded length"""
+    f.seek(0)
+    for _ in range(lines):
+        if not f.readline():
+            break
+    return f.tell()
+
+
+def record_scores(processed_data: Dict[str, Any], store_dir: Optional[str] = DEFAULT_STORE_DIR) -> None:
+    """Append this assessment's scores when a store is configured (SCORE_STORE_DIR)"""
+    if store_dir:
+        ScoreStore(store_dir).append(processed_data)
+
+
+class ScoreColumns:
+    """Read side: zero-copy views of the committed rows"""
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, SCHEMA_FILE), 'r', encoding='utf-8') as f:
+            if tuple(json.load(f)['columns']) != COLUMNS:
+                raise ValueError('Score store was built with a different column layout')
+        self.matrix = np.load(os.path.join(root, SCORES_FILE), mmap_mode='r')
+        # The id header is committed first, so it may briefly run ahead of the scores
+        self.ids = np.load(os.path.join(root, IDS_FILE), mmap_mode='r')[:len(self.matrix)]
+        self._meta = None
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    @property
+    def theme_scores(self) -> np.ndarray:
+        return self.matrix[:, :len(THEME_ORDER)]
+
+    @property
+    def domain_scores(self) -> np.ndarray:
+        return self.matrix[:, len(THEME_ORDER):]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.matrix[:, COLUMNS.index(name)]
+
+    def id_list(self) -> List[str]:
+        return [candidate_id.decode('utf-8') for candidate_id in self.ids.tolist()]
+
+    def latest_rows(self) -> np.ndarray:
+        """Row numbers of each candidate's most recent append, in first-seen order"""
+        reversed_ids = self.ids[::-1]
+        _, first = np.unique(reversed_ids, return_index=True)
+        return np.sort(len(self.ids) - 1 - first)
+
+    def metadata(self) -> List[Dict[str, Any]]:
+        if self._meta is None:
+            self._meta = []
+            with open(os.path.join(self.root, META_FILE), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if len(self._meta) == len(self):
+                        break
+                    self._meta.append(json.loads(line))
+        return self._meta
+
+
+def open_store(root: Optional[str] = DEFAULT_STORE_DIR) -> ScoreColumns:
+    if not root or not os.path.exists(os.path.join(root, SCORES_FILE)):
+        raise ValueError(f"No score store at {root}")
+    return ScoreColumns(root)
+
+
+def benchmark(count: int = 1000000) -> Dict[str, Any]:
+    """Append `count` synthetic rows in bulk, then time opening and a full-column scan"""
+    root = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'score_store_bench_{os.getpid()}')
+    rng = np.random.default_rng(0)
+    store = ScoreStore(root)
+    try:
+        start = time.perf_counter()
+        for block in range(0, count, 100000):
+            size = min(100000, count - block)
+            scores = rng.integers(0, 11, size=(size, len(THEME_ORDER))).astype(float)
+            store.append_many({
+                'candidate': {'id': block + i},
+                'strength_scores': dict(zip(THEME_ORDER, row)),
+                'domainScores': {key: 0.0 for key in DOMAIN_KEYS}
+            } for i, row in enumerate(scores.tolist()))
+        append_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columns = open_store(root)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        means = np.nanmean(columns.theme_scores, axis=0)
+        scan_ms = (time.perf_counter() - start) * 1000
+        return {'rows': len(columns), 'append_s': round(append_s, 2), 'open_ms': round(open_ms, 2),
+                'theme_mean_scan_ms': round(scan_ms, 1), 'checksum': round(float(means.sum()), 3)}
+    finally:
+        for name in (SCORES_FILE, IDS_FILE, META_FILE, SCHEMA_FILE, LOCK_FILE):
+            try:
+                os.unlink(os.path.join(root, name))
+            except FileNotFoundError:
+                pass
+        os.rmdir(root)
+
+
+def main():
+    """
+    Usage:
+      score_store.py append <payloads.json> [store_dir]
+      score_store.py stats [store_dir]
+      score_store.py benchmark [count]
+    store_dir defaults to SCORE_STORE_DIR.
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or args[0] not in ('append', 'stats', 'benchmark'):
+            raise ValueError('Usage: score_store.py append <payloads.json> [store_dir] | stats [store_dir] | '
+                             'benchmark [count]')
+
+        if args[0] == 'benchmark':
+            print(json.dumps({"success": True, **benchmark(int(args[1]) if len(args) > 1 else 1000000)}))
+            return 0
+
+        if args[0] == 'append':
+            if len(args) < 2:
+                raise ValueError('Missing payloads file')
+            store_dir = args[2] if len(args) > 2 else DEFAULT_STORE_DIR
+            if not store_dir:
+                raise ValueError('No score store configured (SCORE_STORE_DIR)')
+            processed_list = []
+            skipped = 0
+            for payload in load_cohort(args[1]):
+                try:
+                    processed_list.append(process_psychometric_data(payload))
+                except ValueError:
+                    skipped += 1
+            rows = ScoreStore(store_dir).append_many(processed_list)
+            response = {"success": True, "appended": len(processed_list), "skipped": skipped, "rows": rows}
+        else:
+            columns = open_store(args[1] if len(args) > 1 else DEFAULT_STORE_DIR)
+            domain_means = np.nanmean(columns.domain_scores, axis=0) if len(columns) else np.zeros(len(DOMAIN_KEYS))
+            response = {
+                "success": True,
+                "rows": len(columns),
+                "candidates": len(columns.latest_rows()),
+                "domainMeans": {key: round(float(value), 2) for key, value in zip(DOMAIN_KEYS, domain_means)}
+            }
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
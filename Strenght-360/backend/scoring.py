@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Scoring engine for StrengthsFinder 360
+Python port of `calculateDetailedScores` and `getPrimaryTalentDomain` from src/utils/scoring.ts:
+each forced-choice answer ("12A") credits one subdomain via the statement map, and domain scores
+are subdomain sums. Many records are scored at once with numpy, so stored submissions that only
+carry raw responses can be re-scored in bulk.
+"""
+
+import sys
+import json
+import os
+import random
+import time
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+
+# Same order as ALL_SUBDOMAINS in scoring.ts
+EXECUTING_SUBDOMAINS = ['Achiever', 'Arranger', 'Belief', 'Consistency', 'Deliberative', 'Discipline',
+                        'Focus', 'Responsibility', 'Restorative']
+INFLUENCING_SUBDOMAINS = ['Activator', 'Command', 'Communication', 'Competition', 'Maximizer',
+                          'SelfAssurance', 'Significance', 'Woo']
+RELATIONSHIP_BUILDING_SUBDOMAINS = ['Adaptability', 'Connectedness', 'Developer', 'Empathy', 'Harmony',
+                                    'Includer', 'Individualization', 'Positivity', 'Relator']
+STRATEGIC_THINKING_SUBDOMAINS = ['Analytical', 'Context', 'Futuristic', 'Ideation', 'Input', 'Intellection',
+                                 'Learner', 'Strategic']
+ALL_SUBDOMAINS = (EXECUTING_SUBDOMAINS + INFLUENCING_SUBDOMAINS
+                  + RELATIONSHIP_BUILDING_SUBDOMAINS + STRATEGIC_THINKING_SUBDOMAINS)
+
+# (detailed score key, subdomains, getPrimaryTalentDomain label), in TalentScores order
+DOMAINS = [
+    ('executing', EXECUTING_SUBDOMAINS, 'Executing'),
+    ('influencing', INFLUENCING_SUBDOMAINS, 'Influencing'),
+    ('relationshipBuilding', RELATIONSHIP_BUILDING_SUBDOMAINS, 'Relationship Building'),
+    ('strategicThinking', STRATEGIC_THINKING_SUBDOMAINS, 'Strategic Thinking'),
+]
+
+# Statement -> subdomain, `themeMap` in scoring.ts; question n offers statements nA and nB
+THEME_MAP = {
+    "1A": "Achiever", "1B": "Command",
+    "2A": "Responsibility", "2B": "Woo",
+    "3A": "Achiever", "3B": "Woo",
+    "4A": "Discipline", "4B": "Communication",
+    "5A": "Responsibility", "5B": "Woo",
+    "6A": "Discipline", "6B": "Competition",
+    "7A": "Consistency", "7B": "Significance",
+    "8A": "Focus", "8B": "SelfAssurance",
+    "9A": "Restorative", "9B": "Activator",
+    "10A": "Discipline", "10B": "Woo",
+    "11A": "Responsibility", "11B": "Command",
+    "12A": "Consistency", "12B": "Significance",
+    "13A": "Arranger", "13B": "Activator",
+    "14A": "Belief", "14B": "SelfAssurance",
+    "15A": "Deliberative", "15B": "Communication",
+    "16A": "Includer", "16B": "Futuristic",
+    "17A": "Individualization", "17B": "Analytical",
+    "18A": "Relator", "18B": "Learner",
+    "19A": "Empathy", "19B": "Strategic",
+    "20A": "Connectedness", "20B": "Ideation",
+    "21A": "Developer", "21B": "Intellection",
+    "22A": "Harmony", "22B": "Input",
+    "23A": "Relator", "23B": "Context",
+    "24A": "Adaptability", "24B": "Ideation",
+    "25A": "Includer", "25B": "Strategic",
+    "26A": "Positivity", "26B": "Analytical",
+    "27A": "Developer", "27B": "Strategic",
+    "28A": "Harmony", "28B": "Analytical",
+    "29A": "Connectedness", "29B": "Intellection",
+    "30A": "Developer", "30B": "Ideation",
+    "31A": "Achiever", "31B": "Learner",
+    "32A": "Significance", "32B": "Relator",
+    "33A": "Significance", "33B": "Analytical",
+    "34A": "Activator", "34B": "Achiever",
+    "35A": "Maximizer", "35B": "Restorative",
+    "36A": "Futuristic", "36B": "Relator",
+    "37A": "Achiever", "37B": "Ideation",
+    "38A": "SelfAssurance", "38B": "Adaptability",
+    "39A": "Consistency", "39B": "Individualization",
+    "40A": "Focus", "40B": "Strategic",
+    "41A": "Competition", "41B": "Learner",
+    "42A": "Discipline", "42B": "Adaptability",
+    "43A": "Positivity", "43B": "Analytical",
+    "44A": "Belief", "44B": "Learner",
+    "45A": "Achiever", "45B": "Intellection",
+    "46A": "Communication", "46B": "Empathy",
+    "47A": "Individualization", "47B": "Strategic",
+    "48A": "SelfAssurance", "48B": "Developer",
+    "49A": "Achiever", "49B": "Futuristic",
+    "50A": "Command", "50B": "Harmony",
+    "51A": "Focus", "51B": "Harmony",
+    "52A": "SelfAssurance", "52B": "Deliberative",
+    "53A": "Relator", "53B": "Input",
+    "54A": "Achiever", "54B": "Achiever",
+    "55A": "Significance", "55B": "Harmony",
+    "56A": "Discipline", "56B": "Adaptability",
+    "57A": "Responsibility", "57B": "Positivity",
+    "58A": "Competition", "58B": "Harmony",
+    "59A": "Achiever", "59B": "Ideation",
+    "60A": "Command", "60B": "Harmony",
+    "61A": "Discipline", "61B": "Adaptability",
+    "62A": "Activator", "62B": "Intellection",
+    "63A": "Significance", "63B": "Intellection",
+    "64A": "Analytical", "64B": "Positivity",
+    "65A": "Learner", "65B": "Ideation",
+    "66A": "Achiever", "66B": "Relator",
+    "67A": "Restorative", "67B": "Maximizer",
+    "68A": "Focus", "68B": "Analytical",
+    "69A": "Command", "69B": "Harmony",
+    "70A": "Learner", "70B": "Developer",
+    "71A": "Discipline", "71B": "Ideation",
+    "72A": "Consistency", "72B": "Activator",
+    "73A": "Belief", "73B": "Relator",
+    "74A": "Strategic", "74B": "Arranger",
+    "75A": "Communication", "75B": "Intellection",
+    "76A": "Achiever", "76B": "Activator",
+    "77A": "Achiever", "77B": "Relator"
+}
+
+QUESTION_COUNT = len(THEME_MAP) // 2
+CHOICES = ('A', 'B')
+
+_SUBDOMAIN_INDEX = {name: i for i, name in enumerate(ALL_SUBDOMAINS)}
+# Row q-1 holds the subdomain index credited by choosing A / B on question q
+_STATEMENT_LOOKUP = np.array(
+    [[_SUBDOMAIN_INDEX[THEME_MAP[f"{q}{choice}"]] for choice in CHOICES] for q in range(1, QUESTION_COUNT + 1)],
+    dtype=np.intp
+)
+# Subdomain -> domain membership, so domain scores are one matrix product
+_DOMAIN_MATRIX = np.array(
+    [[name in subdomains for _, subdomains, _ in DOMAINS] for name in ALL_SUBDOMAINS],
+    dtype=np.int64
+)
+_QUESTION_KEYS = {str(q): q - 1 for q in range(1, QUESTION_COUNT + 1)}
+_CHOICE_CODES = {choice: code for code, choice in enumerate(CHOICES)}
+
+
+def has_forced_choice_answers(responses: Any) -> bool:
+    """True when `responses` holds at least one answer calculateDetailedScores would count"""
+    return isinstance(responses, dict) and any(
+        key in _QUESTION_KEYS and isinstance(response, dict) and response.get('selectedStatement') in _CHOICE_CODES
+        for key, response in responses.items()
+    )
+
+
+def choice_matrix(responses_list: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Encode responses as an (n, QUESTION_COUNT) int8 matrix: 0 = A, 1 = B, -1 = unanswered.
+    Entries calculateDetailedScores would skip (unknown question keys, answers that are not
+    {"selectedStatement": "A" | "B"}) are left unanswered.
+    """
+    # Filled byte by byte (0xff reads back as -1) and viewed as a matrix without copying
+    cells = bytearray(b'\xff' * (len(responses_list) * QUESTION_COUNT))
+    column_of = _QUESTION_KEYS.get
+    code_of = _CHOICE_CODES.get
+    for row, responses in enumerate(responses_list):
+        if not isinstance(responses, dict):
+            continue
+        base = row * QUESTION_COUNT
+        for key, response in responses.items():
+            column = column_of(key)
+            if column is None:
+                continue
+            try:
+                code = code_of(response.get('selectedStatement'))
+            except (AttributeError, TypeError):
+                continue
+            if code is not None:
+                cells[base + column] = code
+    return np.frombuffer(cells, dtype=np.int8).reshape(len(responses_list), QUESTION_COUNT)
+
+
+def score_matrix(choices: np.ndarray) -> np.ndarray:
+    """Subdomain scores, shape (n, len(ALL_SUBDOMAINS)), for a choice matrix"""
+    width = len(ALL_SUBDOMAINS)
+    answered = choices >= 0
+    # Unanswered cells land in an extra column that is dropped afterwards
+    subdomains = np.where(answered, _STATEMENT_LOOKUP[np.arange(QUESTION_COUNT), np.maximum(choices, 0)], width)
+    offsets = np.arange(choices.shape[0], dtype=np.intp)[:, None] * (width + 1)
+    counts = np.bincount((subdomains + offsets).ravel(), minlength=choices.shape[0] * (width + 1))
+    return counts.reshape(choices.shape[0], width + 1)[:, :width]
+
+
+def domain_scores(subdomain_scores: np.ndarray) -> np.ndarray:
+    """Domain scores, shape (n, 4) in DOMAINS order"""
+    return subdomain_scores @ _DOMAIN_MATRIX
+
+
+def _detailed(subdomain_row: np.ndarray, domain_row: np.ndarray) -> Dict[str, Any]:
+    detailed = {key: int(score) for (key, _, _), score in zip(DOMAINS, domain_row)}
+    detailed['subdomains'] = {name: int(score) for name, score in zip(ALL_SUBDOMAINS, subdomain_row)}
+    return detailed
+
+
+def score_responses(responses_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """calculateDetailedScores for many response sets at once"""
+    subdomains = score_matrix(choice_matrix(responses_list))
+    domains = domain_scores(subdomains)
+    return [_detailed(subdomain_row, domain_row) for subdomain_row, domain_row in zip(subdomains, domains)]
+
+
+def calculate_detailed_scores(responses: Dict[str, Any]) -> Dict[str, Any]:
+    """Same result as calculateDetailedScores in scoring.ts"""
+    return score_responses([responses])[0]
+
+
+def get_primary_talent_domain(detailed_scores: Dict[str, Any]) -> str:
+    """Same result as getPrimaryTalentDomain: the first domain with the highest score wins ties"""
+    best_label, best_score = None, None
+    for key, _, label in DOMAINS:
+        if best_score is None or detailed_scores[key] > best_score:
+            best_label, best_score = label, detailed_scores[key]
+    return best_label
+
+
+def rescore_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fill in detailed_scores, the *_score columns and primary_talent_domain for stored submission
+    rows that only carry raw forced-choice responses. Rows that already have subdomain scores or
+    have no countable answers are left as they are. Records are updated in place.
+    """
+    records = list(records)
+    pending = [record for record in records
+               if not (record.get('detailed_scores') or {}).get('subdomains')
+               and has_forced_choice_answers(record.get('responses'))]
+
+    for record, detailed in zip(pending, score_responses([record['responses'] for record in pending])):
+        record['detailed_scores'] = detailed
+        record['executing_score'] = detailed['executing']
+        record['influencing_score'] = detailed['influencing']
+        record['relationship_building_score'] = detailed['relationshipBuilding']
+        record['strategic_thinking_score'] = detailed['strategicThinking']
+        record['primary_talent_domain'] = get_primary_talent_domain(detailed)
+
+    return {'records': len(records), 'rescored': len(pending), 'unchanged': len(records) - len(pending)}
+
+
+def parity_fixtures(count: int = 40, seed: int = 360) -> List[Dict[str, Any]]:
+    """
+    Cases for src/__tests__/scoringParity.test.ts, which checks calculateDetailedScores against the
+    scores computed here. Random cases are encoded as an answer string ('A', 'B' or '-' for each
+    question in order); edge cases carry their raw responses.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        skip = rng.random() * 0.3
+        answers = ''.join('-' if rng.random() < skip else rng.choice(CHOICES) for _ in range(QUESTION_COUNT))
+        responses = {str(q + 1): {'selectedStatement': answer} for q, answer in enumerate(answers) if answer != '-'}
+        cases.append({'answers': answers, 'expected': calculate_detailed_scores(responses)})
+
+    edge_cases = [
+        {},
+        {'54': {'selectedStatement': 'A'}, '54 ': {'selectedStatement': 'B'}},
+        {'0': {'selectedStatement': 'A'}, '78': {'selectedStatement': 'B'}, '01': {'selectedStatement': 'A'}},
+        {'1': {'selectedStatement': 'C'}, '2': {}, '3': None, '4': {'selectedStatement': 'B'}},
+        {'31': 'William Shakespeare', '32': 'Canberra', '33': 'Plan and define roles'},
+    ]
+    for responses in edge_cases:
+        cases.append({'responses': responses, 'expected': calculate_detailed_scores(responses)})
+    return cases
+
+
+def benchmark(count: int = 100000) -> Dict[str, Any]:
+    rng = random.Random(0)
+    responses_list = [{str(q): {'selectedStatement': rng.choice(CHOICES)} for q in range(1, QUESTION_COUNT + 1)}
+                      for _ in range(count)]
+
+    start = time.perf_counter()
+    choices = choice_matrix(responses_list)
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    subdomains = score_matrix(choices)
+    domain_scores(subdomains)
+    score_s = time.perf_counter() - start
+
+    # Direct transliteration of the TypeScript loop, for comparison
+    sample = responses_list[:min(count, 10000)]
+    start = time.perf_counter()
+    for responses in sample:
+        scores = dict.fromkeys(ALL_SUBDOMAINS, 0)
+        for question, response in responses.items():
+            subdomain = THEME_MAP.get(f"{question}{response['selectedStatement']}")
+            if subdomain:
+                scores[subdomain] += 1
+    loop_s = (time.perf_counter() - start) * count / len(sample)
+
+    return {
+        'records': count,
+        'encode_s': round(encode_s, 3),
+        'vectorized_score_s': round(score_s, 3),
+        'per_record_loop_s_estimated': round(loop_s, 3)
+    }
+
+
+def _load_records(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """
+    Usage:
+      scoring.py score <responses.json|->          score one responses object
+      scoring.py rescore <records.json> [out.json]  fill scores for rows that only have responses
+                                                    (default out: <records>.rescored.json)
+      scoring.py fixtures [out.json]                write TypeScript parity test cases
+      scoring.py benchmark [count]
+    `records.json` is a list of submission rows or an export like all_responses.json.
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or args[0] not in ('score', 'rescore', 'fixtures', 'benchmark'):
+            raise ValueError('Usage: scoring.py score <responses.json|-> | rescore <records.json> [out.json] | '
+                             'fixtures [out.json] | benchmark [count]')
+        command = args[0]
+
+        if command == 'score':
+            responses = json.load(sys.stdin) if len(args) < 2 or args[1] == '-' else _load_records(args[1])
+            detailed = calculate_detailed_scores(responses)
+            response = {"success": True, "detailedScores": detailed,
+                        "primaryTalentDomain": get_primary_talent_domain(detailed)}
+
+        elif command == 'rescore':
+            if len(args) < 2:
+                raise ValueError('Missing records file')
+            document = _load_records(args[1])
+            records = document['responses'] if isinstance(document, dict) else document
+            response = {"success": True, **rescore_records(records)}
+            # The source records are never overwritten; the default is a sibling file
+            out_path = args[2] if len(args) > 2 else f"{os.path.splitext(args[1])[0]}.rescored.json"
+            if os.path.abspath(out_path) == os.path.abspath(args[1]):
+                raise ValueError('Refusing to overwrite the records file; choose another output path')
+            tmp_path = f"{out_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+            os.replace(tmp_path, out_path)
+            response["filePath"] = out_path
+
+        elif command == 'fixtures':
+            cases = parity_fixtures()
+            out_path = args[1] if len(args) > 1 else None
+            if out_path:
+                with open(out_path, 'w', encoding='utf-8') as f:
+                    json.dump(cases, f, separators=(',', ':'))
+                    f.write('\n')
+                response = {"success": True, "cases": len(cases), "filePath": out_path}
+            else:
+                response = {"success": True, "cases": cases}
+
+        else:
+            response = {"success": True, **benchmark(int(args[1]) if len(args) > 1 else 100000)}
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
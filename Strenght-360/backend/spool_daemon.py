@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Spool-directory ingestion for StrengthsFinder 360
+Watches `<spool>/incoming/` for payload JSON files, claims each one by renaming it into
+`processing/`, renders it in a worker pool and moves it to `done/` or `failed/` next to a
+`<name>.result.json` sidecar holding the same response python_pdf_generator.py prints.
+
+Producers must drop files atomically: write `incoming/.<name>.tmp` (or anywhere on the same
+filesystem) and rename it to `incoming/<name>.json`. Dot-files and non-.json files are ignored.
+"""
+
+import sys
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional
+
+from python_pdf_generator import render_report
+from render_scheduler import PRIORITY_BULK
+
+DEFAULT_SPOOL_DIR = os.environ.get('REPORT_SPOOL_DIR', 'spool')
+
+SPOOL_SUBDIRS = ('incoming', 'processing', 'done', 'failed', 'reports')
+
+# Idle polls back off from the minimum to the maximum interval; any claimed file resets it
+MIN_POLL_SECONDS = 0.05
+MAX_POLL_SECONDS = 1.0
+
+RESULT_SUFFIX = '.result.json'
+
+
+def ensure_spool(spool_dir: str) -> Dict[str, str]:
+    paths = {name: os.path.join(spool_dir, name) for name in SPOOL_SUBDIRS}
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+    return paths
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_claims(paths: Dict[str, str]) -> int:
+    """Return files claimed by daemons that are no longer running to incoming/"""
+    recovered = 0
+    for name in os.listdir(paths['processing']):
+        pid, _, original = name.partition('.')
+        if not pid.isdigit() or not original or _pid_alive(int(pid)):
+            continue
+        try:
+            os.rename(os.path.join(paths['processing'], name), os.path.join(paths['incoming'], original))
+            recovered += 1
+        except FileNotFoundError:
+            pass
+    return recovered
+
+
+def claim_batch(paths: Dict[str, str], limit: int) -> List[str]:
+    """
+    Claim up to `limit` of the oldest ready files with one directory scan. Renaming into
+    processing/ under this daemon's pid is atomic, so concurrent daemons never share a file.
+    """
+    if limit <= 0:
+        return []
+    ready = []
+    with os.scandir(paths['incoming']) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.name.endswith('.json'):
+                continue
+            try:
+                ready.append((entry.stat().st_mtime_ns, entry.name))
+            except FileNotFoundError:
+                continue
+
+    claimed = []
+    prefix = f"{os.getpid()}."
+    for _, name in sorted(ready)[:limit]:
+        target = os.path.join(paths['processing'], prefix + name)
+        try:
+            os.rename(os.path.join(paths['incoming'], name), target)
+        except FileNotFoundError:
+            # Claimed by another daemon between the scan and the rename
+            continue
+        claimed.append(target)
+    return claimed
+
+
+def process_file(path: str, reports_dir: str) -> Dict[str, Any]:
+    """Render one claimed payload file; runs inside a worker process"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            webhook_data = json.load(f)
+    except Exception as e:
+        return {"success": False, "error": f"Invalid payload file: {e}"}
+    return render_report(webhook_data, priority=PRIORITY_BULK, output_dir=reports_dir)
+
+
+def finish(paths: Dict[str, str], claimed_path: str, result: Dict[str, Any]) -> str:
+    """
+    Write the sidecar, then move the payload next to it. A crash in between leaves the payload
+    in processing/ to be recovered and rendered again, never a payload without a result.
+    """
+    original = os.path.basename(claimed_path).partition('.')[2]
+    target_dir = paths['done'] if result.get('success') else paths['failed']
+    sidecar = os.path.join(target_dir, original[:-len('.json')] + RESULT_SUFFIX)
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+    os.replace(tmp_path, sidecar)
+    os.replace(claimed_path, os.path.join(target_dir, original))
+    return sidecar
+
+
+class SpoolDaemon:
+    """Claims, renders and files spool payloads until stopped or, with `once`, until idle"""
+
+    def __init__(self, spool_dir: str = DEFAULT_SPOOL_DIR, workers: Optional[int] = None,
+                 reports_dir: Optional[str] = None):
+        self.paths = ensure_spool(spool_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.reports_dir = reports_dir or self.paths['reports']
+        self.stopping = False
+        self.stats = {'rendered': 0, 'failed': 0, 'recovered': 0}
+
+    def stop(self, *_) -> None:
+        self.stopping = True
+
+    def run(self, once: bool = False) -> Dict[str, Any]:
+        self.stats['recovered'] += recover_claims(self.paths)
+        # Two jobs per worker keeps the pool busy without claiming files another daemon could take
+        max_pending = self.workers * 2
+        poll = MIN_POLL_SECONDS
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            while True:
+                if not self.stopping:
+                    for path in claim_batch(self.paths, max_pending - len(pending)):
+                        pending[executor.submit(process_file, path, self.reports_dir)] = path
+
+                if not pending:
+                    if self.stopping or once:
+                        break
+                    time.sleep(poll)
+                    poll = min(poll * 2, MAX_POLL_SECONDS)
+                    continue
+                poll = MIN_POLL_SECONDS
+
+                done, _ = wait(pending, timeout=MAX_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"success": False, "error": str(e)}
+                    finish(self.paths, path, result)
+                    self.stats['rendered' if result.get('success') else 'failed'] += 1
+
+        return {"success": True, **self.stats}
+
+
+def main():
+    """
+    Usage:
+      spool_daemon.py [spool_dir] [--workers N] [--reports-dir DIR] [--once]
+    The spool directory defaults to REPORT_SPOOL_DIR or ./spool. With --once the daemon exits
+    when incoming/ is empty instead of waiting for more files.
+    """
+    try:
+        args = sys.argv[1:]
+
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args else default
+
+        positional = [arg for i, arg in enumerate(args)
+                      if not arg.startswith('--') and (i == 0 or args[i - 1] not in ('--workers', '--reports-dir'))]
+        workers = option('--workers')
+        daemon = SpoolDaemon(positional[0] if positional else DEFAULT_SPOOL_DIR,
+                             int(workers) if workers else None, option('--reports-dir'))
+        signal.signal(signal.SIGTERM, daemon.stop)
+        signal.signal(signal.SIGINT, daemon.stop)
+
+        print(json.dumps(daemon.run(once='--once' in args)))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Domain-balanced team composition for StrengthsFinder 360
+Partitions a cohort into teams of a given size so that every team covers all four talent
+domains and as many distinct top-5 themes as possible. Each member's top 5 is a 34-bit theme
+bitset plus 4 domain bits; a team is scored by popcount of the OR of its members. Teams are
+seeded greedily and improved by member swaps between teams.
+"""
+
+import sys
+import json
+import os
+import random
+import time
+from typing import Dict, List, Any
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from python_pdf_generator import THEME_ORDER, DOMAIN_MAP, process_psychometric_data
+from assessment_model import THEME_INDEX
+from team_report import DOMAIN_ORDER, load_cohort
+
+THEME_BITS = (1 << len(THEME_ORDER)) - 1
+DOMAIN_SHIFT = len(THEME_ORDER)
+
+# A missing domain costs more than any number of extra themes can make up for
+DOMAIN_WEIGHT = 100
+
+DEFAULT_TIME_LIMIT_SECONDS = 5.0
+
+
+def member_mask(processed_data: Dict[str, Any]) -> int:
+    """Top-5 themes in bits 0-33 (THEME_ORDER), their domains in bits 34-37 (DOMAIN_ORDER)"""
+    mask = 0
+    for theme in processed_data['top5']:
+        index = THEME_INDEX.get(theme['name'])
+        if index is not None:
+            mask |= 1 << index
+            mask |= 1 << (DOMAIN_SHIFT + DOMAIN_ORDER.index(DOMAIN_MAP[theme['name']]))
+    return mask
+
+
+def team_score(mask: int) -> int:
+    return DOMAIN_WEIGHT * (mask >> DOMAIN_SHIFT).bit_count() + (mask & THEME_BITS).bit_count()
+
+
+def _team_mask(masks: List[int], members: List[int], skip: int = -1) -> int:
+    combined = 0
+    for member in members:
+        if member != skip:
+            combined |= masks[member]
+    return combined
+
+
+def _team_sizes(count: int, team_size: int) -> List[int]:
+    """As many teams of `team_size` as fit; leftover members join teams one each"""
+    team_count = max(1, count // team_size)
+    base, extra = divmod(count, team_count)
+    return [base + 1 if i < extra else base for i in range(team_count)]
+
+
+def _greedy(masks: List[int], sizes: List[int]) -> List[List[int]]:
+    # Place members with rare themes first so they spread across teams
+    frequency = [0] * len(THEME_ORDER)
+    for mask in masks:
+        for bit in range(len(THEME_ORDER)):
+            frequency[bit] += (mask >> bit) & 1
+    rarity = [sum(1 / frequency[bit] for bit in range(len(THEME_ORDER)) if (mask >> bit) & 1) for mask in masks]
+    order = sorted(range(len(masks)), key=lambda member: -rarity[member])
+
+    teams = [[] for _ in sizes]
+    team_masks = [0] * len(sizes)
+    for member in order:
+        best_team, best_key = None, None
+        for team, size in enumerate(sizes):
+            if len(teams[team]) >= size:
+                continue
+            gain = team_score(team_masks[team] | masks[member]) - team_score(team_masks[team])
+            key = (gain, -len(teams[team]))
+            if best_key is None or key > best_key:
+                best_team, best_key = team, key
+        teams[best_team].append(member)
+        team_masks[best_team] |= masks[member]
+    return teams
+
+
+def _local_search(masks: List[int], teams: List[List[int]], deadline: float, rng: random.Random) -> int:
+    """Apply improving member swaps between teams until none is left or time runs out"""
+    scores = [team_score(_team_mask(masks, members)) for members in teams]
+    swaps = 0
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        team_order = list(range(len(teams)))
+        rng.shuffle(team_order)
+        for a in team_order:
+            # Team mask with each member left out, so a swap is scored with two ORs
+            without_a = {member: _team_mask(masks, teams[a], member) for member in teams[a]}
+            for b in range(len(teams)):
+                if b == a:
+                    continue
+                without_b = {member: _team_mask(masks, teams[b], member) for member in teams[b]}
+                base = scores[a] + scores[b]
+                best = None
+                for i in teams[a]:
+                    for j in teams[b]:
+                        new_a = team_score(without_a[i] | masks[j])
+                        new_b = team_score(without_b[j] | masks[i])
+                        if new_a + new_b > base and (best is None or new_a + new_b > best[0]):
+                            best = (new_a + new_b, i, j, new_a, new_b)
+                if best is not None:
+                    _, i, j, scores[a], scores[b] = best
+                    teams[a][teams[a].index(i)] = j
+                    teams[b][teams[b].index(j)] = i
+                    without_a = {member: _team_mask(masks, teams[a], member) for member in teams[a]}
+                    swaps += 1
+                    improved = True
+            if time.monotonic() >= deadline:
+                break
+    return swaps
+
+
+def build_teams(processed_list: List[Dict[str, Any]], team_size: int, seed: int = 0,
+                time_limit: float = DEFAULT_TIME_LIMIT_SECONDS) -> Dict[str, Any]:
+    """
+    Partition processed assessments into teams of about `team_size` members. Returns the teams
+    (member indices into `processed_list`) with their domain and theme coverage.
+    """
+    if team_size < 1:
+        raise ValueError('Team size must be at least 1')
+    if not processed_list:
+        return {'teams': [], 'swaps': 0, 'elapsedSeconds': 0.0}
+
+    start = time.monotonic()
+    masks = [member_mask(processed_data) for processed_data in processed_list]
+    teams = _greedy(masks, _team_sizes(len(masks), team_size))
+    greedy_score = sum(team_score(_team_mask(masks, members)) for members in teams)
+    swaps = _local_search(masks, teams, start + time_limit, random.Random(seed))
+
+    results = []
+    for members in teams:
+        mask = _team_mask(masks, members)
+        results.append({
+            'members': sorted(members),
+            'domainsCovered': [domain for i, domain in enumerate(DOMAIN_ORDER) if (mask >> (DOMAIN_SHIFT + i)) & 1],
+            'missingDomains': [domain for i, domain in enumerate(DOMAIN_ORDER) if not (mask >> (DOMAIN_SHIFT + i)) & 1],
+            'distinctThemes': (mask & THEME_BITS).bit_count(),
+            'score': team_score(mask)
+        })
+    return {
+        'teams': results,
+        'greedyScore': greedy_score,
+        'finalScore': sum(team['score'] for team in results),
+        'swaps': swaps,
+        'elapsedSeconds': round(time.monotonic() - start, 3)
+    }
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    teams = plan['teams']
+    distinct = [team['distinctThemes'] for team in teams]
+    return {
+        'teams': len(teams),
+        'fullyCovered': sum(1 for team in teams if not team['missingDomains']),
+        'minDistinctThemes': min(distinct, default=0),
+        'meanDistinctThemes': round(sum(distinct) / len(distinct), 2) if distinct else 0.0,
+        'greedyScore': plan.get('greedyScore'),
+        'finalScore': plan.get('finalScore'),
+        'swaps': plan['swaps'],
+        'elapsedSeconds': plan['elapsedSeconds']
+    }
+
+
+def generate_team_plan_pdf(plan: Dict[str, Any], processed_list: List[Dict[str, Any]],
+                           output_filename: str, title: str = "PROJECT TEAM PLAN") -> str:
+    """
+    Render the team assignment with each team's domain coverage and distinct top-5 themes
+    """
+    doc = SimpleDocTemplate(
+        output_filename,
+        pagesize=A4,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=12,
+        alignment=1,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black
+    )
+
+    cell_style = ParagraphStyle(
+        'TeamCell',
+        parent=styles['Normal'],
+        fontSize=7,
+        leading=9
+    )
+
+    summary = summarize_plan(plan)
+    story = []
+    story.append(Paragraph(title, title_style))
+    story.append(Paragraph(
+        f"<b>Students:</b> {len(processed_list)} &nbsp; <b>Teams:</b> {summary['teams']} &nbsp; "
+        f"<b>Covering all four domains:</b> {summary['fullyCovered']} &nbsp; "
+        f"<b>Distinct top-5 themes per team:</b> {summary['meanDistinctThemes']} on average, "
+        f"{summary['minDistinctThemes']} at least",
+        normal_style
+    ))
+    story.append(Spacer(1, 0.2*inch))
+
+    rows = [['Team', 'Members', 'Domains', 'Themes', 'Missing Domains']]
+    for number, team in enumerate(plan['teams'], start=1):
+        names = ', '.join(processed_list[member]['candidate']['name'] for member in team['members'])
+        rows.append([
+            str(number),
+            Paragraph(names, cell_style),
+            f"{len(team['domainsCovered'])}/4",
+            str(team['distinctThemes']),
+            Paragraph(', '.join(team['missingDomains']) or '-', cell_style)
+        ])
+
+    table = LongTable(rows, colWidths=[0.5*inch, 4.3*inch, 0.7*inch, 0.7*inch, 1.3*inch], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('ALIGN', (2, 0), (3, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ]))
+    story.append(table)
+
+    doc.build(story)
+    return output_filename
+
+
+def main():
+    """
+    Usage:
+      team_builder.py <payloads.json> --size K [--seed N] [--time-limit S] [--pdf output.pdf]
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or '--size' not in args:
+            raise ValueError('Usage: team_builder.py <payloads.json> --size K [--seed N] [--time-limit S] '
+                             '[--pdf output.pdf]')
+
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args else default
+
+        processed_list = []
+        skipped = 0
+        for payload in load_cohort(args[0]):
+            try:
+                processed_list.append(process_psychometric_data(payload))
+            except ValueError:
+                skipped += 1
+
+        plan = build_teams(processed_list, int(option('--size')), int(option('--seed', 0)),
+                           float(option('--time-limit', DEFAULT_TIME_LIMIT_SECONDS)))
+        response = {
+            "success": True,
+            "skipped": skipped,
+            "summary": summarize_plan(plan),
+            "teams": [
+                {**team, "members": [processed_list[member]['candidate']['id'] for member in team['members']]}
+                for team in plan['teams']
+            ]
+        }
+
+        pdf_path = option('--pdf')
+        if pdf_path:
+            generate_team_plan_pdf(plan, processed_list, pdf_path)
+            response["filePath"] = os.path.abspath(pdf_path)
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
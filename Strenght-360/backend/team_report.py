@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Team Strengths Report for StrengthsFinder 360
+Renders one PDF for a whole team or batch: a members x 34 themes grid with top-5 highlights,
+plus domain coverage and top-5 theme frequency summaries.
+"""
+
+import sys
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Any
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from python_pdf_generator import THEME_ORDER, DOMAIN_MAP, process_psychometric_data
+
+DOMAIN_ORDER = ['Executing', 'Influencing', 'Relationship Building', 'Strategic Thinking']
+
+DOMAIN_COLORS = {
+    'Executing': colors.HexColor('#7B2D8E'),
+    'Influencing': colors.HexColor('#E07B00'),
+    'Relationship Building': colors.HexColor('#1B6FB5'),
+    'Strategic Thinking': colors.HexColor('#2E8B57'),
+}
+
+TOP5_HIGHLIGHT = colors.HexColor('#FFE08A')
+
+# Short column headers - five letters keep every theme distinct
+THEME_ABBREVIATIONS = {name: name[:5] for name in THEME_ORDER}
+
+# Grid geometry is fixed up front so LongTable never has to measure cell contents
+GRID_FONT_SIZE = 6
+GRID_ROW_HEIGHT = 10
+GRID_HEADER_HEIGHT = 14
+GRID_NAME_WIDTH = 1.3 * inch
+GRID_INDEX_WIDTH = 0.3 * inch
+GRID_CHUNK_ROWS = 200
+NAME_MAX_CHARS = 28
+
+
+def _format_score(score: float) -> str:
+    return f"{score:g}"
+
+
+def _grid_column_widths(available_width: float) -> List[float]:
+    theme_width = (available_width - GRID_INDEX_WIDTH - GRID_NAME_WIDTH) / len(THEME_ORDER)
+    return [GRID_INDEX_WIDTH, GRID_NAME_WIDTH] + [theme_width] * len(THEME_ORDER)
+
+
+def _grid_header_style() -> List[tuple]:
+    commands = [
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), GRID_FONT_SIZE),
+        ('FONTSIZE', (2, 0), (-1, 0), GRID_FONT_SIZE - 1),
+        ('LEADING', (0, 0), (-1, -1), GRID_FONT_SIZE + 1),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('BACKGROUND', (0, 0), (1, 0), colors.HexColor('#2E86AB')),
+        ('ALIGN', (2, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ('LEFTPADDING', (0, 0), (-1, -1), 1),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 1),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ]
+    for column, name in enumerate(THEME_ORDER, 2):
+        commands.append(('BACKGROUND', (column, 0), (column, 0), DOMAIN_COLORS[DOMAIN_MAP[name]]))
+    return commands
+
+
+def _member_grid_tables(processed_list: List[Dict[str, Any]], available_width: float) -> List[LongTable]:
+    """
+    Build the members x themes grid as a series of LongTables of GRID_CHUNK_ROWS rows each,
+    with repeated headers and precomputed column widths and row heights
+    """
+    col_widths = _grid_column_widths(available_width)
+    header = ['#', 'Name'] + [THEME_ABBREVIATIONS[name] for name in THEME_ORDER]
+    header_style = _grid_header_style()
+    column_of = {name: column for column, name in enumerate(THEME_ORDER, 2)}
+
+    tables = []
+    for start in range(0, len(processed_list), GRID_CHUNK_ROWS):
+        chunk = processed_list[start:start + GRID_CHUNK_ROWS]
+        rows = [header]
+        commands = list(header_style)
+
+        for offset, processed_data in enumerate(chunk, 1):
+            scores = processed_data['strength_scores']
+            name = str(processed_data['candidate']['name'])[:NAME_MAX_CHARS]
+            rows.append(
+                [str(start + offset), name] +
+                [_format_score(scores[theme]) if theme in scores else '' for theme in THEME_ORDER]
+            )
+            for theme in processed_data['top5']:
+                column = column_of.get(theme['name'])
+                if column is not None:
+                    commands.append(('BACKGROUND', (column, offset), (column, offset), TOP5_HIGHLIGHT))
+
+        row_heights = [GRID_HEADER_HEIGHT] + [GRID_ROW_HEIGHT] * len(chunk)
+        table = LongTable(rows, colWidths=col_widths, rowHeights=row_heights, repeatRows=1)
+        table.setStyle(TableStyle(commands))
+        tables.append(table)
+
+    return tables
+
+
+def _domain_coverage_rows(processed_list: List[Dict[str, Any]]) -> List[List[str]]:
+    member_count = len(processed_list)
+    top5_counts = Counter()
+    members_covering = Counter()
+    primary_counts = Counter()
+
+    for processed_data in processed_list:
+        domains = [theme['domain'] for theme in processed_data['top5']]
+        top5_counts.update(domains)
+        members_covering.update(set(domains))
+        primary_counts[processed_data['domainScores']['primary_talent_domain']] += 1
+
+    rows = [['Talent Domain', 'Top-5 Themes', 'Members Covering', 'Coverage', 'Primary Domain For']]
+    for domain in DOMAIN_ORDER:
+        coverage = members_covering[domain] / member_count * 100 if member_count else 0
+        rows.append([
+            domain,
+            str(top5_counts[domain]),
+            str(members_covering[domain]),
+            f"{coverage:.0f}%",
+            str(primary_counts[domain])
+        ])
+    return rows
+
+
+def _theme_frequency_rows(processed_list: List[Dict[str, Any]], limit: int = 10) -> List[List[str]]:
+    frequency = Counter(theme['name'] for processed_data in processed_list for theme in processed_data['top5'])
+    rows = [['Theme', 'Domain', 'Members With Theme In Top 5']]
+    for name, count in sorted(frequency.items(), key=lambda item: (-item[1], item[0]))[:limit]:
+        rows.append([name, DOMAIN_MAP.get(name, 'Unknown'), str(count)])
+    return rows
+
+
+def generate_team_pdf(processed_list: List[Dict[str, Any]], output_filename: str,
+                      title: str = "TEAM STRENGTHS REPORT") -> str:
+    """
+    Generate a team strengths PDF from a list of `process_psychometric_data` outputs
+    """
+    doc = SimpleDocTemplate(
+        output_filename,
+        pagesize=landscape(A4),
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        spaceAfter=12,
+        alignment=1,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    heading1_style = ParagraphStyle(
+        'CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.HexColor('#2E86AB'),
+        fontName='Helvetica-Bold'
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black
+    )
+
+    summary_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F8F9FA')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+    story = []
+
+    # 1. Summary page
+    story.append(Paragraph(title, title_style))
+    story.append(Paragraph(f"<b>Members:</b> {len(processed_list)}", normal_style))
+    story.append(Spacer(1, 0.2*inch))
+
+    story.append(Paragraph("Domain Coverage", heading1_style))
+    coverage_table = Table(_domain_coverage_rows(processed_list),
+                           colWidths=[2*inch, 1.2*inch, 1.4*inch, 1*inch, 1.5*inch])
+    coverage_table.setStyle(summary_table_style)
+    story.append(coverage_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    story.append(Paragraph("Most Common Top-5 Themes", heading1_style))
+    frequency_table = Table(_theme_frequency_rows(processed_list), colWidths=[2*inch, 2*inch, 2.2*inch])
+    frequency_table.setStyle(summary_table_style)
+    story.append(frequency_table)
+    story.append(PageBreak())
+
+    # 2. Member grid
+    story.append(Paragraph("Member Theme Scores", heading1_style))
+    story.append(Paragraph(
+        "Column headers are coloured by talent domain; highlighted cells mark each member's top 5 themes.",
+        normal_style
+    ))
+    story.extend(_member_grid_tables(processed_list, doc.width))
+
+    doc.build(story)
+    return output_filename
+
+
+def load_cohort(path: str) -> List[Dict[str, Any]]:
+    """Load a JSON list of webhook payloads (or an admin export with a `responses` list)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        cohort = json.load(f)
+    if isinstance(cohort, dict):
+        cohort = cohort.get('responses', [])
+    return cohort
+
+
+def main():
+    """Usage: team_report.py <cohort.json> [output.pdf] [title]"""
+    try:
+        if len(sys.argv) < 2:
+            raise ValueError('Usage: team_report.py <cohort.json> [output.pdf] [title]')
+
+        output_file = sys.argv[2] if len(sys.argv) > 2 else "team_strengths_report.pdf"
+        title = sys.argv[3] if len(sys.argv) > 3 else "TEAM STRENGTHS REPORT"
+
+        processed_list = []
+        skipped = []
+        for payload in load_cohort(sys.argv[1]):
+            try:
+                processed_list.append(process_psychometric_data(payload))
+            except ValueError as e:
+                skipped.append(str(e))
+
+        pdf_path = generate_team_pdf(processed_list, output_file, title)
+
+        response = {
+            "success": True,
+            "filePath": os.path.abspath(pdf_path),
+            "fileName": os.path.basename(pdf_path),
+            "members": len(processed_list),
+            "skipped": len(skipped)
+        }
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
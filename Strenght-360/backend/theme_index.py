@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Theme inverted index for StrengthsFinder 360
+Maps each (theme, rank band) to a bitmap of candidates, updated incrementally as assessments
+are processed, so cohort filters such as "Strategic:top5 AND Woo:top10 AND NOT Harmony:top5"
+are answered with bitwise AND/OR/NOT over the bitmaps instead of re-processing payloads.
+Processing adds each assessment to the index named by THEME_INDEX_PATH (processing_hooks.py).
+"""
+
+import sys
+import json
+import os
+import re
+import fcntl
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from python_pdf_generator import THEME_ORDER, process_psychometric_data
+from assessment_model import THEME_INDEX
+from team_report import load_cohort
+
+DEFAULT_INDEX_PATH = os.environ.get('THEME_INDEX_PATH', 'theme_index.npz')
+# Index updated as assessments are processed; unset disables tracking
+TRACKED_INDEX_PATH = os.environ.get('THEME_INDEX_PATH')
+
+# Rank bands are cumulative from the top (top10 includes top5); bottom5 is the five lowest
+BANDS = ('top5', 'top10', 'bottom5')
+DEFAULT_BAND = 'top5'
+
+_THEME_NAMES = {name.lower(): name for name in THEME_ORDER}
+_TOKEN = re.compile(r'\s*(\(|\)|[A-Za-z][A-Za-z]*(?::[A-Za-z0-9]+)?)')
+
+
+def _posting(theme: str, band: str) -> int:
+    return THEME_INDEX[theme] * len(BANDS) + BANDS.index(band)
+
+
+def rank_bands(processed_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(theme, band) pairs a processed assessment belongs to"""
+    ranked = [theme['name'] for theme in processed_data['allThemes'] if theme['name'] in THEME_INDEX]
+    pairs = [(name, 'top5') for name in ranked[:5]]
+    # Partial rankings (the domain-score fallback scores only a few themes) get only the bands
+    # they can fill apart: top10 needs themes outside it, bottom5 themes below the top 10
+    if len(ranked) > 10:
+        pairs += [(name, 'top10') for name in ranked[:10]]
+    if len(ranked) >= 15:
+        pairs += [(name, 'bottom5') for name in ranked[-5:]]
+    return pairs
+
+
+class ThemeIndex:
+    """
+    One bit per candidate in each (theme, band) bitmap, plus a bitmap of live candidates used as
+    the universe for NOT. Bitmaps are mutable byte arrays that grow with the cohort.
+    """
+
+    def __init__(self, ids: Optional[List[str]] = None, bitmaps: Optional[np.ndarray] = None,
+                 live: Optional[np.ndarray] = None):
+        self.ids = list(ids or [])
+        self._docs = {candidate_id: doc for doc, candidate_id in enumerate(self.ids)}
+        postings = len(THEME_ORDER) * len(BANDS)
+        self._bitmaps = [bytearray(row.tobytes()) for row in bitmaps] if bitmaps is not None \
+            else [bytearray() for _ in range(postings)]
+        self._live = bytearray(live.tobytes()) if live is not None else bytearray()
+
+    def __len__(self) -> int:
+        return self.universe().bit_count()
+
+    def _ensure_capacity(self, doc: int) -> None:
+        needed = doc // 8 + 1
+        if len(self._live) < needed:
+            # Grow geometrically so appends stay amortised O(1)
+            size = max(needed, len(self._live) * 2, 1024)
+            self._live.extend(bytes(size - len(self._live)))
+            for bitmap in self._bitmaps:
+                bitmap.extend(bytes(size - len(bitmap)))
+
+    def add(self, processed_data: Dict[str, Any]) -> None:
+        """Index an assessment; re-adding a candidate replaces their previous entry"""
+        candidate_id = str(processed_data['candidate']['id'])
+        doc = self._docs.get(candidate_id)
+        if doc is None:
+            doc = len(self.ids)
+            self._docs[candidate_id] = doc
+            self.ids.append(candidate_id)
+            self._ensure_capacity(doc)
+            byte, bit = divmod(doc, 8)
+        else:
+            byte, bit = divmod(doc, 8)
+            for bitmap in self._bitmaps:
+                bitmap[byte] &= ~(1 << bit) & 0xFF
+
+        for theme, band in rank_bands(processed_data):
+            self._bitmaps[_posting(theme, band)][byte] |= 1 << bit
+        self._live[byte] |= 1 << bit
+
+    def add_many(self, processed_list: Iterable[Dict[str, Any]]) -> None:
+        for processed_data in processed_list:
+            self.add(processed_data)
+
+    def remove(self, candidate_id: Any) -> bool:
+        doc = self._docs.get(str(candidate_id))
+        if doc is None:
+            return False
+        byte, bit = divmod(doc, 8)
+        for bitmap in self._bitmaps + [self._live]:
+            bitmap[byte] &= ~(1 << bit) & 0xFF
+        return True
+
+    def bitmap(self, theme: str, band: str = DEFAULT_BAND) -> int:
+        """Posting bitmap as an int (bit i = candidate i), ready for &, | and ~"""
+        return int.from_bytes(self._bitmaps[_posting(theme, band)], 'little')
+
+    def universe(self) -> int:
+        return int.from_bytes(self._live, 'little')
+
+    def query(self, expression: str) -> List[str]:
+        """Candidate ids matching a filter expression, in insertion order"""
+        return self.ids_for(evaluate(self, expression))
+
+    def ids_for(self, bitmap: int) -> List[str]:
+        ids = []
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+        # Only bytes with set bits are expanded
+        for byte_index in np.flatnonzero(np.frombuffer(data, dtype=np.uint8)):
+            value = data[byte_index]
+            base = int(byte_index) * 8
+            while value:
+                low = value & -value
+                ids.append(self.ids[base + low.bit_length() - 1])
+                value ^= low
+        return ids
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> str:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        width = len(self._live)
+        np.savez(
+            tmp_path,
+            bitmaps=np.frombuffer(b''.join(bytes(bitmap) for bitmap in self._bitmaps), dtype=np.uint8)
+                      .reshape(len(self._bitmaps), width),
+            live=np.frombuffer(bytes(self._live), dtype=np.uint8),
+            ids=np.array(self.ids, dtype=str),
+            themes=np.array(THEME_ORDER),
+            bands=np.array(BANDS)
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'ThemeIndex':
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as stored:
+            if list(stored['themes']) != THEME_ORDER or tuple(stored['bands']) != BANDS:
+                raise ValueError('Theme index was built with a different theme order or rank bands')
+            return cls(stored['ids'].tolist(), stored['bitmaps'], stored['live'])
+
+
+def update_index(processed_list: Iterable[Dict[str, Any]], path: str = DEFAULT_INDEX_PATH) -> ThemeIndex:
+    """Add assessments to the persisted index. Serialised across processes by `<index>.lock`."""
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        index = ThemeIndex.load(path)
+        index.add_many(processed_list)
+        index.save(path)
+    return index
+
+
+def record_theme_index(processed_data: Dict[str, Any], path: Optional[str] = TRACKED_INDEX_PATH) -> None:
+    """Index this assessment when a theme index is configured (THEME_INDEX_PATH)"""
+    if path:
+        update_index([processed_data], path)
+
+
+def _parse_term(token: str) -> Tuple[str, str]:
+    name, _, band = token.partition(':')
+    theme = _THEME_NAMES.get(name.lower())
+    if theme is None:
+        raise ValueError(f"Unknown theme in query: {name}")
+    band = band.lower() or DEFAULT_BAND
+    if band not in BANDS:
+        raise ValueError(f"Unknown rank band in query: {band} (expected one of {', '.join(BANDS)})")
+    return theme, band
+
+
+def evaluate(index: ThemeIndex, expression: str) -> int:
+    """
+    Evaluate a filter such as "Strategic:top5 AND (Woo:top10 OR Command) AND NOT Harmony:bottom5".
+    Terms are Theme[:band] (band defaults to top5); NOT binds tighter than AND, AND tighter than OR.
+    """
+    tokens = []
+    position = 0
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            if expression[position:].strip():
+                raise ValueError(f"Cannot parse query near: {expression[position:]!r}")
+            break
+        tokens.append(match.group(1))
+        position = match.end()
+
+    universe = index.universe()
+
+    def peek():
+        return tokens[0].upper() if tokens else None
+
+    def parse_or():
+        result = parse_and()
+        while peek() == 'OR':
+            tokens.pop(0)
+            result |= parse_and()
+        return result
+
+    def parse_and():
+        result = parse_not()
+        while peek() == 'AND':
+            tokens.pop(0)
+            result &= parse_not()
+        return result
+
+    def parse_not():
+        if peek() == 'NOT':
+            tokens.pop(0)
+            return universe & ~parse_not()
+        return parse_atom()
+
+    def parse_atom():
+        if not tokens:
+            raise ValueError('Query ended unexpectedly')
+        token = tokens.pop(0)
+        if token == '(':
+            result = parse_or()
+            if not tokens or tokens.pop(0) != ')':
+                raise ValueError('Missing closing parenthesis in query')
+            return result
+        return index.bitmap(*_parse_term(token)) & universe
+
+    result = parse_or()
+    if tokens:
+        raise ValueError(f"Unexpected token in query: {tokens[0]}")
+    return result
+
+
+def benchmark(count: int = 500000) -> Dict[str, Any]:
+    """Build an index over synthetic rankings and time a few typical filters"""
+    rng = np.random.default_rng(0)
+    index = ThemeIndex()
+    start = time.perf_counter()
+    for n in range(count):
+        order = rng.permutation(len(THEME_ORDER))
+        index.add({'candidate': {'id': n}, 'allThemes': [{'name': THEME_ORDER[i]} for i in order]})
+    build_s = time.perf_counter() - start
+
+    queries = ['Strategic:top5 AND Woo:top10', 'Strategic AND NOT Harmony:top10',
+               '(Achiever OR Focus) AND Learner:top10 AND NOT Command:bottom5']
+    timings = {}
+    for expression in queries:
+        start = time.perf_counter()
+        bitmap = evaluate(index, expression)
+        evaluate_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        matches = index.ids_for(bitmap)
+        timings[expression] = {'matches': len(matches), 'evaluate_ms': round(evaluate_ms, 2),
+                               'ids_ms': round((time.perf_counter() - start) * 1000, 2)}
+    return {'candidates': count, 'build_s': round(build_s, 2), 'queries': timings}
+
+
+def main():
+    """
+    Usage:
+      theme_index.py add <payloads.json> [index.npz]
+      theme_index.py query "<expression>" [index.npz]
+      theme_index.py benchmark [count]
+    Expression terms are Theme[:top5|top10|bottom5] joined with AND, OR, NOT and parentheses.
+    """
+    try:
+        args = sys.argv[1:]
+        if not args or args[0] not in ('add', 'query', 'benchmark'):
+            raise ValueError('Usage: theme_index.py add <payloads.json> | query "<expression>" [index.npz] | '
+                             'benchmark [count]')
+
+        if args[0] == 'benchmark':
+            print(json.dumps({"success": True, **benchmark(int(args[1]) if len(args) > 1 else 500000)}))
+            return 0
+
+        if len(args) < 2:
+            raise ValueError(f'Missing argument for {args[0]}')
+        index_path = args[2] if len(args) > 2 else DEFAULT_INDEX_PATH
+
+        if args[0] == 'add':
+            processed_list = []
+            skipped = 0
+            for payload in load_cohort(args[1]):
+                try:
+                    processed_list.append(process_psychometric_data(payload))
+                except ValueError:
+                    skipped += 1
+            index = update_index(processed_list, index_path)
+            response = {"success": True, "added": len(processed_list), "skipped": skipped,
+                        "candidates": len(index)}
+        else:
+            index = ThemeIndex.load(index_path)
+            start = time.perf_counter()
+            matches = index.query(args[1])
+            response = {"success": True, "query": args[1], "count": len(matches), "candidateIds": matches,
+                        "elapsedMs": round((time.perf_counter() - start) * 1000, 2)}
+
+        print(json.dumps(response))
+        return 0
+
+    except Exception as e:
+        error_response = {
+            "success": False,
+            "error": str(e)
+        }
+        print(json.dumps(error_response))
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import { readFileSync } from 'fs';
+import { join } from 'path';
+import { calculateDetailedScores, DetailedTalentScores, Responses } from '../utils/scoring';
+
+// Generated by `python backend/scoring.py fixtures src/__tests__/fixtures/scoringParity.json`;
+// regenerate it whenever themeMap changes on either side
+interface ParityCase {
+  answers?: string;
+  responses?: Responses;
+  expected: DetailedTalentScores;
+}
+
+const cases: ParityCase[] = JSON.parse(
+  readFileSync(join(__dirname, 'fixtures', 'scoringParity.json'), 'utf-8')
+);
+
+const toResponses = (answers: string): Responses => {
+  const responses: Responses = {};
+  answers.split('').forEach((answer, index) => {
+    if (answer === 'A' || answer === 'B') {
+      responses[(index + 1).toString()] = { selectedStatement: answer };
+    }
+  });
+  return responses;
+};
+
+describe('Python scoring engine parity', () => {
+  it('has fixtures to compare', () => {
+    expect(cases.length).toBeGreaterThan(0);
+  });
+
+  cases.forEach((parityCase, index) => {
+    it(`matches calculateDetailedScores for case ${index}`, () => {
+      const responses = parityCase.responses ?? toResponses(parityCase.answers ?? '');
+      expect(calculateDetailedScores(responses)).toEqual(parityCase.expected);
+    });
+  });
+});